@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_save, post_delete
+
+
+class ChurchcalConfig(AppConfig):
+    name = "churchcal"
+
+    def ready(self):
+        from churchcal.caching import invalidate_church_year_cache
+        from churchcal.snapshots import invalidate_church_year_snapshots
+
+        post_save.connect(invalidate_church_year_snapshots, dispatch_uid="churchcal_snapshots_save")
+        post_delete.connect(invalidate_church_year_snapshots, dispatch_uid="churchcal_snapshots_delete")
+        post_save.connect(invalidate_church_year_cache, dispatch_uid="churchcal_cache_save")
+        post_delete.connect(invalidate_church_year_cache, dispatch_uid="churchcal_cache_delete")
@@ -0,0 +1,135 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+
+class ChurchYearCache(object):
+    """Church years kept in this process, most recently used last, in front of the shared cache
+
+    Keys carry the calendar abbreviation and a fingerprint of the calendar's data and the code version, so a year
+    computed before an import, an admin edit or a deploy is never served afterwards.
+    """
+
+    def __init__(self, size=None, fingerprint_ttl=None):
+        self.size = size if size is not None else settings.CHURCH_YEAR_LOCAL_CACHE_SIZE
+        self.fingerprint_ttl = (
+            fingerprint_ttl if fingerprint_ttl is not None else settings.CHURCH_YEAR_FINGERPRINT_TTL
+        )
+
+        self.lock = threading.RLock()
+        self.years = OrderedDict()
+        self.fingerprints = {}
+        self.flights = {}
+        self.counts = {"local_hits": 0, "shared_hits": 0, "misses": 0}
+
+    def fingerprint(self, calendar="ACNA_BCP2019"):
+        with self.lock:
+            fingerprint, computed = self.fingerprints.get(calendar, (None, 0))
+            if fingerprint and time.monotonic() - computed < self.fingerprint_ttl:
+                return fingerprint
+
+        from churchcal.models import Commemoration, CommemorationRank, Proper, Season, MassReading
+
+        parts = [str(settings.CHURCH_YEAR_CACHE_VERSION)]
+        for model in (Commemoration, CommemorationRank, Proper, Season, MassReading):
+            summary = model.objects.filter(calendar__abbreviation=calendar).aggregate(
+                count=Count("pk"), updated=Max("updated")
+            )
+            parts.append("{}:{}:{}".format(model.__name__, summary["count"], summary["updated"]))
+        fingerprint = hashlib.md5("|".join(parts).encode("utf-8")).hexdigest()[:12]
+
+        with self.lock:
+            self.fingerprints[calendar] = (fingerprint, time.monotonic())
+        return fingerprint
+
+    def key(self, year, calendar="ACNA_BCP2019"):
+        return "church_year:{}:{}:{}".format(calendar, self.fingerprint(calendar), year)
+
+    def get(self, year, build, calendar="ACNA_BCP2019"):
+        """Returns the church year from this process, the shared cache or build(year, calendar), in that order
+
+        Concurrent misses on the same key in this process wait for the first one to build the year.
+        """
+
+        key = self.key(year, calendar)
+
+        with self.lock:
+            church_year = self._get_local(key)
+            if church_year is not None:
+                return church_year
+            flight = self.flights.setdefault(key, threading.Lock())
+
+        with flight:
+            with self.lock:
+                # another thread may have finished the year while this one waited
+                church_year = self._get_local(key)
+                if church_year is not None:
+                    return church_year
+
+            church_year = cache.get(key)
+            if church_year is not None:
+                self._count("shared_hits")
+            else:
+                self._count("misses")
+                church_year = build(year, calendar)
+                cache.set(key, church_year)
+
+            with self.lock:
+                self.years[key] = church_year
+                while len(self.years) > self.size:
+                    self.years.popitem(last=False)
+                self.flights.pop(key, None)
+
+        return church_year
+
+    def invalidate(self, calendar=None):
+        with self.lock:
+            if calendar is None:
+                self.fingerprints.clear()
+                self.years.clear()
+                return
+
+            self.fingerprints.pop(calendar, None)
+            prefix = "church_year:{}:".format(calendar)
+            for key in [key for key in self.years.keys() if key.startswith(prefix)]:
+                del self.years[key]
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.counts)
+            stats["local_size"] = len(self.years)
+        lookups = stats["local_hits"] + stats["shared_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["local_hits"] + stats["shared_hits"]) / lookups if lookups else 0
+        return stats
+
+    def _get_local(self, key):
+        church_year = self.years.get(key)
+        if church_year is not None:
+            self.years.move_to_end(key)
+            self.counts["local_hits"] += 1
+        return church_year
+
+    def _count(self, name):
+        with self.lock:
+            self.counts[name] += 1
+
+
+church_year_cache = ChurchYearCache()
+
+
+def invalidate_church_year_cache(sender, instance, **kwargs):
+    from churchcal.models import Commemoration, CommemorationRank, Proper, Season, MassReading
+
+    # Subclasses of Commemoration send signals under their own sender, so match on instance type
+    if not isinstance(instance, (Commemoration, CommemorationRank, Proper, Season, MassReading)):
+        return
+
+    calendar = getattr(instance, "calendar", None)
+    if calendar is None:
+        return
+    church_year_cache.invalidate(calendar.abbreviation)
@@ -1,16 +1,192 @@
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, date
+from itertools import repeat
+from operator import attrgetter
 
 from dateutil.parser import parse
-from django.core.cache import cache
+from django.conf import settings
+from django.db import connections
 from django.utils.functional import cached_property
 from django.utils.safestring import mark_safe
-from indexed import IndexedOrderedDict
 
-from churchcal.models import Commemoration, FerialCommemoration, Proper, Season, Calendar, CommemorationRank
+from churchcal.models import (
+    Commemoration,
+    Proper,
+    Season,
+    Calendar,
+    CommemorationRank,
+    MassReading,
+    filter_mass_readings,
+    format_saint_collect,
+)
+from churchcal.caching import church_year_cache
+from churchcal.snapshots import load_church_year
+from website.profiling import timed
 from .utils import advent, week_days, easter
 
 
-class CalendarDate(object):
+class cached_slot(object):
+    """Like cached_property, for classes with __slots__: the value is kept in the slot named _<name>"""
+
+    def __init__(self, func):
+        self.func = func
+        self.slot = "_{}".format(func.__name__)
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return getattr(instance, self.slot)
+        except AttributeError:
+            value = self.func(instance)
+            setattr(instance, self.slot, value)
+            return value
+
+    def __set__(self, instance, value):
+        setattr(instance, self.slot, value)
+
+
+class SlotsPickleMixin(object):
+    __slots__ = ()
+
+    def __getstate__(self):
+        state = {}
+        for cls in type(self).__mro__:
+            for slot in getattr(cls, "__slots__", ()):
+                if hasattr(self, slot):
+                    state[slot] = getattr(self, slot)
+        return state
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+
+RankView = namedtuple("RankView", ["pk", "name", "formatted_name", "precedence_rank", "required"])
+
+# sort key for commemorations: the integer precedence of their rank, lowest first
+by_precedence = attrgetter("rank.precedence_rank")
+
+
+class CommemorationView(SlotsPickleMixin):
+    """The fields of a Commemoration that the calendar needs, without the model instance behind them
+
+    Eves and alternate Sundays are made with copy(), which copies these fields instead of deepcopying a model.
+    """
+
+    __slots__ = (
+        "pk",
+        "original_pk",
+        "uuid",
+        "name",
+        "rank",
+        "color",
+        "additional_color",
+        "alternate_color",
+        "alternate_color_2",
+        "color_notes",
+        "collect",
+        "alternate_collect",
+        "eve_collect",
+        "morning_prayer_collect",
+        "evening_prayer_collect",
+        "saint_name",
+        "saint_type",
+        "saint_gender",
+        "saint_fill_in_the_blank",
+        "saint_collect",
+        "link_1",
+        "link_2",
+        "link_3",
+        "transferred",
+    )
+
+    # set by the calendar as names and collects are worked out, so left unset until then
+    CALCULATED_FIELDS = ("morning_prayer_collect", "evening_prayer_collect")
+
+    def __init__(self, **fields):
+        for field in self.__slots__:
+            if field not in self.CALCULATED_FIELDS:
+                setattr(self, field, None)
+        self.transferred = False
+        for field, value in fields.items():
+            setattr(self, field, value)
+
+    @classmethod
+    def from_commemoration(cls, commemoration, rank):
+        return cls(
+            pk=commemoration.pk,
+            uuid=commemoration.uuid,
+            name=commemoration.name,
+            rank=rank,
+            color=commemoration.color,
+            additional_color=commemoration.additional_color,
+            alternate_color=commemoration.alternate_color,
+            alternate_color_2=commemoration.alternate_color_2,
+            color_notes=commemoration.color_notes,
+            collect=commemoration.collect,
+            alternate_collect=commemoration.alternate_collect,
+            eve_collect=commemoration.eve_collect,
+            saint_name=getattr(commemoration, "saint_name", None),
+            saint_type=getattr(commemoration, "saint_type", None),
+            saint_gender=getattr(commemoration, "saint_gender", None),
+            saint_fill_in_the_blank=getattr(commemoration, "saint_fill_in_the_blank", None),
+            saint_collect=getattr(commemoration, "saint_collect", None),
+            link_1=commemoration.link_1,
+            link_2=commemoration.link_2,
+            link_3=commemoration.link_3,
+        )
+
+    @classmethod
+    def feria(cls, season, rank):
+        return cls(
+            name=season.rank.formatted_name, rank=rank, color=season.color, alternate_color=season.alternate_color
+        )
+
+    def copy(self, **changes):
+        view = CommemorationView.__new__(CommemorationView)
+        view.__setstate__(self.__getstate__())
+        view.pk = None
+        view.original_pk = self.original_pk if self.original_pk else self.pk
+        for field, value in changes.items():
+            setattr(view, field, value)
+        return view
+
+    def filter_mass_readings(self, readings, year, time="morning"):
+        return filter_mass_readings(self.name, readings, year, time)
+
+    def __str__(self):
+        return str(self.name)
+
+    def __repr__(self):
+        return "{} ({}) ({})".format(self.name, self.rank.formatted_name, self.color)
+
+
+class CalendarDate(SlotsPickleMixin):
+
+    __slots__ = (
+        "date",
+        "calendar",
+        "required",
+        "optional",
+        "primary",
+        "finalized",
+        "season",
+        "evening_season",
+        "evening_required",
+        "evening_optional",
+        "year",
+        "_proper",
+        "_own_proper",
+        "_office_year",
+        "_mass_readings",
+        "_evening_mass_readings",
+        "_fast_day",
+    )
+
     def __init__(self, date, calendar, year):
 
         self.date = date
@@ -26,8 +202,7 @@ class CalendarDate(object):
         self.year = year
 
     def _find_proper(self):
-        date = datetime.strptime("2019-{}-{}".format(self.date.month, self.date.day), "%Y-%m-%d").date()
-        return Proper.objects.filter(calendar=self.calendar, start_date__lte=date, end_date__gte=date).first()
+        return self.year.proper_index.find(self.date)
 
     @property
     def all(self):
@@ -43,8 +218,13 @@ class CalendarDate(object):
     def primary_evening(self):
         return self.all_evening[0]
 
-    @cached_property
+    @cached_slot
     def proper(self):
+        # the eve of a feast takes the feast's proper (see SetNamesAndCollects.check_previous_evening)
+        return self.own_proper
+
+    @cached_slot
+    def own_proper(self):
         if self.season.name != "Season After Pentecost" and self.primary.name != "The Day of Pentecost":
             return None
 
@@ -53,29 +233,29 @@ class CalendarDate(object):
 
         return None
 
-    @cached_property
+    @cached_slot
     def office_year(self):
 
         return 1 if self.year.start_year % 2 == 0 else 2
 
-    @cached_property
+    @cached_slot
     def mass_readings(self):
         if self.proper:
-            return self.proper.get_mass_readings_for_year(self.year.mass_year)
-        return self.primary.get_mass_readings_for_year(self.year.mass_year)
+            return self.year.mass_reading_index.for_proper(self.proper)
+        return self.year.mass_reading_index.for_commemoration(self.primary)
 
-    @cached_property
+    @cached_slot
     def evening_mass_readings(self):
         if self.proper:
-            return self.proper.get_mass_readings_for_year(self.year.mass_year)
-        return self.primary_evening.get_mass_readings_for_year(self.year.mass_year, time="evening")
+            return self.year.mass_reading_index.for_proper(self.proper)
+        return self.year.mass_reading_index.for_commemoration(self.primary_evening, time="evening")
 
     FAST_NONE = 0
     FAST_PARTIAL = 1
     FAST_FULL = 2
     FAST_DAYS_RANKS = {FAST_NONE: "None", FAST_PARTIAL: "Fast", FAST_FULL: "Fast (Total abstinence)"}
 
-    @cached_property
+    @cached_slot
     def fast_day(self):
 
         # Sundays are never fast days
@@ -112,17 +292,21 @@ class CalendarDate(object):
 
     def _sort_commemorations(self):
 
-        self.required = sorted(self.required, key=lambda commemoration: (commemoration.rank.precedence_rank))
-        self.optional = sorted(self.optional, key=lambda commemoration: (commemoration.rank.precedence_rank))
+        self.required = sorted(self.required, key=by_precedence)
+        self.optional = sorted(self.optional, key=by_precedence)
 
-    def add_commemoration(self, commemoration):
+    def add_commemorations(self, commemorations):
+        """Places a batch of commemorations, sorting them by precedence once rather than after each one"""
 
-        if not commemoration.rank.required:
-            self.optional.append(commemoration)
-        else:
-            self.required.append(commemoration)
+        had_commemorations = self.required or self.optional
+        for commemoration in sorted(commemorations, key=by_precedence):
+            if not commemoration.rank.required:
+                self.optional.append(commemoration)
+            else:
+                self.required.append(commemoration)
 
-        self._sort_commemorations()
+        if had_commemorations:
+            self._sort_commemorations()
 
     def apply_rules(self):
 
@@ -159,8 +343,7 @@ class CalendarDate(object):
         required = self.required.copy()
         if self.season.name not in ("Advent", "Lent", "Holy Week", "Eastertide"):
             if self.required[1].rank.name == "HOLY_DAY":
-                alternate_sunday = self.required[1].copy()
-                alternate_sunday.rank = CommemorationRank.objects.get(calendar=self.calendar, name="ALTERNATE_SUNDAY")
+                alternate_sunday = self.required[1].copy(rank=self.year.ranks["ALTERNATE_SUNDAY"])
                 self.required = self.required[:1] + [alternate_sunday]
             else:
                 self.required = self.required[:1]
@@ -183,12 +366,12 @@ class CalendarDate(object):
         if SetNamesAndCollects.has_collect_for_feria(self):
             return
 
-        self.optional.append(FerialCommemoration(self.date, self.season, self.calendar))
+        self.optional.append(CommemorationView.feria(self.season, self.year.rank_view(self.season.rank)))
 
     def finalize_day(self):
 
         self.append_feria_if_needed()
-        self.optional = sorted(self.optional, key=lambda commemoration: (commemoration.rank.precedence_rank))
+        self.optional = sorted(self.optional, key=by_precedence)
 
         if len(self.required) > 0:
             self.primary = self.required[0]
@@ -204,66 +387,166 @@ class CalendarDate(object):
         )
 
 
+class MassReadingIndex(object):
+    """All of a calendar's mass readings for one cycle year (A, B, or C), loaded in a single query"""
+
+    def __init__(self, calendar, mass_year):
+        self.mass_year = mass_year
+        self.by_commemoration = {}
+        self.by_proper = {}
+
+        readings = (
+            MassReading.objects.filter(calendar=calendar, years__contains=mass_year)
+            .order_by("reading_number", "order")
+            .all()
+        )
+        for reading in readings:
+            if reading.commemoration_id:
+                self.by_commemoration.setdefault(reading.commemoration_id, []).append(reading)
+            if reading.proper_id:
+                self.by_proper.setdefault(reading.proper_id, []).append(reading)
+
+    def for_commemoration(self, commemoration, time="morning"):
+        # copies made for eves and transfers keep the original commemoration's uuid, so an eve is given the feast's
+        # readings and filter_mass_readings picks those for the eve by name (e.g. the vigil for "Eve of Easter Day")
+        readings = self.by_commemoration.get(commemoration.uuid, [])
+        return commemoration.filter_mass_readings(readings, self.mass_year, time)
+
+    def for_proper(self, proper):
+        return list(self.by_proper.get(proper.uuid, []))
+
+
+class ProperIndex(object):
+    """A calendar's propers sorted by start date so that the proper for a date is found by bisection
+
+    Propers are stored with dates in 2019, so only the month and day are compared.
+    """
+
+    def __init__(self, calendar):
+        self.propers = list(Proper.objects.filter(calendar=calendar).order_by("start_date").all())
+        self.starts = [(proper.start_date.month, proper.start_date.day) for proper in self.propers]
+
+    def find(self, date):
+        key = (date.month, date.day)
+        index = bisect_right(self.starts, key) - 1
+        if index < 0:
+            return None
+
+        proper = self.propers[index]
+        if (proper.end_date.month, proper.end_date.day) < key:
+            return None
+
+        return proper
+
+
+class ChurchYearDates(object):
+    """The dates of a ChurchYear in order, looked up by position from the start of the year
+
+    Lookups by "YYYY-MM-DD" string or date object are supported for compatibility with code that treated this as an
+    ordered dictionary of date strings.
+    """
+
+    def __init__(self, calendar_dates, start_date):
+        self._calendar_dates = calendar_dates
+        self._start_ordinal = start_date.toordinal()
+
+    def index(self, key):
+        if isinstance(key, str):
+            key = date.fromisoformat(key)
+        index = key.toordinal() - self._start_ordinal
+        if index < 0 or index >= len(self._calendar_dates):
+            raise KeyError(key)
+        return index
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, slice)):
+            return self._calendar_dates[key]
+        return self._calendar_dates[self.index(key)]
+
+    def __contains__(self, key):
+        try:
+            self.index(key)
+        except (KeyError, ValueError):
+            return False
+        return True
+
+    def __len__(self):
+        return len(self._calendar_dates)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self):
+        return [calendar_date.date.strftime("%Y-%m-%d") for calendar_date in self._calendar_dates]
+
+    def values(self):
+        return self._calendar_dates
+
+    def items(self):
+        return zip(self.keys(), self._calendar_dates)
+
+
 class ChurchYearIterator:
     def __init__(self, church_year, start_position=-1, key=None):
         self._church_year = church_year
+        self._calendar_dates = church_year.calendar_dates
         self._index = start_position + 1
         self._public_index = start_position
         if key:
             self.jump_by_key(key)
 
     def __next__(self):
-        if self._index < len(self._church_year.dates):
-            result = self._church_year.dates.values()[self._index]
+        if self._index < len(self._calendar_dates):
+            result = self._calendar_dates[self._index]
             self._index += 1
             self._public_index += 1
             return result
         raise StopIteration
 
     def next(self):
-        if self.index >= len(self.self._church_year.dates):
+        if self._index >= len(self._calendar_dates):
             raise StopIteration
         self._public_index += 1
         self._index += 1
-        return self._church_year.dates.values()[self._public_index]
+        return self._calendar_dates[self._public_index]
 
     def previous(self):
         if self._index <= 0:
             raise StopIteration
         self._public_index -= 1
         self._index -= 1
-        result = self._church_year.dates.values()[self._public_index]
+        result = self._calendar_dates[self._public_index]
 
         return result
 
     def get_current(self):
-        return self._church_year.dates.values()[self._public_index]
+        return self._calendar_dates[self._public_index]
 
     def get_previous(self):
         if self._index <= 0:
             raise None
-        return self._church_year.dates.values()[self._public_index - 1]
+        return self._calendar_dates[self._public_index - 1]
 
     def get_next(self):
-        if self._index >= len(self._church_year.dates):
+        if self._index >= len(self._calendar_dates):
             return None
-        return self._church_year.dates.values()[self._public_index + 1]
+        return self._calendar_dates[self._public_index + 1]
 
     def get_by_index(self, index):
-        return self._church_year.dates.values()[index]
+        return self._calendar_dates[index]
 
     def get_by_key(self, key):
-        index = self._church_year.dates.keys().index(key)
+        index = self._church_year.dates.index(key)
         return self.get_by_index(index)
 
     def jump_by_index(self, index):
-        result = self._church_year.dates.values()[index]
+        result = self._calendar_dates[index]
         self._index = index + 1
         self._public_index = index
         return result
 
     def jump_by_key(self, key):
-        index = self._church_year.dates.keys().index(key)
+        index = self._church_year.dates.index(key)
         return self.jump_by_index(index)
 
     def get_current_index(self):
@@ -272,61 +555,72 @@ class ChurchYearIterator:
 
 class ChurchYear(object):
     def __iter__(self):
+        if self.lazy:
+            self.names_and_collects.resolve_all()
         return ChurchYearIterator(self)
 
-    def __init__(self, year_of_advent, calendar="ACNA_BCP2019"):
+    def __init__(self, year_of_advent, calendar="ACNA_BCP2019", lazy=False):
 
         self.calendar = Calendar.objects.filter(abbreviation=calendar).first()
 
         self.start_year = year_of_advent
         self.end_year = year_of_advent + 1
-
-        self.dates = IndexedOrderedDict()
+        self.lazy = lazy
 
         start_date = advent(year_of_advent)
         end_date = advent(year_of_advent + 1) - timedelta(days=1)
 
         self.start_date = start_date
         self.end_date = end_date
+        self.start_ordinal = start_date.toordinal()
 
         self.seasons = self._get_seasons()
+        self._rank_views = {}
+        self.ranks = {
+            rank.name: self.rank_view(rank) for rank in CommemorationRank.objects.filter(calendar=self.calendar).all()
+        }
         self.season_tracker = None
-        # create each date
-        for single_date in self.daterange(start_date, end_date):
-            name = single_date.strftime("%Y-%m-%d")
-            self.dates[name] = CalendarDate(single_date, calendar=self.calendar, year=self)
+        # create each date, indexed by days since the start of the year
+        self.calendar_dates = [
+            CalendarDate(single_date, calendar=self.calendar, year=self)
+            for single_date in self.daterange(start_date, end_date)
+        ]
+        self.dates = ChurchYearDates(self.calendar_dates, start_date)
 
         # add commemorations to date
-        commemorations = (
-            Commemoration.objects.select_related("rank", "cannot_occur_after__rank")
-            .filter(calendar__abbreviation=calendar)
-            .all()
-        )
+        # one query loads every commemoration as its concrete subclass; "cannot occur after" lookups use this index
+        commemorations = list(Commemoration.objects.select_related("rank").filter(calendar=self.calendar).all())
+        commemorations_by_pk = {commemoration.pk: commemoration for commemoration in commemorations}
+        # bucket them by date first, then place each date's in one sorted batch
         already_added = []
+        by_index = {}
         for commemoration in commemorations:
 
-            if not commemoration.can_occur_in_year(self.start_year):
+            if not commemoration.can_occur_in_year(self.start_year, commemorations_by_pk):
                 continue
 
-            try:
-                self.dates[commemoration.initial_date_string(self.start_year)].add_commemoration(commemoration)
+            index = commemoration.initial_date(self.start_year).toordinal() - self.start_ordinal
+            if 0 <= index < len(self.calendar_dates):
+                view = CommemorationView.from_commemoration(commemoration, self.rank_view(commemoration.rank))
+                by_index.setdefault(index, []).append(view)
                 already_added.append(commemoration.pk)
 
-            except KeyError:
-                pass
+        for index, views in by_index.items():
+            self.calendar_dates[index].add_commemorations(views)
 
-        for key, calendar_date in self.dates.items():
+        for index, calendar_date in enumerate(self.calendar_dates):
 
             # seasons
             self._set_season(calendar_date)
 
             # apply transfers
             transfers = calendar_date.apply_rules()
-            new_date = (calendar_date.date + timedelta(days=1)).strftime("%Y-%m-%d")
-            if new_date in self.dates.keys():
-                self.dates[new_date].required = transfers + self.dates[new_date].required
+            if index + 1 < len(self.calendar_dates):
+                next_date = self.calendar_dates[index + 1]
+                next_date.required = transfers + next_date.required
 
-        SetNamesAndCollects(self)
+        # In lazy mode names and collects are only set for the dates get_date needs
+        self.names_and_collects = SetNamesAndCollects(self, lazy=lazy)
 
         # print(
         #     "{} = {} - {} {}".format(
@@ -344,7 +638,8 @@ class ChurchYear(object):
 
     def _get_seasons(self):
         seasons = (
-            Season.objects.filter(calendar=Calendar.objects.filter(abbreviation=self.calendar.abbreviation).get())
+            Season.objects.select_related("start_commemoration", "rank")
+            .filter(calendar=self.calendar)
             .order_by("order")
             .all()
         )
@@ -352,7 +647,7 @@ class ChurchYear(object):
         for season in seasons:
             season_mapping[season.start_commemoration.name] = season
         self.seasons = season_mapping
-        # print(self.seasons)
+        return season_mapping
 
     def _set_season(self, calendar_date):
 
@@ -378,6 +673,17 @@ class ChurchYear(object):
 
         calendar_date.evening_season = calendar_date.season
 
+    def rank_view(self, rank):
+        if rank.pk not in self._rank_views:
+            self._rank_views[rank.pk] = RankView(
+                pk=rank.pk,
+                name=rank.name,
+                formatted_name=rank.formatted_name,
+                precedence_rank=rank.precedence_rank,
+                required=rank.required,
+            )
+        return self._rank_views[rank.pk]
+
     @staticmethod
     def daterange(start_date, end_date):
         for n in range(int((end_date - start_date).days + 1)):
@@ -395,6 +701,14 @@ class ChurchYear(object):
         if self.start_year % 3 == 2:
             return "C"
 
+    @cached_property
+    def proper_index(self):
+        return ProperIndex(self.calendar)
+
+    @cached_property
+    def mass_reading_index(self):
+        return MassReadingIndex(self.calendar, self.mass_year)
+
     @cached_property
     def daily_mass_year(self):
 
@@ -407,23 +721,60 @@ class ChurchYear(object):
 
     @cached_property
     def first_date(self):
-        return self.dates[:1]
+        return self.calendar_dates[0]
 
     @cached_property
     def last_date(self):
-        return self.dates[-1]
+        return self.calendar_dates[-1]
 
     def get_date(self, date_string):
         date = to_date(date_string)
-        try:
-            date = self.dates[date.strftime("%Y-%m-%d")]
-            date.year = self
-            return date
-        except KeyError:
+        index = date.toordinal() - self.start_ordinal
+        if index < 0 or index >= len(self.calendar_dates):
             print(date)
             print(date.strftime("%Y-%m-%d"))
             return None
 
+        if self.lazy:
+            self.names_and_collects.resolve(index)
+        calendar_date = self.calendar_dates[index]
+        calendar_date.year = self
+        return calendar_date
+
+    @classmethod
+    def build_range(cls, start_year, end_year, calendar="ACNA_BCP2019", workers=None, snapshots=True):
+        """Returns the church years beginning in start_year through end_year, in order
+
+        With more than one worker the years are built in separate processes, each with its own database connection.
+        Saved snapshots are used where they exist unless snapshots is False.
+        """
+
+        years = list(range(start_year, end_year + 1))
+        if workers is None:
+            workers = settings.CHURCH_YEAR_BUILD_WORKERS
+        workers = min(workers, len(years))
+
+        if workers <= 1:
+            return [build_church_year(year, calendar, snapshots) for year in years]
+
+        # forked workers must not share the parent's connection, so let each one open its own
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=setup_church_year_worker) as executor:
+            return list(executor.map(build_church_year, years, repeat(calendar), repeat(snapshots)))
+
+
+def setup_church_year_worker():
+    import django
+
+    django.setup()
+
+
+def build_church_year(year, calendar="ACNA_BCP2019", snapshots=True):
+    church_year = load_church_year(year, calendar) if snapshots else None
+    if not church_year:
+        church_year = ChurchYear(year, calendar=calendar)
+    return church_year
+
 
 class CalendarYear(object):
     def __init__(self, year):
@@ -431,66 +782,161 @@ class CalendarYear(object):
         first_year = year - 1
         second_year = year
 
-        first_year = ChurchYear(first_year)
-        second_year = ChurchYear(second_year)
+        first_year, second_year = ChurchYear.build_range(first_year, second_year, workers=1)
 
-        dates = IndexedOrderedDict(list(first_year.dates.items()) + list(second_year.dates.items()))
+        dates = first_year.calendar_dates + second_year.calendar_dates
 
         base = datetime(year, 1, 1)
         date_list = [base + timedelta(days=x) for x in range(0, 365)]
 
-        self.dates = [dates[date.strftime("%Y-%m-%d")] for date in date_list]
+        self.dates = [dates[date.toordinal() - first_year.start_ordinal] for date in date_list]
 
 
 class SetNamesAndCollects(object):
-    def __init__(self, church_calendar):
+    def __init__(self, church_calendar, lazy=False):
 
         self.church_calendar = church_calendar
 
-        checks = [self.own_collect, self.proper_collect, self.feria_collect, self.saint_collect, self.fallback_collect]
-
-        self.i = iter(self.church_calendar)
+        self.checks = [
+            self.own_collect,
+            self.proper_collect,
+            self.feria_collect,
+            self.saint_collect,
+            self.fallback_collect,
+        ]
+
+        # indexes of the dates whose collects (and O antiphons) have been set, used in lazy mode
+        self.resolved = set()
+        self.antiphons_applied = set()
+
+        # indexes of the Sundays and feasts that ferias take their names and collects from, in order
+        self.governing_indexes = []
+
+        # One pass over the year: Septuagesima names, governing dates and, unless lazy, collects. O antiphons are
+        # added to a date's names once the next governing date is reached, since the ferias before it are named
+        # after it without them.
+        pending_antiphons = []
+        self.i = ChurchYearIterator(self.church_calendar)
         while True:
             try:
                 calendar_date = next(self.i)
+                index = self.i.get_current_index()
 
                 for commemoration in calendar_date.all:
 
                     if "SUNDAY" in commemoration.rank.name:
                         self.append_seuptuagesima_if_needed(commemoration, calendar_date)
 
-            except StopIteration:
-                break
+                governing = self.has_collect_for_feria(calendar_date)
+                if governing:
+                    self.governing_indexes.append(index)
 
-        self.i = iter(self.church_calendar)
-        while True:
-            try:
-                calendar_date = next(self.i)
-                # print(calendar_date.date, calendar_date.primary.name, self.i.get_previous().primary.name, self.i.get_next().primary.name)
+                if lazy:
+                    continue
 
-                for commemoration in calendar_date.all:
+                self.set_collects(calendar_date)
+                self.resolved.add(index)
 
-                    for check in checks:
-                        check(commemoration, calendar_date)
-                        if hasattr(commemoration, "morning_prayer_collect"):
-                            break
-                    self.check_previous_evening(calendar_date)
+                if governing:
+                    self.apply_pending_antiphons(pending_antiphons)
+                    pending_antiphons = []
+                pending_antiphons.append(index)
 
             except StopIteration:
                 break
 
-        self.i = iter(self.church_calendar)
-        while True:
-            try:
-                calendar_date = next(self.i)
+        self.apply_pending_antiphons(pending_antiphons)
 
-                for commemoration in calendar_date.all:
+    def apply_pending_antiphons(self, indexes):
 
-                    if "SUNDAY" in commemoration.rank.name:
-                        self.append_o_antiphon_if_needed(commemoration, calendar_date)
+        for index in indexes:
+            self.append_o_antiphons(self.i.get_by_index(index))
+            self.antiphons_applied.add(index)
 
-            except StopIteration:
-                break
+    def set_collects(self, calendar_date):
+
+        for commemoration in calendar_date.all:
+
+            for check in self.checks:
+                check(commemoration, calendar_date)
+                if hasattr(commemoration, "morning_prayer_collect"):
+                    break
+            self.check_previous_evening(calendar_date)
+
+    def append_o_antiphons(self, calendar_date):
+
+        for commemoration in calendar_date.all:
+
+            if "SUNDAY" in commemoration.rank.name:
+                self.append_o_antiphon_if_needed(commemoration, calendar_date)
+
+    def governing_index(self, index):
+        """The closest earlier date whose collect a feria on the date at index would take"""
+
+        position = bisect_left(self.governing_indexes, index) - 1
+        return self.governing_indexes[position] if position >= 0 else 0
+
+    def next_governing_index(self, index):
+
+        position = bisect_right(self.governing_indexes, index)
+        if position < len(self.governing_indexes):
+            return self.governing_indexes[position]
+        return len(self.church_calendar.calendar_dates)
+
+    def governing_date(self, index):
+        """The Sunday or feast a feria on the date at index is named after and takes its collect from"""
+
+        position = bisect_left(self.governing_indexes, index) - 1
+        if position < 0:
+            return None
+        return self.i.get_by_index(self.governing_indexes[position])
+
+    def resolve(self, index):
+        """Sets names and collects for only the dates that the date at index depends on
+
+        That is the governing Sunday or feast that its ferias take their collect from, the following day (whose eve
+        may replace this evening's commemorations), and the rest of the week after this date, since O antiphons can
+        only be added to a Sunday's name once the ferias named after it have been set. Dates are processed in order
+        and never twice, so the result is the same as setting the whole year at once.
+        """
+
+        last_index = len(self.church_calendar.calendar_dates) - 1
+        start = self.governing_index(index)
+        end = min(max(index + 1, self.next_governing_index(index) - 1), last_index)
+
+        for position in range(start, end + 1):
+            if position in self.resolved:
+                continue
+            calendar_date = self.i.jump_by_index(position)
+            self.set_collects(calendar_date)
+            self.resolved.add(position)
+
+        for position in range(start, end + 1):
+            self.append_o_antiphons_if_ready(position)
+
+    def resolve_all(self):
+
+        for position in range(len(self.church_calendar.calendar_dates)):
+            if position in self.resolved:
+                continue
+            calendar_date = self.i.jump_by_index(position)
+            self.set_collects(calendar_date)
+            self.resolved.add(position)
+
+        for position in range(len(self.church_calendar.calendar_dates)):
+            self.append_o_antiphons_if_ready(position)
+
+    def append_o_antiphons_if_ready(self, index):
+
+        if index in self.antiphons_applied or index not in self.resolved:
+            return
+
+        for position in range(index + 1, self.next_governing_index(index)):
+            if position not in self.resolved:
+                return
+
+        self.append_o_antiphons(self.i.get_by_index(index))
+        self.antiphons_applied.add(index)
 
     def check_previous_evening(self, calendar_date):
 
@@ -509,14 +955,13 @@ class SetNamesAndCollects(object):
 
         previous.evening_required = previous.required.copy()
         previous.evening_optional = previous.optional.copy()
-        feast_copy = calendar_date.primary.copy()
-        feast_copy.name = "Eve of {}".format(feast_copy.name)
+        feast_copy = calendar_date.primary.copy(name="Eve of {}".format(calendar_date.primary.name))
 
         if feast_copy.eve_collect:
             feast_copy.evening_prayer_collect = feast_copy.eve_collect
 
         previous.evening_required.append(feast_copy)
-        previous.proper = calendar_date.proper
+        previous.proper = calendar_date.own_proper
 
         for idx, commemoration in enumerate(previous.evening_required):
             if "PRIVILEGED_OBSERVANCE" in commemoration.rank.name:
@@ -547,54 +992,48 @@ class SetNamesAndCollects(object):
     def proper_collect(self, commemoration, calendar_date):
         if not commemoration.rank.required:
             return
-        if calendar_date.proper and calendar_date.proper.collect:
-            commemoration.morning_prayer_collect = commemoration.evening_prayer_collect = calendar_date.proper.collect
+        proper = calendar_date.own_proper
+        if proper and proper.collect:
+            commemoration.morning_prayer_collect = commemoration.evening_prayer_collect = proper.collect
             if commemoration.rank.name == "SUNDAY":
-                proper_string = " (Proper {})".format(calendar_date.proper.number)
+                proper_string = " (Proper {})".format(proper.number)
                 commemoration.name = "{}{}".format(commemoration.name, proper_string)
 
     def feria_collect(self, commemoration, calendar_date):
 
         if "FERIA" in commemoration.rank.name:
-            i = self.i.get_current_index()
-            while True:
-                i = i - 1
-                previous = self.i.get_by_index(i)
-                if not previous:
-                    break
-                if self.has_collect_for_feria(previous):
-
-                    if previous.proper and previous.proper.collect:
-                        commemoration.morning_prayer_collect = previous.proper.collect
-                        commemoration.evening_prayer_collect = previous.proper.collect
-                        name = previous.primary.name
-                        if name[:3] == "The":
-                            name = name.replace("The ", "the ")
-                        if previous.primary.rank.name == "PRINCIPAL_FEAST":
-                            proper_string = " (Proper {})".format(previous.proper.number)
-                            commemoration.name = "{} after {}{}".format(
-                                week_days[calendar_date.date.weekday()], name, proper_string
-                            )
-                        else:
-                            commemoration.name = "{} after {}".format(week_days[calendar_date.date.weekday()], name)
-                    else:
-                        commemoration.morning_prayer_collect = previous.primary.morning_prayer_collect.replace(
-                            "to be born this day of a pure virgin", "to be born of a pure virgin"
-                        )
-                        commemoration.evening_prayer_collect = previous.primary.evening_prayer_collect.replace(
-                            "to be born this day of a pure virgin", "to be born of a pure virgin"
-                        )
-                        commemoration.name = "{} after {}".format(
-                            week_days[calendar_date.date.weekday()], previous.primary.name.replace("The ", "the ")
-                        )
-                    self.append_seuptuagesima_if_needed(commemoration, calendar_date)
-                    self.append_o_antiphon_if_needed(commemoration, calendar_date)
-                    if "gesima" in commemoration.name:
-                        commemoration.alternate_color_2 = "purple" if commemoration.alternate_color else None
-                        commemoration.alternate_color = (
-                            commemoration.alternate_color if commemoration.alternate_color else "purple"
+            previous = self.governing_date(self.i.get_current_index())
+            if previous:
+                if previous.proper and previous.proper.collect:
+                    commemoration.morning_prayer_collect = previous.proper.collect
+                    commemoration.evening_prayer_collect = previous.proper.collect
+                    name = previous.primary.name
+                    if name[:3] == "The":
+                        name = name.replace("The ", "the ")
+                    if previous.primary.rank.name == "PRINCIPAL_FEAST":
+                        proper_string = " (Proper {})".format(previous.proper.number)
+                        commemoration.name = "{} after {}{}".format(
+                            week_days[calendar_date.date.weekday()], name, proper_string
                         )
-                    break
+                    else:
+                        commemoration.name = "{} after {}".format(week_days[calendar_date.date.weekday()], name)
+                else:
+                    commemoration.morning_prayer_collect = previous.primary.morning_prayer_collect.replace(
+                        "to be born this day of a pure virgin", "to be born of a pure virgin"
+                    )
+                    commemoration.evening_prayer_collect = previous.primary.evening_prayer_collect.replace(
+                        "to be born this day of a pure virgin", "to be born of a pure virgin"
+                    )
+                    commemoration.name = "{} after {}".format(
+                        week_days[calendar_date.date.weekday()], previous.primary.name.replace("The ", "the ")
+                    )
+                self.append_seuptuagesima_if_needed(commemoration, calendar_date)
+                self.append_o_antiphon_if_needed(commemoration, calendar_date)
+                if "gesima" in commemoration.name:
+                    commemoration.alternate_color_2 = "purple" if commemoration.alternate_color else None
+                    commemoration.alternate_color = (
+                        commemoration.alternate_color if commemoration.alternate_color else "purple"
+                    )
 
         return False
 
@@ -653,92 +1092,13 @@ class SetNamesAndCollects(object):
         if not commemoration.saint_type:
             return False
 
-        if commemoration.saint_type == "PASTOR":
-            if commemoration.saint_gender in ["M", "F"]:
-                text = "O God, our heavenly Father, you raised up your faithful servant {} to be a {} pastor in your Church and to feed your flock: Give abundantly to all pastors the gifts of your Holy Spirit, that they may minister in your household as true servants of Christ and stewards of your divine mysteries; through Jesus Christ our Lord, who lives and reigns with you and the Holy Spirit, one God, for ever and ever.".format(
-                    commemoration.saint_name, commemoration.saint_fill_in_the_blank
-                ).replace(
-                    " ", " "
-                )
-            else:
-                text = "O God, our heavenly Father, you raised up your faithful servants {} to be {} pastors in your Church and to feed your flock: Give abundantly to all pastors the gifts of your Holy Spirit, that they may minister in your household as true servants of Christ and stewards of your divine mysteries; through Jesus Christ our Lord, who lives and reigns with you and the Holy Spirit, one God, for ever and ever.".format(
-                    commemoration.saint_name, commemoration.saint_fill_in_the_blank
-                ).replace(
-                    " ", " "
-                )
-
-        if commemoration.saint_type == "MONASTIC":
-            text = "O God, your blessed Son became poor for our sake, and chose the Cross over the kingdoms of this world: Deliver us from an inordinate love of worldly things, that we, inspired by the devotion of your servant{} {}, may seek you with singleness of heart, behold your glory by faith, and attain to the riches of your everlasting kingdom, where we shall be united with our Savior Jesus Christ; who lives and reigns with you and the Holy Spirit, one God, now and for ever. ".format(
-                "s" if commemoration.saint_gender == "P" else "", commemoration.saint_name
-            )
-
-        if commemoration.saint_type == "MARTYR":
-            text = "Almighty God, you gave your servant{} {} boldness to confess the Name of our Savior Jesus Christ before the rulers of this world, and courage to die for this faith: Grant that we may always be ready to give a reason for the hope that is in us, and to suffer gladly for the sake of our Lord Jesus Christ; who lives and reigns with you and the Holy Spirit, one God, for ever and ever. ".format(
-                "s" if commemoration.saint_gender == "P" else "", commemoration.saint_name
-            )
-
-        if commemoration.saint_type == "MISSIONARY":
-            text = (
-                "Almighty and everlasting God, you called your servant{} {} to preach the Gospel {}: Raise up in this and every land evangelists and heralds of your kingdom, that your Church may proclaim the unsearchable riches of our Savior Jesus Christ; who lives and reigns with you and the Holy Spirit, one God, now and for ever.".format(
-                    "s" if commemoration.saint_gender == "P" else "",
-                    commemoration.saint_name,
-                    commemoration.saint_fill_in_the_blank,
-                )
-                .replace(" ", " ")
-                .replace(" :", ":")
-            )
-
-        if commemoration.saint_type == "TEACHER":
-            text = "Almighty God, you gave your servant{} {} special gifts of grace to understand and teach the truth revealed in Christ Jesus: Grant that by this teaching we may know you, the one true God, and Jesus Christ whom you have sent; who lives and reigns with you and the Holy Spirit, one God, for ever and ever.".format(
-                "s" if commemoration.saint_gender == "P" else "", commemoration.saint_name
-            )
-
-        if commemoration.saint_type == "RENEWER":
-            text = "Almighty and everlasting God, you kindled the flame of your love in the heart of your servant{} {} to manifest your compassion and mercy to the poor and the persecuted: Grant to us, your humble servants, a like faith and power of love, that we who give thanks for {} righteous zeal may profit by {} example; through Jesus Christ our Lord, who lives and reigns with you and the Holy Spirit, one God, for ever and ever.".format(
-                "s" if commemoration.saint_gender == "P" else "",
-                commemoration.saint_name,
-                "his"
-                if commemoration.saint_gender == "M"
-                else "her"
-                if commemoration.saint_gender == "F"
-                else "their",
-                "his"
-                if commemoration.saint_gender == "M"
-                else "her"
-                if commemoration.saint_gender == "F"
-                else "their",
-            )
-
-        if commemoration.saint_type == "REFORMER":
-            text = "O God, by your grace your servant{} {}, kindled by the flame of your love, became {} burning and shining light{} in your Church, turning pride into humility and error into truth: Grant that we may be set aflame with the same spirit of love and discipline, and walk before you as children of light; through Jesus Christ our Lord, who lives and reigns with you, in the unity of the Holy Spirit, one God, now and for ever.".format(
-                "s" if commemoration.saint_gender == "P" else "",
-                commemoration.saint_name,
-                "a" if commemoration.saint_gender != "P" else "",
-                "s" if commemoration.saint_gender == "P" else "",
-            ).replace(
-                " ", " "
-            )
-
-        if commemoration.saint_type == "ECUMENIST":
-            text = "Almighty God, we give you thanks for the ministry of {}, who labored that the Church of Jesus Christ might be one: Grant that we, instructed by {} teaching and example, and knit together in unity by your Spirit, may ever stand firm upon the one foundation, which is Jesus Christ our Lord; who lives and reigns with you, in the unity of the Holy Spirit, one God, now and for ever.".format(
-                commemoration.saint_name,
-                "his"
-                if commemoration.saint_gender == "M"
-                else "her"
-                if commemoration.saint_gender == "F"
-                else "their",
-            )
-
-        if commemoration.saint_type == "SAINT_1":
-            text = "Almighty God, you have surrounded us with a great cloud of witnesses: Grant that we, encouraged by the good example of your servant{} {}, may persevere in running the race that is set before us, until at last, with {}, we attain to your eternal joy; through Jesus Christ, the pioneer and perfecter of our faith, who lives and reigns with you and the Holy Spirit, one God, for ever and ever.".format(
-                "s" if commemoration.saint_gender == "P" else "",
-                commemoration.saint_name,
-                "him" if commemoration.saint_gender == "M" else "her" if commemoration.saint_gender == "F" else "them",
-            )
-
-        if commemoration.saint_type == "SAINT_2":
-            text = "Almighty God, by your Holy Spirit you have made us one with your saints in heaven and on earth: Grant that in our earthly pilgrimage we may always be supported by this fellowship of love and prayer, and know ourselves to be surrounded by their witness to your power and mercy; for the sake of Jesus Christ, in whom all our intercessions are acceptable through the Spirit, and who lives and reigns with you and the same Spirit, one God, for ever and ever."
-
+        # stored on the commemoration when it is saved; formatted here only for rows saved before that
+        text = getattr(commemoration, "saint_collect", None) or format_saint_collect(
+            commemoration.saint_type,
+            commemoration.saint_name,
+            commemoration.saint_gender,
+            commemoration.saint_fill_in_the_blank,
+        )
         if text:
             commemoration.morning_prayer_collect = commemoration.evening_prayer_collect = text
 
@@ -828,7 +1188,7 @@ def to_date(date_string):
         return date_string.date()
 
     if isinstance(date_string, date):
-        return date
+        return date_string
 
     if isinstance(date_string, str):
         try:
@@ -839,13 +1199,19 @@ def to_date(date_string):
     return None
 
 
-def get_calendar_date(date_string):
-    date = to_date(date_string)
-    advent_start = advent(date.year)
-    year = date.year if date >= advent_start else date.year - 1
-    # church_year = ChurchYear(year)
-    church_year = cache.get(str(year))
+def build_lazy_church_year(year, calendar="ACNA_BCP2019"):
+    church_year = load_church_year(year, calendar)
     if not church_year:
-        church_year = ChurchYear(year)
-        cache.set(str(year), church_year)
-    return church_year.get_date(date_string)
+        church_year = ChurchYear(year, calendar=calendar, lazy=True)
+    return church_year
+
+
+def get_calendar_date(date_string, calendar="ACNA_BCP2019"):
+    with timed("calendar", date_string):
+        date = to_date(date_string)
+        advent_start = advent(date.year)
+        year = date.year if date >= advent_start else date.year - 1
+        church_year = church_year_cache.get(year, build_lazy_church_year, calendar=calendar)
+        # lazy years fill in names and collects as dates are asked for, so one thread at a time
+        with church_year_cache.lock:
+            return church_year.get_date(date_string)
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from churchcal.models import SanctoraleCommemoration
+
+
+class Command(BaseCommand):
+
+    help = "Stores the formatted collect on every saint's commemoration saved before collects were stored"
+
+    def handle(self, *args, **options):
+
+        updated = 0
+        commemorations = SanctoraleCommemoration.objects.all()
+        for commemoration in commemorations:
+            saint_collect = commemoration.get_saint_collect()
+            if saint_collect != commemoration.saint_collect:
+                # update() rather than save() so that the row's updated time, and with it every cached year, is kept
+                SanctoraleCommemoration.objects.filter(pk=commemoration.pk).update(saint_collect=saint_collect)
+                updated += 1
+
+        print("Stored {} of {} saint collects".format(updated, len(commemorations)))
@@ -0,0 +1,86 @@
+import json
+import pickle
+import timeit
+import tracemalloc
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from churchcal.calculations import ChurchYear
+
+
+def change(after, before):
+    if not before:
+        return ""
+    return " ({:+.0%})".format(after / before - 1)
+
+
+class Command(BaseCommand):
+
+    help = (
+        "Times full ChurchYear construction and reports the memory held, the peak memory while building and the "
+        "pickled size of each year. To compare two versions of the code, run it with --save on one and --compare on "
+        "the other"
+    )
+
+    def add_arguments(self, parser):
+
+        parser.add_argument("--calendar", dest="calendar", default="ACNA_BCP2019", help="Calendar abbreviation")
+        parser.add_argument("--start_year", dest="start_year", type=int, default=settings.FIRST_BEGINNING_YEAR)
+        parser.add_argument("--end_year", dest="end_year", type=int, default=settings.LAST_BEGINNING_YEAR)
+        parser.add_argument("--repeat", dest="repeat", type=int, default=5, help="Builds per year")
+        parser.add_argument("--save", dest="save", default=None, help="Write the results to this JSON file")
+        parser.add_argument(
+            "--compare", dest="compare", default=None, help="Show the change from results saved with --save"
+        )
+
+    def handle(self, *args, **options):
+
+        before = {}
+        if options["compare"]:
+            with open(options["compare"]) as f:
+                before = json.load(f)
+
+        results = {}
+        for year in range(options["start_year"], options["end_year"] + 1):
+            timings = timeit.repeat(
+                lambda: ChurchYear(year, calendar=options["calendar"]), number=1, repeat=options["repeat"]
+            )
+
+            tracemalloc.start()
+            church_year = ChurchYear(year, calendar=options["calendar"])
+            memory, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            size = len(pickle.dumps(church_year, protocol=pickle.HIGHEST_PROTOCOL))
+            result = {
+                "best": min(timings),
+                "mean": sum(timings) / len(timings),
+                "held": memory,
+                "peak": peak,
+                "pickled": size,
+            }
+            results[str(year)] = result
+
+            previous = before.get(str(year), {})
+            print(
+                "{}-{}: best {:.1f} ms{}, mean {:.1f} ms{}, "
+                "held {:.1f} KB{}, peak {:.1f} KB{}, pickled {:.1f} KB{}".format(
+                    year,
+                    year + 1,
+                    result["best"] * 1000,
+                    change(result["best"], previous.get("best")),
+                    result["mean"] * 1000,
+                    change(result["mean"], previous.get("mean")),
+                    result["held"] / 1024,
+                    change(result["held"], previous.get("held")),
+                    result["peak"] / 1024,
+                    change(result["peak"], previous.get("peak")),
+                    result["pickled"] / 1024,
+                    change(result["pickled"], previous.get("pickled")),
+                )
+            )
+
+        if options["save"]:
+            with open(options["save"], "w") as f:
+                json.dump(results, f, indent=1)
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from churchcal.calculations import ChurchYear
+from churchcal.models import Calendar
+from churchcal.snapshots import save_church_year, clear_church_years
+
+
+class Command(BaseCommand):
+
+    help = "Builds each church year once and saves it to disk so that renders can load it instead of computing it"
+
+    def add_arguments(self, parser):
+
+        parser.add_argument("--calendar", dest="calendar", default="ACNA_BCP2019", help="Calendar abbreviation")
+        parser.add_argument("--start_year", dest="start_year", type=int, default=settings.FIRST_BEGINNING_YEAR)
+        parser.add_argument("--end_year", dest="end_year", type=int, default=settings.LAST_BEGINNING_YEAR)
+        parser.add_argument("--clear", action="store_true", dest="clear", help="Remove existing snapshots first")
+        parser.add_argument(
+            "--workers",
+            dest="workers",
+            type=int,
+            default=settings.CHURCH_YEAR_BUILD_WORKERS,
+            help="Processes to build years in",
+        )
+
+    def handle(self, *args, **options):
+
+        if not Calendar.objects.filter(abbreviation=options["calendar"]).exists():
+            raise Exception("You must supply a valid calendar abbreviation for which to build snapshots.")
+
+        if options["clear"]:
+            removed = clear_church_years(options["calendar"])
+            print("Removed {} snapshots".format(removed))
+
+        church_years = ChurchYear.build_range(
+            options["start_year"],
+            options["end_year"],
+            calendar=options["calendar"],
+            workers=options["workers"],
+            snapshots=False,
+        )
+        for church_year in church_years:
+            path = save_church_year(church_year)
+            print("{} {}-{} => {}".format(options["calendar"], church_year.start_year, church_year.end_year, path))
@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from churchcal.calculations import ChurchYear
+
+
+def describe(calendar_date):
+    def commemorations(items):
+        return [
+            (
+                str(commemoration.name),
+                commemoration.rank.name,
+                getattr(commemoration, "morning_prayer_collect", None),
+                getattr(commemoration, "evening_prayer_collect", None),
+            )
+            for commemoration in items
+        ]
+
+    return (
+        commemorations(calendar_date.all),
+        commemorations(calendar_date.all_evening),
+        calendar_date.primary.name,
+        calendar_date.season.name if calendar_date.season else None,
+        calendar_date.evening_season.name if calendar_date.evening_season else None,
+        calendar_date.proper.number if calendar_date.proper else None,
+    )
+
+
+class Command(BaseCommand):
+
+    help = "Checks that resolving single dates of a lazy ChurchYear gives the same result as building the whole year"
+
+    def add_arguments(self, parser):
+
+        parser.add_argument("--calendar", dest="calendar", default="ACNA_BCP2019", help="Calendar abbreviation")
+        parser.add_argument("--start_year", dest="start_year", type=int, default=settings.FIRST_BEGINNING_YEAR)
+        parser.add_argument("--end_year", dest="end_year", type=int, default=settings.LAST_BEGINNING_YEAR)
+
+    def handle(self, *args, **options):
+
+        mismatches = 0
+        for year in range(options["start_year"], options["end_year"] + 1):
+            eager = ChurchYear(year, calendar=options["calendar"])
+            for key, calendar_date in eager.dates.items():
+                lazy = ChurchYear(year, calendar=options["calendar"], lazy=True)
+                lazy_date = lazy.get_date(calendar_date.date)
+                if describe(lazy_date) != describe(calendar_date):
+                    mismatches += 1
+                    print("MISMATCH {}".format(key))
+                    print("  eager: {}".format(describe(calendar_date)))
+                    print("  lazy:  {}".format(describe(lazy_date)))
+                    continue
+                resolved = len(lazy.names_and_collects.resolved)
+                print("{} ok ({} of {} dates resolved)".format(key, resolved, len(lazy.dates)))
+
+        print("{} mismatches".format(mismatches))
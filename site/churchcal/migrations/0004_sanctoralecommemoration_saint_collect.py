@@ -0,0 +1,14 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("churchcal", "0003_common_massreading")]
+
+    operations = [
+        migrations.AddField(
+            model_name="sanctoralecommemoration",
+            name="saint_collect",
+            field=models.TextField(blank=True, editable=False, null=True),
+        )
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+from churchcal.migrations._intros_0005 import passage_intro
+
+
+def set_intros(apps, schema_editor):
+    MassReading = apps.get_model("churchcal", "MassReading")
+    readings = list(MassReading.objects.all())
+    for reading in readings:
+        reading.long_intro = passage_intro(reading.long_citation)
+        reading.short_intro = passage_intro(reading.short_citation or reading.long_citation)
+    MassReading.objects.bulk_update(readings, ["long_intro", "short_intro"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("churchcal", "0004_sanctoralecommemoration_saint_collect")]
+
+    operations = [
+        migrations.AddField(
+            model_name="massreading",
+            name="long_intro",
+            field=models.CharField(blank=True, editable=False, max_length=256, null=True),
+        ),
+        migrations.AddField(
+            model_name="massreading",
+            name="short_intro",
+            field=models.CharField(blank=True, editable=False, max_length=256, null=True),
+        ),
+        migrations.RunPython(set_intros, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,8 @@
 import scriptures
-from num2words import num2words
 
-books = {
+# A copy of the introductions as churchcal.utils.passage_intro made them when the 0005 migrations of churchcal and
+# office were written, so that later changes there do not change what those migrations store
+BOOKS = {
     "Genesis": ("the Book of Genesis", False, "OT"),
     "Exodus": ("the Book of Exodus", False, "OT"),
     "Leviticus": ("the Book of Leviticus", False, "OT"),
@@ -85,33 +86,99 @@ books = {
     "Prayer of Manasseh": ("Prayer of Manasseh", True, "AP"),
 }
 
+ONES = (
+    "zero",
+    "one",
+    "two",
+    "three",
+    "four",
+    "five",
+    "six",
+    "seven",
+    "eight",
+    "nine",
+    "ten",
+    "eleven",
+    "twelve",
+    "thirteen",
+    "fourteen",
+    "fifteen",
+    "sixteen",
+    "seventeen",
+    "eighteen",
+    "nineteen",
+)
+TENS = ("", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety")
+IRREGULAR_ORDINALS = {
+    "one": "first",
+    "two": "second",
+    "three": "third",
+    "five": "fifth",
+    "eight": "eighth",
+    "nine": "ninth",
+    "twelve": "twelfth",
+}
 
-def passage_to_citation(passage):
 
-    if not passage:
-        return None
+def cardinal_words(number):
+    if number < 20:
+        return ONES[number]
+    if number < 100:
+        tens, ones = divmod(number, 10)
+        return "{}-{}".format(TENS[tens], ONES[ones]) if ones else TENS[tens]
+    hundreds, rest = divmod(number, 100)
+    if not rest:
+        return "{} hundred".format(cardinal_words(hundreds))
+    return "{} hundred and {}".format(cardinal_words(hundreds), cardinal_words(rest))
+
+
+def ordinal_words(number):
+    """Spells out an ordinal the way num2words(number, ordinal=True) does, e.g. one hundred and nineteenth"""
+
+    words = cardinal_words(number)
+    split = max(words.rfind(" "), words.rfind("-")) + 1
+    last = words[split:]
+    if last in IRREGULAR_ORDINALS:
+        last = IRREGULAR_ORDINALS[last]
+    elif last.endswith("y"):
+        last = last[:-1] + "ieth"
+    else:
+        last = last + "th"
+    return words[:split] + last
+
+
+# every chapter and verse number in the Bible (Psalm 119 has 176 verses)
+ORDINALS = tuple(ordinal_words(number) for number in range(200))
 
-    passage = scriptures.extract(passage)[0]
+
+def ordinal(number):
+    number = int(number)
+    return ORDINALS[number] if number < len(ORDINALS) else ordinal_words(number)
+
+
+def passage_intro(passage):
+    """The introduction read before a passage, or None for passages that can't be read"""
 
     if not passage:
         return None
 
+    try:
+        passage = scriptures.extract(passage)[0]
+    except IndexError:
+        return None
+
     if passage[0] == "Susanna":
         return "The Book of Daniel, beginning with thirteenth chapter, the first verse, the Story of Susanna"
 
-    book_name = passage[0]
-    if book_name == "Song of Solomon":
-        book_name = "Song of Songs"
-
-    book_name = passage[0]
-    if book_name == "Revelation of Jesus Christ":
-        book_name = "Revelation"
-
-    book = books[book_name]
+    # "Song of Solomon" has no introduction, since books only has it as "Song of Songs"
+    book_name = "Revelation" if passage[0] == "Revelation of Jesus Christ" else passage[0]
+    book = BOOKS.get(book_name)
+    if not book:
+        return None
 
     if book[1]:  # 1 chapter book
-        return "A reading from {}, beginning with the {} verse".format(book[0], num2words(passage[2], ordinal=True))
+        return "A reading from {}, beginning with the {} verse".format(book[0], ordinal(passage[2]))
 
     return "A reading from {}, beginning with the {} chapter, the {} verse".format(
-        book[0], num2words(passage[1], ordinal=True), num2words(passage[2], ordinal=True)
+        book[0], ordinal(passage[1]), ordinal(passage[2])
     )
@@ -7,11 +7,39 @@ from django.utils.functional import cached_property
 from model_utils.managers import InheritanceManager, InheritanceQuerySetMixin, InheritanceManagerMixin
 
 from churchcal.base_models import BaseModel
-from churchcal.utils import advent, easter, weekday_after
+from churchcal.utils import advent, easter, passage_intro, weekday_after
 
 from churchcal.inheritence_query_set import _get_subclasses_recurse_without_managed, get_queryset_as_subclasses
 
 
+def filter_mass_readings(name, readings, year, time="morning"):
+    """Orders and filters a commemoration's readings for a cycle year (A, B, or C) in memory"""
+
+    if year in ["A", "C"] and time == "morning":
+        readings = sorted(readings, key=lambda reading: (reading.reading_number, -reading.order))
+    else:
+        readings = sorted(readings, key=lambda reading: (reading.reading_number, reading.order))
+
+    if name == "Eve of Easter Day":
+        readings = [reading for reading in readings if reading.abbreviation == "EasterEve"]
+
+    if name == "Easter Day":
+        service = "PrincipalService" if time == "morning" else "EveningService"
+        readings = [reading for reading in readings if reading.service == service]
+
+    if name == "Eve of The Nativity of our Lord Jesus Christ: Christmas Day":
+        readings = [reading for reading in readings if reading.service == "I"]
+
+    if name == "The Nativity of Our Lord Jesus Christ: Christmas Day":
+        service = "II" if time == "morning" else "III"
+        readings = [reading for reading in readings if reading.service == service]
+
+    if name in ["Eve of Palm Sunday", "Palm Sunday"]:
+        readings = [reading for reading in readings if reading.service == "Word"]
+
+    return readings
+
+
 class Denomination(BaseModel):
 
     name = models.CharField(max_length=256)
@@ -49,6 +77,100 @@ class CommemorationRank(BaseModel):
         return "{} ({}) ({})".format(self.name, self.rank.formatted_name, self.color)
 
 
+def format_saint_collect(saint_type, saint_name, saint_gender, saint_fill_in_the_blank):
+    """The collect of a saint's commemoration, from the form of collect for their type, their name and gender"""
+
+    text = None
+
+    if saint_type == "PASTOR":
+        if saint_gender in ["M", "F"]:
+            text = "O God, our heavenly Father, you raised up your faithful servant {} to be a {} pastor in your Church and to feed your flock: Give abundantly to all pastors the gifts of your Holy Spirit, that they may minister in your household as true servants of Christ and stewards of your divine mysteries; through Jesus Christ our Lord, who lives and reigns with you and the Holy Spirit, one God, for ever and ever.".format(
+                saint_name, saint_fill_in_the_blank
+            ).replace(
+                " ", " "
+            )
+        else:
+            text = "O God, our heavenly Father, you raised up your faithful servants {} to be {} pastors in your Church and to feed your flock: Give abundantly to all pastors the gifts of your Holy Spirit, that they may minister in your household as true servants of Christ and stewards of your divine mysteries; through Jesus Christ our Lord, who lives and reigns with you and the Holy Spirit, one God, for ever and ever.".format(
+                saint_name, saint_fill_in_the_blank
+            ).replace(
+                " ", " "
+            )
+
+    if saint_type == "MONASTIC":
+        text = "O God, your blessed Son became poor for our sake, and chose the Cross over the kingdoms of this world: Deliver us from an inordinate love of worldly things, that we, inspired by the devotion of your servant{} {}, may seek you with singleness of heart, behold your glory by faith, and attain to the riches of your everlasting kingdom, where we shall be united with our Savior Jesus Christ; who lives and reigns with you and the Holy Spirit, one God, now and for ever. ".format(
+            "s" if saint_gender == "P" else "", saint_name
+        )
+
+    if saint_type == "MARTYR":
+        text = "Almighty God, you gave your servant{} {} boldness to confess the Name of our Savior Jesus Christ before the rulers of this world, and courage to die for this faith: Grant that we may always be ready to give a reason for the hope that is in us, and to suffer gladly for the sake of our Lord Jesus Christ; who lives and reigns with you and the Holy Spirit, one God, for ever and ever. ".format(
+            "s" if saint_gender == "P" else "", saint_name
+        )
+
+    if saint_type == "MISSIONARY":
+        text = (
+            "Almighty and everlasting God, you called your servant{} {} to preach the Gospel {}: Raise up in this and every land evangelists and heralds of your kingdom, that your Church may proclaim the unsearchable riches of our Savior Jesus Christ; who lives and reigns with you and the Holy Spirit, one God, now and for ever.".format(
+                "s" if saint_gender == "P" else "",
+                saint_name,
+                saint_fill_in_the_blank,
+            )
+            .replace(" ", " ")
+            .replace(" :", ":")
+        )
+
+    if saint_type == "TEACHER":
+        text = "Almighty God, you gave your servant{} {} special gifts of grace to understand and teach the truth revealed in Christ Jesus: Grant that by this teaching we may know you, the one true God, and Jesus Christ whom you have sent; who lives and reigns with you and the Holy Spirit, one God, for ever and ever.".format(
+            "s" if saint_gender == "P" else "", saint_name
+        )
+
+    if saint_type == "RENEWER":
+        text = "Almighty and everlasting God, you kindled the flame of your love in the heart of your servant{} {} to manifest your compassion and mercy to the poor and the persecuted: Grant to us, your humble servants, a like faith and power of love, that we who give thanks for {} righteous zeal may profit by {} example; through Jesus Christ our Lord, who lives and reigns with you and the Holy Spirit, one God, for ever and ever.".format(
+            "s" if saint_gender == "P" else "",
+            saint_name,
+            "his"
+            if saint_gender == "M"
+            else "her"
+            if saint_gender == "F"
+            else "their",
+            "his"
+            if saint_gender == "M"
+            else "her"
+            if saint_gender == "F"
+            else "their",
+        )
+
+    if saint_type == "REFORMER":
+        text = "O God, by your grace your servant{} {}, kindled by the flame of your love, became {} burning and shining light{} in your Church, turning pride into humility and error into truth: Grant that we may be set aflame with the same spirit of love and discipline, and walk before you as children of light; through Jesus Christ our Lord, who lives and reigns with you, in the unity of the Holy Spirit, one God, now and for ever.".format(
+            "s" if saint_gender == "P" else "",
+            saint_name,
+            "a" if saint_gender != "P" else "",
+            "s" if saint_gender == "P" else "",
+        ).replace(
+            " ", " "
+        )
+
+    if saint_type == "ECUMENIST":
+        text = "Almighty God, we give you thanks for the ministry of {}, who labored that the Church of Jesus Christ might be one: Grant that we, instructed by {} teaching and example, and knit together in unity by your Spirit, may ever stand firm upon the one foundation, which is Jesus Christ our Lord; who lives and reigns with you, in the unity of the Holy Spirit, one God, now and for ever.".format(
+            saint_name,
+            "his"
+            if saint_gender == "M"
+            else "her"
+            if saint_gender == "F"
+            else "their",
+        )
+
+    if saint_type == "SAINT_1":
+        text = "Almighty God, you have surrounded us with a great cloud of witnesses: Grant that we, encouraged by the good example of your servant{} {}, may persevere in running the race that is set before us, until at last, with {}, we attain to your eternal joy; through Jesus Christ, the pioneer and perfecter of our faith, who lives and reigns with you and the Holy Spirit, one God, for ever and ever.".format(
+            "s" if saint_gender == "P" else "",
+            saint_name,
+            "him" if saint_gender == "M" else "her" if saint_gender == "F" else "them",
+        )
+
+    if saint_type == "SAINT_2":
+        text = "Almighty God, by your Holy Spirit you have made us one with your saints in heaven and on earth: Grant that in our earthly pilgrimage we may always be supported by this fellowship of love and prayer, and know ourselves to be surrounded by their witness to your power and mercy; for the sake of Jesus Christ, in whom all our intercessions are acceptable through the Spirit, and who lives and reigns with you and the same Spirit, one God, for ever and ever."
+
+    return text
+
+
 class Commemoration(BaseModel):
     InheritanceQuerySetMixin._get_subclasses_recurse = _get_subclasses_recurse_without_managed
     InheritanceManagerMixin.get_queryset = get_queryset_as_subclasses
@@ -93,49 +215,30 @@ class Commemoration(BaseModel):
 
         return self.initial_date(advent_year).strftime("%Y-%m-%d")
 
-    def can_occur_in_year(self, advent_year):
-        if not self.cannot_occur_after:
+    def can_occur_in_year(self, advent_year, commemorations_by_pk=None):
+        if not self.cannot_occur_after_id:
             return True
 
-        if self.initial_date(advent_year=advent_year) >= self.cannot_occur_after_subtype.initial_date(
-            advent_year=advent_year
-        ):
+        cannot_occur_after = None
+        if commemorations_by_pk is not None:
+            cannot_occur_after = commemorations_by_pk.get(self.cannot_occur_after_id)
+        if cannot_occur_after is None:
+            cannot_occur_after = self.cannot_occur_after_subtype
+
+        if self.initial_date(advent_year=advent_year) >= cannot_occur_after.initial_date(advent_year=advent_year):
             return False
 
         return True
 
     def get_mass_readings_for_year(self, year, time="morning"):
 
-        query = MassReading.objects.filter(years__contains=year, commemoration=self).order_by("reading_number")
-
-        if year in ["A", "C"] and time == "morning":
-            query = query.order_by("reading_number", "-order")
-        else:
-            query = query.order_by("reading_number", "order")
-
-        if self.name == "Eve of Easter Day":
-            query = query.filter(abbreviation="EasterEve")
-
-        if self.name == "Easter Day":
-            if time == "morning":
-                print(time)
-                query = query.filter(service="PrincipalService")
-            else:
-                query = query.filter(service="EveningService")
-
-        if self.name == "Eve of The Nativity of our Lord Jesus Christ: Christmas Day":
-            query = query.filter(service="I")
-
-        if self.name == "The Nativity of Our Lord Jesus Christ: Christmas Day":
-            if time == "morning":
-                query = query.filter(service="II")
-            else:
-                query = query.fitler(service="III")
-
-        if self.name in ["Eve of Palm Sunday", "Palm Sunday"]:
-            query = query.filter(service="Word")
+        readings = MassReading.objects.filter(years__contains=year, commemoration=self).order_by(
+            "reading_number", "order"
+        )
+        return self.filter_mass_readings(list(readings.all()), year, time)
 
-        return query.all()
+    def filter_mass_readings(self, readings, year, time="morning"):
+        return filter_mass_readings(self.name, readings, year, time)
 
     def __repr__(self):
         return "{} ({}) ({})".format(self.name, self.rank.formatted_name, self.color)
@@ -167,6 +270,16 @@ class SanctoraleCommemoration(Commemoration):
         max_length=1, null=True, blank=True, choices=(("M", "Male"), ("F", "Female"), ("P", "Plural"))
     )
     saint_fill_in_the_blank = models.CharField(max_length=256, null=True, blank=True)
+    saint_collect = models.TextField(blank=True, null=True, editable=False)
+
+    def save(self, *args, **kwargs):
+        self.saint_collect = self.get_saint_collect()
+        return super().save(*args, **kwargs)
+
+    def get_saint_collect(self):
+        if not self.saint_type:
+            return None
+        return format_saint_collect(self.saint_type, self.saint_name, self.saint_gender, self.saint_fill_in_the_blank)
 
     def initial_date(self, advent_year):
         year = self._year_from_advent_year(advent_year, self.month, self.day)
@@ -238,7 +351,9 @@ class Proper(BaseModel):
     collect = models.TextField(blank=True, null=True)
 
     def get_mass_readings_for_year(self, year):
-        return MassReading.objects.filter(years__contains=year, proper=self).order_by("reading_number", "order").all()
+        return list(
+            MassReading.objects.filter(years__contains=year, proper=self).order_by("reading_number", "order").all()
+        )
 
     def __repr__(self):
         return str(self.number)
@@ -279,6 +394,17 @@ class MassReading(BaseModel):
     abbreviation = models.CharField(max_length=256, blank=True, null=True)
     reading_number = models.PositiveSmallIntegerField()
     order = models.PositiveSmallIntegerField()
+    # the introductions read before the long and short forms of the reading, set from the citations on save
+    long_intro = models.CharField(max_length=256, blank=True, null=True, editable=False)
+    short_intro = models.CharField(max_length=256, blank=True, null=True, editable=False)
+
+    def set_intros(self):
+        self.long_intro = passage_intro(self.long_citation)
+        self.short_intro = passage_intro(self.short_citation or self.long_citation)
+
+    def save(self, *args, **kwargs):
+        self.set_intros()
+        return super().save(*args, **kwargs)
 
     def __repr__(self):
         return self.long_citation
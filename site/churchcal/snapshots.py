@@ -0,0 +1,94 @@
+import os
+import pickle
+
+from django.conf import settings
+
+from churchcal.caching import church_year_cache
+
+
+def snapshot_path(year, calendar="ACNA_BCP2019", fingerprint=None):
+    """The snapshot of a year built from the calendar's current data and code version
+
+    The fingerprint is in the name, so a snapshot taken before an import, a bulk update, a restore or a version bump
+    is never found again, whether or not a signal removed it.
+    """
+
+    if fingerprint is None:
+        fingerprint = church_year_cache.fingerprint(calendar)
+    return os.path.join(settings.CHURCH_YEAR_SNAPSHOT_DIR, "{}-{}-{}.pickle".format(calendar, year, fingerprint))
+
+
+def save_church_year(church_year):
+    calendar = church_year.calendar.abbreviation
+    fingerprint = church_year_cache.fingerprint(calendar)
+    snapshot = {
+        "version": settings.CHURCH_YEAR_CACHE_VERSION,
+        "fingerprint": fingerprint,
+        "church_year": church_year,
+    }
+
+    os.makedirs(settings.CHURCH_YEAR_SNAPSHOT_DIR, exist_ok=True)
+    path = snapshot_path(church_year.start_year, calendar, fingerprint)
+    temp_path = "{}.tmp".format(path)
+    with open(temp_path, "wb") as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+
+    # snapshots of the same year from older data can never be loaded again
+    prefix = "{}-{}-".format(calendar, church_year.start_year)
+    for filename in os.listdir(settings.CHURCH_YEAR_SNAPSHOT_DIR):
+        if filename.startswith(prefix) and filename.endswith(".pickle") and filename != os.path.basename(path):
+            try:
+                os.remove(os.path.join(settings.CHURCH_YEAR_SNAPSHOT_DIR, filename))
+            except FileNotFoundError:
+                pass
+    return path
+
+
+def load_church_year(year, calendar="ACNA_BCP2019"):
+    fingerprint = church_year_cache.fingerprint(calendar)
+    try:
+        with open(snapshot_path(year, calendar, fingerprint), "rb") as f:
+            snapshot = pickle.load(f)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+
+    # the header guards against a file renamed or copied in from another build
+    if (
+        not isinstance(snapshot, dict)
+        or snapshot.get("version") != settings.CHURCH_YEAR_CACHE_VERSION
+        or snapshot.get("fingerprint") != fingerprint
+    ):
+        return None
+    return snapshot["church_year"]
+
+
+def clear_church_years(calendar="ACNA_BCP2019"):
+    try:
+        filenames = os.listdir(settings.CHURCH_YEAR_SNAPSHOT_DIR)
+    except FileNotFoundError:
+        return 0
+
+    prefix = "{}-".format(calendar)
+    removed = 0
+    for filename in filenames:
+        if filename.startswith(prefix) and filename.endswith(".pickle"):
+            try:
+                os.remove(os.path.join(settings.CHURCH_YEAR_SNAPSHOT_DIR, filename))
+                removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+
+def invalidate_church_year_snapshots(sender, instance, **kwargs):
+    from churchcal.models import Commemoration, CommemorationRank, Proper, Season
+
+    # Subclasses of Commemoration send signals under their own sender, so match on instance type
+    if not isinstance(instance, (Commemoration, CommemorationRank, Proper, Season)):
+        return
+
+    calendar = getattr(instance, "calendar", None)
+    if calendar is None:
+        return
+    clear_church_years(calendar.abbreviation)
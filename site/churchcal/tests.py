@@ -0,0 +1,837 @@
+import io
+import json
+import os
+import pickle
+import random
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import date, timedelta
+
+from dateutil.easter import easter as dateutil_easter
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.safestring import mark_safe
+
+from churchcal.calculations import ChurchYear, ChurchYearIterator, CommemorationView, ProperIndex, RankView
+from churchcal.models import (
+    Calendar,
+    CommemorationRank,
+    MassReading,
+    Proper,
+    SanctoraleBasedCommemoration,
+    SanctoraleCommemoration,
+    Season,
+    TemporaleCommemoration,
+    format_saint_collect,
+)
+from churchcal.utils import advent, easter, week_days, weekday_after
+
+
+class CalendarTestCase(TestCase):
+    """A small calendar with every Sunday, the feasts that ferias are named after, some holy days and saints, the
+    seasons and a proper for every week after Pentecost"""
+
+    def setUp(self):
+        self.calendar = Calendar.objects.create(
+            name="Test Calendar", year="2019", abbreviation="ACNA_BCP2019", google_sheet_id=""
+        )
+
+        self.ranks = {}
+        for name, precedence_rank, required in (
+            ("PRINCIPAL_FEAST", 1, True),
+            ("SUNDAY", 2, True),
+            ("HOLY_DAY", 3, True),
+            ("ALTERNATE_SUNDAY", 4, True),
+            ("LESSER_FEAST", 5, False),
+            ("FERIA", 6, False),
+        ):
+            self.ranks[name] = CommemorationRank.objects.create(
+                name=name,
+                formatted_name=name.replace("_", " ").title(),
+                precedence_rank=precedence_rank,
+                required=required,
+                calendar=self.calendar,
+            )
+
+        # Sundays before the season after Pentecost have their own collects, the rest take their proper's
+        for number in range(1, 54):
+            name = "The First Sunday of Advent" if number == 1 else "Sunday {}".format(number)
+            SanctoraleBasedCommemoration.objects.create(
+                name=name,
+                rank=self.ranks["SUNDAY"],
+                weekday="Sunday",
+                number_after=number,
+                month_after=11,
+                day_after=26,
+                color="green",
+                collect="The collect of {}".format(name) if number < 30 else None,
+                calendar=self.calendar,
+            )
+
+        christmas = self.add_sanctorale(
+            "The Nativity of Our Lord Jesus Christ: Christmas Day",
+            12,
+            25,
+            "PRINCIPAL_FEAST",
+            collect="Almighty God, you have given your only-begotten Son to take our nature upon him, and to be born "
+            "[this day] of a pure virgin.",
+        )
+        epiphany = self.add_sanctorale("The Epiphany", 1, 6, "PRINCIPAL_FEAST", collect="The collect of the Epiphany")
+        self.add_sanctorale(
+            "The Annunciation",
+            3,
+            25,
+            "HOLY_DAY",
+            collect="The collect of the Annunciation",
+            eve_collect="The collect of the Eve of the Annunciation",
+        )
+        self.add_sanctorale("Saint Andrew", 11, 30, "HOLY_DAY", collect="The collect of Saint Andrew")
+        self.add_sanctorale("Saint Thomas", 12, 21, "HOLY_DAY", collect="The collect of Saint Thomas")
+        self.add_sanctorale("Saint James", 7, 25, "HOLY_DAY", collect="The collect of Saint James")
+        self.add_sanctorale(
+            "Ambrose", 12, 7, "LESSER_FEAST", saint_name="Ambrose", saint_type="TEACHER", saint_gender="M"
+        )
+        self.add_sanctorale(
+            "Perpetua and her Companions",
+            3,
+            7,
+            "LESSER_FEAST",
+            saint_name="Perpetua and her Companions",
+            saint_type="MARTYR",
+            saint_gender="P",
+        )
+        self.add_sanctorale("Martin of Tours", 11, 11, "LESSER_FEAST", saint_name="Martin", saint_type="MONASTIC")
+
+        temporale = {}
+        for name, days_after_easter in (
+            ("Ash Wednesday", -46),
+            ("Easter Day", 0),
+            ("Ascension Day", 39),
+            ("The Day of Pentecost", 49),
+            ("Trinity Sunday", 56),
+        ):
+            temporale[name] = TemporaleCommemoration.objects.create(
+                name=name,
+                rank=self.ranks["PRINCIPAL_FEAST"],
+                days_after_easter=days_after_easter,
+                color="white",
+                collect="The collect of {}".format(name),
+                calendar=self.calendar,
+            )
+
+        for order, (name, start_commemoration, color) in enumerate(
+            (
+                ("Advent", SanctoraleBasedCommemoration.objects.get(number_after=1), "blue"),
+                ("Christmastide", christmas, "white"),
+                ("Season After Epiphany", epiphany, "green"),
+                ("Lent", temporale["Ash Wednesday"], "purple"),
+                ("Eastertide", temporale["Easter Day"], "white"),
+                ("Season After Pentecost", temporale["The Day of Pentecost"], "green"),
+            ),
+            start=1,
+        ):
+            Season.objects.create(
+                order=order,
+                name=name,
+                start_commemoration=start_commemoration,
+                color=color,
+                rank=self.ranks["FERIA"],
+                calendar=self.calendar,
+            )
+
+        # propers are stored with dates in 2019, a week each from May 8 to November 26
+        for number in range(1, 30):
+            start_date = date(2019, 5, 8) + timedelta(days=7 * (number - 1))
+            Proper.objects.create(
+                number=number,
+                start_date=start_date,
+                end_date=start_date + timedelta(days=6),
+                collect="The collect of Proper {}".format(number),
+                calendar=self.calendar,
+            )
+
+    def add_sanctorale(self, name, month, day, rank, **fields):
+        return SanctoraleCommemoration.objects.create(
+            name=name, month=month, day=day, rank=self.ranks[rank], color="red", calendar=self.calendar, **fields
+        )
+
+
+class ChurchYearQueriesTestCase(CalendarTestCase):
+    def test_query_count_does_not_grow_with_the_sanctorale(self):
+        with CaptureQueriesContext(connection) as queries:
+            ChurchYear(2019)
+        query_count = len(queries)
+
+        # "cannot occur after" is resolved from the commemorations already loaded, so neither more saints nor more
+        # of those links cost queries
+        easter_day = TemporaleCommemoration.objects.get(name="Easter Day")
+        for day in range(1, 29):
+            self.add_sanctorale(
+                "Saint of February {}".format(day),
+                2,
+                day,
+                "LESSER_FEAST",
+                saint_name="Saint {}".format(day),
+                saint_type="SAINT_1",
+                saint_gender="F",
+                cannot_occur_after=easter_day if day % 2 else None,
+            )
+
+        with self.assertNumQueries(query_count):
+            church_year = ChurchYear(2019)
+
+        self.assertEqual(church_year.get_date("2020-02-03").optional[0].name, "Saint of February 3")
+
+
+def describe(calendar_date):
+    """The names (with any O antiphon), ranks and collects of a date's morning and evening commemorations, its
+    seasons and its proper"""
+
+    def commemorations(views):
+        return [
+            (
+                str(view.name),
+                view.rank.name,
+                getattr(view, "morning_prayer_collect", None),
+                getattr(view, "evening_prayer_collect", None),
+            )
+            for view in views
+        ]
+
+    return (
+        commemorations(calendar_date.all),
+        commemorations(calendar_date.all_evening),
+        calendar_date.season.name,
+        calendar_date.evening_season.name,
+        calendar_date.proper.number if calendar_date.proper else None,
+    )
+
+
+class LazyChurchYearTestCase(CalendarTestCase):
+    def test_lazy_years_match_eager_years(self):
+        for year in (2018, 2019, 2020):
+            eager = ChurchYear(year)
+            lazy = ChurchYear(year, lazy=True)
+
+            # ask for the dates out of order, as requests would
+            calendar_dates = list(eager.calendar_dates)
+            random.Random(year).shuffle(calendar_dates)
+            for calendar_date in calendar_dates:
+                self.assertEqual(describe(lazy.get_date(calendar_date.date)), describe(calendar_date), calendar_date)
+
+            # resolving later dates must not have changed the ones already handed out
+            for eager_date, lazy_date in zip(eager.calendar_dates, lazy.calendar_dates):
+                self.assertEqual(describe(lazy_date), describe(eager_date), eager_date)
+
+            names = [str(view.name) for calendar_date in eager.calendar_dates for view in calendar_date.all]
+            self.assertTrue(any("O Sapientia" in name for name in names))
+            self.assertTrue(any("Septuagesima" in name for name in names))
+            self.assertTrue(any("(Proper" in name for name in names))
+
+
+class ChurchYearDatesTestCase(CalendarTestCase):
+    def test_lookups_by_position_string_and_date(self):
+        church_year = ChurchYear(2019)
+        dates = church_year.dates
+        easter_day = date(2020, 4, 12)
+        position = (easter_day - date(2019, 12, 1)).days
+
+        self.assertEqual(dates[0].date, date(2019, 12, 1))
+        self.assertEqual(dates[-1].date, advent(2020) - timedelta(days=1))
+        self.assertIs(dates["2020-04-12"], dates[position])
+        self.assertIs(dates[easter_day], dates[position])
+        self.assertEqual(dates.index("2020-04-12"), position)
+
+        self.assertIn("2020-04-12", dates)
+        self.assertNotIn("2019-11-30", dates)
+        self.assertNotIn(advent(2020).isoformat(), dates)
+        self.assertNotIn("not a date", dates)
+        with self.assertRaises(KeyError):
+            dates["2019-11-30"]
+
+        self.assertEqual(dates.keys()[0], "2019-12-01")
+        self.assertEqual(list(dates), dates.keys())
+        self.assertEqual(len(dates.keys()), len(dates))
+
+    def test_iterator_moves_from_a_key(self):
+        iterator = ChurchYearIterator(ChurchYear(2019), key="2020-04-12")
+
+        self.assertEqual(iterator.get_current().date, date(2020, 4, 12))
+        self.assertEqual(iterator.get_previous().date, date(2020, 4, 11))
+        self.assertEqual(iterator.get_next().date, date(2020, 4, 13))
+        self.assertEqual(iterator.next().date, date(2020, 4, 13))
+        self.assertEqual(iterator.previous().date, date(2020, 4, 12))
+        self.assertEqual(iterator.get_by_key("2019-12-25").date, date(2019, 12, 25))
+        self.assertEqual(iterator.get_current().date, date(2020, 4, 12))
+
+
+class SlottedViewsTestCase(CalendarTestCase):
+    def test_views_have_no_instance_dictionary(self):
+        calendar_date = ChurchYear(2019).get_date("2019-12-25")
+        view = calendar_date.primary
+
+        self.assertIsInstance(view, CommemorationView)
+        self.assertIsInstance(view.rank, RankView)
+        self.assertFalse(hasattr(view, "__dict__"))
+        self.assertFalse(hasattr(calendar_date, "__dict__"))
+        with self.assertRaises(AttributeError):
+            view.not_a_field = True
+
+    def test_copy(self):
+        view = ChurchYear(2019).get_date("2019-12-25").primary
+        name = view.name
+        eve = view.copy(name="Eve of {}".format(name))
+
+        self.assertIsNone(eve.pk)
+        self.assertEqual(eve.original_pk, view.pk)
+        self.assertEqual(eve.uuid, view.uuid)
+        self.assertEqual(eve.rank, view.rank)
+        self.assertEqual(eve.collect, view.collect)
+        self.assertEqual(eve.name, "Eve of {}".format(name))
+        self.assertEqual(view.name, name)
+
+        # a copy of a copy still points at the commemoration it came from
+        self.assertEqual(eve.copy().original_pk, view.pk)
+
+    def test_pickle_round_trip(self):
+        church_year = ChurchYear(2019)
+        restored = pickle.loads(pickle.dumps(church_year, protocol=pickle.HIGHEST_PROTOCOL))
+
+        for calendar_date, restored_date in zip(church_year.calendar_dates, restored.calendar_dates):
+            self.assertEqual(describe(restored_date), describe(calendar_date), calendar_date)
+
+        view = church_year.get_date("2019-12-25").primary
+        restored_view = restored.get_date("2019-12-25").primary
+        self.assertEqual(restored_view.__getstate__(), view.__getstate__())
+
+
+class BenchmarkChurchYearsTestCase(CalendarTestCase):
+    def benchmark(self, **options):
+        with redirect_stdout(io.StringIO()) as output:
+            call_command("benchmark_church_years", start_year=2019, end_year=2019, repeat=1, **options)
+        return output.getvalue().strip()
+
+    def test_compare_shows_the_change_from_saved_results(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "before.json")
+
+            output = self.benchmark(save=path)
+            self.assertTrue(output.startswith("2019-2020: best "))
+            self.assertNotIn("%", output)
+
+            with open(path) as f:
+                saved = json.load(f)
+            self.assertEqual(list(saved), ["2019"])
+            self.assertEqual(set(saved["2019"]), {"best", "mean", "held", "peak", "pickled"})
+
+            # the pickled size does not vary between runs, so a saved size of double it is a 50% reduction
+            saved["2019"]["pickled"] *= 2
+            with open(path, "w") as f:
+                json.dump(saved, f)
+
+            output = self.benchmark(compare=path)
+            self.assertEqual(output.count("%"), 5)
+            self.assertTrue(output.endswith("KB (-50%)"))
+
+
+class WalkBackNamesAndCollects(object):
+    """A frozen copy of how names and collects were set before they took one pass: collects in one pass over the
+    year, with each feria walking back day by day to the date it is named after, then O antiphons in another
+
+    It runs on a lazily built year, which has already named Septuagesima (the first of the original three passes).
+    The iterator is made directly because iterating a lazy ChurchYear resolves it. Saints' collects come from
+    format_saint_collect, which holds the text the original method built.
+    """
+
+    def __init__(self, church_calendar):
+
+        self.church_calendar = church_calendar
+
+        checks = [self.own_collect, self.proper_collect, self.feria_collect, self.saint_collect, self.fallback_collect]
+
+        self.i = ChurchYearIterator(self.church_calendar)
+        while True:
+            try:
+                calendar_date = next(self.i)
+
+                for commemoration in calendar_date.all:
+
+                    for check in checks:
+                        check(commemoration, calendar_date)
+                        if hasattr(commemoration, "morning_prayer_collect"):
+                            break
+                    self.check_previous_evening(calendar_date)
+
+            except StopIteration:
+                break
+
+        self.i = ChurchYearIterator(self.church_calendar)
+        while True:
+            try:
+                calendar_date = next(self.i)
+
+                for commemoration in calendar_date.all:
+
+                    if "SUNDAY" in commemoration.rank.name:
+                        self.append_o_antiphon_if_needed(commemoration, calendar_date)
+
+            except StopIteration:
+                break
+
+    def check_previous_evening(self, calendar_date):
+
+        if calendar_date.primary.rank.precedence_rank > 4:
+            return
+
+        if calendar_date.primary.rank.name == "PRIVILEGED_OBSERVANCE":
+            return
+
+        previous = self.i.get_previous()
+        if not previous:
+            return
+
+        if previous.primary.rank.required and previous.primary.rank.name != "PRIVILEGED_OBSERVANCE":
+            return
+
+        previous.evening_required = previous.required.copy()
+        previous.evening_optional = previous.optional.copy()
+        feast_copy = calendar_date.primary.copy()
+        feast_copy.name = "Eve of {}".format(feast_copy.name)
+
+        if feast_copy.eve_collect:
+            feast_copy.evening_prayer_collect = feast_copy.eve_collect
+
+        previous.evening_required.append(feast_copy)
+        previous.proper = calendar_date.proper
+
+        for idx, commemoration in enumerate(previous.evening_required):
+            if "PRIVILEGED_OBSERVANCE" in commemoration.rank.name:
+                previous.evening_required.pop(idx)
+
+        if feast_copy.rank.name == "SUNDAY":
+            for idx, commemoration in enumerate(previous.evening_optional):
+                if "FERIA" in commemoration.rank.name:
+                    previous.evening_optional.pop(idx)
+
+        previous.evening_season = calendar_date.season
+
+    def own_collect(self, commemoration, calendar_date):
+
+        if "FERIA" in commemoration.rank.name:
+            return False
+
+        if commemoration.collect:
+
+            commemoration.morning_prayer_collect = commemoration.evening_prayer_collect = (
+                commemoration.collect.replace(" [this day]", " this day")
+            )
+            if commemoration.alternate_collect:
+                commemoration.evening_prayer_collect = commemoration.alternate_collect
+
+    def proper_collect(self, commemoration, calendar_date):
+        if not commemoration.rank.required:
+            return
+        if calendar_date.proper and calendar_date.proper.collect:
+            commemoration.morning_prayer_collect = commemoration.evening_prayer_collect = calendar_date.proper.collect
+            if commemoration.rank.name == "SUNDAY":
+                proper_string = " (Proper {})".format(calendar_date.proper.number)
+                commemoration.name = "{}{}".format(commemoration.name, proper_string)
+
+    def feria_collect(self, commemoration, calendar_date):
+
+        if "FERIA" in commemoration.rank.name:
+            i = self.i.get_current_index()
+            while True:
+                i = i - 1
+                previous = self.i.get_by_index(i)
+                if not previous:
+                    break
+                if self.has_collect_for_feria(previous):
+
+                    if previous.proper and previous.proper.collect:
+                        commemoration.morning_prayer_collect = previous.proper.collect
+                        commemoration.evening_prayer_collect = previous.proper.collect
+                        name = previous.primary.name
+                        if name[:3] == "The":
+                            name = name.replace("The ", "the ")
+                        if previous.primary.rank.name == "PRINCIPAL_FEAST":
+                            proper_string = " (Proper {})".format(previous.proper.number)
+                            commemoration.name = "{} after {}{}".format(
+                                week_days[calendar_date.date.weekday()], name, proper_string
+                            )
+                        else:
+                            commemoration.name = "{} after {}".format(week_days[calendar_date.date.weekday()], name)
+                    else:
+                        commemoration.morning_prayer_collect = previous.primary.morning_prayer_collect.replace(
+                            "to be born this day of a pure virgin", "to be born of a pure virgin"
+                        )
+                        commemoration.evening_prayer_collect = previous.primary.evening_prayer_collect.replace(
+                            "to be born this day of a pure virgin", "to be born of a pure virgin"
+                        )
+                        commemoration.name = "{} after {}".format(
+                            week_days[calendar_date.date.weekday()], previous.primary.name.replace("The ", "the ")
+                        )
+                    self.append_seuptuagesima_if_needed(commemoration, calendar_date)
+                    self.append_o_antiphon_if_needed(commemoration, calendar_date)
+                    if "gesima" in commemoration.name:
+                        commemoration.alternate_color_2 = "purple" if commemoration.alternate_color else None
+                        commemoration.alternate_color = (
+                            commemoration.alternate_color if commemoration.alternate_color else "purple"
+                        )
+                    break
+
+        return False
+
+    def append_seuptuagesima_if_needed(self, commemoration, calendar_date):
+
+        easter_day = easter(calendar_date.date.year)
+        seventy_days_before_easter = easter_day - timedelta(days=9 * 7)
+        date = calendar_date.date
+        if seventy_days_before_easter == date:
+            commemoration.name = "{}, or Septuagesima".format(commemoration.name)
+            commemoration.alternate_color_2 = "purple" if commemoration.alternate_color else None
+            commemoration.alternate_color = (
+                commemoration.alternate_color if commemoration.alternate_color else "purple"
+            )
+
+    def append_o_antiphon_if_needed(self, commemoration, calendar_date):
+
+        if calendar_date.date.month == 12:
+            if calendar_date.date.day == 16:
+                commemoration.name = mark_safe(
+                    "{} <em>(O Sapientia / O Wisdom from on high)</em>".format(commemoration.name)
+                )
+
+            if calendar_date.date.day == 17:
+                commemoration.name = mark_safe("{} <em>(O Adonai / O Lord of Might)</em>".format(commemoration.name))
+
+            if calendar_date.date.day == 18:
+                commemoration.name = mark_safe(
+                    "{} <em>(O Radix Jesse / O Root of Jesse)</em>".format(commemoration.name)
+                )
+
+            if calendar_date.date.day == 19:
+                commemoration.name = mark_safe(
+                    "{} <em>(O Clavis David / O Key of David)</em>".format(commemoration.name)
+                )
+
+            if calendar_date.date.day == 20:
+                commemoration.name = mark_safe("{} <em>(O Oriens / O Daypsring)</em>".format(commemoration.name))
+
+            if calendar_date.date.day == 21:
+                commemoration.name = mark_safe(
+                    "{} <em>(O Rex Gentium / O Desire of Nations)</em>".format(commemoration.name)
+                )
+
+            if calendar_date.date.day == 22:
+                commemoration.name = mark_safe(
+                    "{} <em>(O Emmanuel / O Come, Emmanuel)</em>".format(commemoration.name)
+                )
+
+            if calendar_date.date.day == 23:
+                commemoration.name = mark_safe(
+                    "{} <em>(O Virgo Virginum / O Virgin of Virgins)</em>".format(commemoration.name)
+                )
+
+    def saint_collect(self, commemoration, calendar_date):
+        if not commemoration.saint_type:
+            return False
+
+        text = format_saint_collect(
+            commemoration.saint_type,
+            commemoration.saint_name,
+            commemoration.saint_gender,
+            commemoration.saint_fill_in_the_blank,
+        )
+        if text:
+            commemoration.morning_prayer_collect = commemoration.evening_prayer_collect = text
+
+    def fallback_collect(self, commemoration, calendar_date):
+        commemoration.morning_prayer_collect = commemoration.evening_prayer_collect = None
+
+    @staticmethod
+    def has_collect_for_feria(calendar_date):
+
+        epiphany = WalkBackNamesAndCollects.is_epiphany(calendar_date)
+        if epiphany:
+            return epiphany
+        christmas = WalkBackNamesAndCollects.is_christmas(calendar_date)
+        if christmas:
+            return christmas
+        ash_wednesday = WalkBackNamesAndCollects.is_ash_wednesday(calendar_date)
+        if ash_wednesday:
+            return ash_wednesday
+        ascension = WalkBackNamesAndCollects.is_ascension(calendar_date)
+        if ascension:
+            return ascension
+        sunday = WalkBackNamesAndCollects.is_sunday(calendar_date)
+        if sunday:
+            return sunday
+
+        return False
+
+    @staticmethod
+    def is_epiphany(calendar_date):
+        if (
+            calendar_date.required
+            and "The Epiphany" in calendar_date.required[0].name
+            and calendar_date.required[0].rank.required
+        ):
+            return calendar_date.required[0]
+        return None
+
+    @staticmethod
+    def is_christmas(calendar_date):
+        if (
+            calendar_date.required
+            and "Christmas Day" in calendar_date.required[0].name
+            and calendar_date.required[0].rank.required
+        ):
+            return calendar_date.required[0]
+        return None
+
+    @staticmethod
+    def is_ash_wednesday(calendar_date):
+        if (
+            calendar_date.required
+            and "Ash Wednesday" in calendar_date.required[0].name
+            and calendar_date.required[0].rank.required
+        ):
+            return calendar_date.required[0]
+        return None
+
+    @staticmethod
+    def is_ascension(calendar_date):
+        if (
+            calendar_date.required
+            and "Ascension Day" in calendar_date.required[0].name
+            and calendar_date.required[0].rank.required
+        ):
+            return calendar_date.required[0]
+        return None
+
+    @staticmethod
+    def is_sunday(calendar_date):
+        if calendar_date.date.weekday() == 6:
+            for commemoration in calendar_date.all:
+                if commemoration.rank.name == "PRINCIPAL_FEAST" and "Pentecost" in commemoration.name:
+                    return commemoration
+                if commemoration.rank.name == "PRINCIPAL_FEAST" and "Trinity" in commemoration.name:
+                    return commemoration
+                if commemoration.rank.name == "PRINCIPAL_FEAST" and "Easter" in commemoration.name:
+                    return commemoration
+            for commemoration in calendar_date.all:
+                if commemoration.rank.name == "SUNDAY":
+                    return commemoration
+            return None
+        return None
+
+
+class NamesAndCollectsTestCase(CalendarTestCase):
+    def test_one_pass_matches_walking_back(self):
+        walk_back_time = one_pass_time = 0.0
+        for year in (2018, 2019, 2020):
+            # both sides start from a lazily built year, so only the naming pass is timed
+            reference = ChurchYear(year, lazy=True)
+            church_year = ChurchYear(year, lazy=True)
+
+            start = time.perf_counter()
+            WalkBackNamesAndCollects(reference)
+            walk_back_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            church_year.names_and_collects.resolve_all()
+            one_pass_time += time.perf_counter() - start
+
+            for calendar_date, reference_date in zip(church_year.calendar_dates, reference.calendar_dates):
+                self.assertEqual(describe(calendar_date), describe(reference_date), calendar_date)
+
+        # the one pass finds each feria's date by bisection instead of walking back, so it should not be slower
+        self.assertLess(one_pass_time, walk_back_time * 1.5)
+
+
+class MassReadingsTestCase(CalendarTestCase):
+    def add_reading(self, name, long_citation, service, abbreviation=None):
+        return MassReading.objects.create(
+            long_citation=long_citation,
+            service=service,
+            short_citation="",
+            years="ABC",
+            commemoration=TemporaleCommemoration.objects.get(name=name),
+            reading_type="gospel",
+            book=long_citation.split(" ")[0],
+            testament="NT",
+            calendar=self.calendar,
+            abbreviation=abbreviation,
+            reading_number=1,
+            order=1,
+        )
+
+    def test_eves_take_the_feasts_readings(self):
+        vigil = self.add_reading("Easter Day", "Matthew 28:1-10", "Vigil", abbreviation="EasterEve")
+        principal = self.add_reading("Easter Day", "John 20:1-10", "PrincipalService")
+        evening = self.add_reading("Easter Day", "Luke 24:13-35", "EveningService")
+        ascension = self.add_reading("Ascension Day", "Luke 24:44-53", "")
+
+        church_year = ChurchYear(2019)
+
+        # an eve is a copy of the feast, so its readings are the feast's, filtered by the eve's name
+        holy_saturday = church_year.get_date("2020-04-11")
+        self.assertEqual(holy_saturday.primary_evening.name, "Eve of Easter Day")
+        self.assertEqual(holy_saturday.mass_readings, [])
+        self.assertEqual(holy_saturday.evening_mass_readings, [vigil])
+
+        easter_day = church_year.get_date("2020-04-12")
+        self.assertEqual(easter_day.mass_readings, [principal])
+        self.assertEqual(easter_day.evening_mass_readings, [evening])
+
+        eve_of_ascension = church_year.get_date("2020-05-20")
+        self.assertEqual(eve_of_ascension.primary_evening.name, "Eve of Ascension Day")
+        self.assertEqual(eve_of_ascension.evening_mass_readings, [ascension])
+
+
+def find_proper_by_query(calendar, day):
+    """The proper for a date looked up the way it was before ProperIndex, with a query per date"""
+
+    day = date(2019, day.month, day.day)
+    return Proper.objects.filter(calendar=calendar, start_date__lte=day, end_date__gte=day).first()
+
+
+class ProperIndexTestCase(TestCase):
+    def setUp(self):
+        self.calendar = Calendar.objects.create(name="Test Calendar", year="2019", abbreviation="ACNA_BCP2019")
+        other_calendar = Calendar.objects.create(name="Other Calendar", year="2019", abbreviation="OTHER")
+
+        # a week each from May 8 to November 26, leaving out propers 4 and 10 so that some dates fall between them
+        for number in range(1, 30):
+            if number in (4, 10):
+                continue
+            start_date = date(2019, 5, 8) + timedelta(days=7 * (number - 1))
+            Proper.objects.create(
+                number=number, start_date=start_date, end_date=start_date + timedelta(days=6), calendar=self.calendar
+            )
+
+        # another calendar's proper covering a gap must not be found
+        Proper.objects.create(
+            number=4, start_date=date(2019, 5, 29), end_date=date(2019, 6, 4), calendar=other_calendar
+        )
+
+    def test_edges(self):
+        index = ProperIndex(self.calendar)
+
+        self.assertIsNone(index.find(date(2021, 1, 1)))
+        self.assertIsNone(index.find(date(2021, 5, 7)))
+        self.assertEqual(index.find(date(2021, 5, 8)).number, 1)
+        self.assertEqual(index.find(date(2021, 5, 28)).number, 3)
+        self.assertIsNone(index.find(date(2021, 5, 29)))
+        self.assertIsNone(index.find(date(2021, 6, 4)))
+        self.assertEqual(index.find(date(2021, 6, 5)).number, 5)
+        self.assertEqual(index.find(date(2021, 11, 20)).number, 29)
+        self.assertEqual(index.find(date(2021, 11, 26)).number, 29)
+        self.assertIsNone(index.find(date(2021, 11, 27)))
+        self.assertIsNone(index.find(date(2021, 12, 31)))
+
+    def test_matches_the_query_for_every_sunday(self):
+        index = ProperIndex(self.calendar)
+
+        day = date(2018, 1, 7)
+        while day.year <= 2030:
+            self.assertEqual(index.find(day), find_proper_by_query(self.calendar, day), day)
+            day += timedelta(days=7)
+
+
+def shift_to_weekday(day, direction, weekday):
+    """One step of Delorean's named-day shift: the next weekday strictly after the day, or the last one before it"""
+
+    current = day.weekday()
+    target = [week_day.lower() for week_day in week_days].index(weekday)
+    if direction == "next":
+        days = target - current if current < target else target - current + 7
+    else:
+        days = target - current - 7 if current <= target else target - current
+    return day + timedelta(days=days)
+
+
+def delorean_weekday_after(weekday, month, day, year, number_after=1):
+    """weekday_after reimplemented the way Delorean computed it, shifting one week at a time"""
+
+    direction = "last" if number_after < 1 else "next"
+    result = shift_to_weekday(date(year, month, day), direction, weekday)
+    for shift in range(abs(number_after) - 1):
+        result = shift_to_weekday(result, direction, weekday)
+    return result
+
+
+# weekday_after(weekday, month, day, year, number_after) for number_after -4, -1, 0, 1 and 2, as Delorean's
+# _shift_date returned it before Delorean was dropped
+DELOREAN_WEEKDAY_AFTER = (
+    ("monday", 12, 25, 2019, ("2019-12-02", "2019-12-23", "2019-12-23", "2019-12-30", "2020-01-06")),
+    ("thursday", 12, 25, 2019, ("2019-11-28", "2019-12-19", "2019-12-19", "2019-12-26", "2020-01-02")),
+    ("sunday", 12, 25, 2019, ("2019-12-01", "2019-12-22", "2019-12-22", "2019-12-29", "2020-01-05")),
+    ("monday", 2, 28, 2020, ("2020-02-03", "2020-02-24", "2020-02-24", "2020-03-02", "2020-03-09")),
+    ("thursday", 2, 28, 2020, ("2020-02-06", "2020-02-27", "2020-02-27", "2020-03-05", "2020-03-12")),
+    ("sunday", 2, 28, 2020, ("2020-02-02", "2020-02-23", "2020-02-23", "2020-03-01", "2020-03-08")),
+    ("monday", 11, 26, 2021, ("2021-11-01", "2021-11-22", "2021-11-22", "2021-11-29", "2021-12-06")),
+    ("thursday", 11, 26, 2021, ("2021-11-04", "2021-11-25", "2021-11-25", "2021-12-02", "2021-12-09")),
+    ("sunday", 11, 26, 2021, ("2021-10-31", "2021-11-21", "2021-11-21", "2021-11-28", "2021-12-05")),
+    # March 1, 2100 is a Monday, and 2100 is not a leap year
+    ("monday", 3, 1, 2100, ("2100-02-01", "2100-02-22", "2100-02-22", "2100-03-08", "2100-03-15")),
+    ("thursday", 3, 1, 2100, ("2100-02-04", "2100-02-25", "2100-02-25", "2100-03-04", "2100-03-11")),
+    ("sunday", 3, 1, 2100, ("2100-02-07", "2100-02-28", "2100-02-28", "2100-03-07", "2100-03-14")),
+)
+
+# the first Sunday of Advent as Delorean worked it out
+DELOREAN_ADVENT = (
+    (1700, "1700-11-28"),
+    (2000, "2000-12-03"),
+    (2019, "2019-12-01"),
+    (2020, "2020-11-29"),
+    (2021, "2021-11-28"),
+    (2022, "2022-11-27"),
+    (2100, "2100-11-28"),
+    (2400, "2400-12-03"),
+)
+
+
+class DateUtilsTestCase(SimpleTestCase):
+    def test_weekday_after_matches_delorean(self):
+        for weekday, month, day, year, expected in DELOREAN_WEEKDAY_AFTER:
+            for number_after, expected_date in zip((-4, -1, 0, 1, 2), expected):
+                self.assertEqual(
+                    weekday_after(weekday, month, day, year, number_after),
+                    date.fromisoformat(expected_date),
+                    (weekday, month, day, year, number_after),
+                )
+
+    def test_weekday_after_matches_shifting_a_week_at_a_time(self):
+        """Checks a wider range against delorean_weekday_after, a reimplementation of Delorean's shifting rather
+        than Delorean itself"""
+
+        for year in range(1600, 2401):
+            days = [(1, 1), (2, 28), (3, 1), (11, 26), (12, 25), (12, 31)]
+            if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+                days.append((2, 29))
+            for month, day in days:
+                for weekday in ("monday", "wednesday", "saturday", "sunday"):
+                    for number_after in (-4, -1, 0, 1, 2, 5):
+                        self.assertEqual(
+                            weekday_after(weekday, month, day, year, number_after),
+                            delorean_weekday_after(weekday, month, day, year, number_after),
+                            (weekday, month, day, year, number_after),
+                        )
+
+    def test_advent(self):
+        for year, expected in DELOREAN_ADVENT:
+            self.assertEqual(advent(year), date.fromisoformat(expected), year)
+
+        for year in range(1600, 2401):
+            self.assertEqual(advent(year), delorean_weekday_after("sunday", 12, 25, year, -4), year)
+            self.assertEqual(advent(year).weekday(), 6)
+            self.assertTrue(date(year, 11, 27) <= advent(year) <= date(year, 12, 3), year)
+
+    def test_easter(self):
+        for year in range(1600, 2401):
+            self.assertEqual(easter(year), dateutil_easter(year), year)
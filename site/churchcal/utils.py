@@ -1,23 +1,28 @@
 from datetime import date
+from functools import lru_cache
 
-from django.utils import timezone
-
-import arrow
-from delorean import Delorean
+week_days = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
 
 
 def weekday_after(weekday, month, day, year=None, number_after=1):
+    """Returns the nth given weekday strictly after (or, for number_after < 1, strictly before) month/day/year"""
 
     if not year:
-        year = arrow.utcnow().format("YYYY")
+        year = date.today().year
+
+    target = [week_day.lower() for week_day in week_days].index(weekday.lower())
+    start = date(year, month, day)
+    shifts = max(abs(number_after), 1)
 
-    weekday = weekday.lower()
-    direction = "last" if number_after < 1 else "next"
-    number_after = abs(number_after)
-    d = Delorean(datetime=timezone.datetime(year, month, day), timezone="UTC")
-    return d._shift_date(direction, weekday, number_after).date
+    if number_after < 1:
+        days = (start.weekday() - target) % 7 or 7
+        return date.fromordinal(start.toordinal() - days - 7 * (shifts - 1))
 
+    days = (target - start.weekday()) % 7 or 7
+    return date.fromordinal(start.toordinal() + days + 7 * (shifts - 1))
 
+
+@lru_cache(maxsize=None)
 def easter(year):
     "Returns Easter as a date object."
     a = year % 19
@@ -31,8 +36,215 @@ def easter(year):
     return date(year, month, day)
 
 
+@lru_cache(maxsize=None)
 def advent(year):
     return weekday_after(weekday="sunday", month=12, day=25, year=year, number_after=-4)
 
 
-week_days = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+books = {
+    "Genesis": ("the Book of Genesis", False, "OT"),
+    "Exodus": ("the Book of Exodus", False, "OT"),
+    "Leviticus": ("the Book of Leviticus", False, "OT"),
+    "Numbers": ("the Book of Numbers", False, "OT"),
+    "Deuteronomy": ("the Book of Deuteronomy", False, "OT"),
+    "Joshua": ("the Book of Joshua", False, "OT"),
+    "Judges": ("the Book of Judges", False, "OT"),
+    "Ruth": ("the Book of Ruth", False, "OT"),
+    "I Samuel": ("the First Book of Samuel", False, "OT"),
+    "II Samuel": ("the Second Book of Samuel", False, "OT"),
+    "I Kings": ("the First Book of Kings", False, "OT"),
+    "II Kings": ("the Second Book of Kings", False, "OT"),
+    "I Chronicles": ("the First Book of Chronicles", False, "OT"),
+    "II Chronicles": ("the Second Book of Chronicles", False, "OT"),
+    "Ezra": ("the Book of Ezra", False, "OT"),
+    "Nehemiah": ("the Book of Nehemiah", False, "OT"),
+    "Esther": ("the Book of Esther", False, "OT"),
+    "Job": ("the Book of Job", False, "OT"),
+    "Psalms": ("the Psalms", False, "OT"),
+    "Proverbs": ("Proverbs", False, "OT"),
+    "Ecclesiastes": ("the Book of Ecclesiastes", False, "OT"),
+    "Song of Songs": ("the Song of Songs", False, "OT"),
+    "Isaiah": ("the Prophet Isaiah", False, "OT"),
+    "Jeremiah": ("the Book of Jeremiah", False, "OT"),
+    "Lamentations": ("the Lamentations of Jeremiah", False, "OT"),
+    "Ezekiel": ("the Prophet Ezekiel", False, "OT"),
+    "Daniel": ("the Prophet Daniel", False, "OT"),
+    "Hosea": ("the Prophet Hosea", False, "OT"),
+    "Joel": ("the Prophet Joel", False, "OT"),
+    "Amos": ("the Prophet Amos", False, "OT"),
+    "Obadiah": ("the Prophet Obadiah", True, "OT"),
+    "Jonah": ("the Prophet Jonah", False, "OT"),
+    "Micah": ("the Prophet Micah", False, "OT"),
+    "Nahum": ("the Prophet Nahum", False, "OT"),
+    "Habakkuk": ("the Prophet Habakkuk", False, "OT"),
+    "Zephaniah": ("the Prophet Zephaniah", False, "OT"),
+    "Haggai": ("the Prophet Haggai", False, "OT"),
+    "Zechariah": ("the Prophet Zechariah", False, "OT"),
+    "Malachi": ("the Prophet Malachi", False, "OT"),
+    "Matthew": ("the Gospel of our Lord Jesus Christ according to St. Matthew", False, "NT"),
+    "Mark": ("the Gospel of our Lord Jesus Christ according to St. Mark", False, "NT"),
+    "Luke": ("the Gospel of our Lord Jesus Christ according to St. Luke", False, "NT"),
+    "John": ("the Gospel of our Lord Jesus Christ according to St. John", False, "NT"),
+    "Acts": ("the Acts of the Apostles", False, "NT"),
+    "Romans": ("St. Paul's Epistle to the Romans", False, "NT"),
+    "I Corinthians": ("St. Paul's First Epistle to the Corinthians", False, "NT"),
+    "II Corinthians": ("St. Paul's Second Epistle to the Corinthians", False, "NT"),
+    "Galatians": ("the Epistle of St. Paul to the Galatians", False, "NT"),
+    "Ephesians": ("the Epistle of St. Paul to the Ephesians", False, "NT"),
+    "Philippians": ("the Epistle of St. Paul to the Philippians", False, "NT"),
+    "Colossians": ("the Epistle of St. Paul to the Colossians", False, "NT"),
+    "I Thessalonians": ("St. Paul's First Epistle to the Thessalonians", False, "NT"),
+    "II Thessalonians": ("St. Paul's Second Epistle to the Thessalonians", False, "NT"),
+    "I Timothy": ("St. Paul's First Epistle to St. Timothy", False, "NT"),
+    "II Timothy": ("St. Paul's Second Epistle to St. Timothy", False, "NT"),
+    "Titus": ("St. Paul's Epistle to St. Titus", False, "NT"),
+    "Philemon": ("St. Paul's Epistle to Philemon", True, "NT"),
+    "Hebrews": ("the Epistle to the Hebrews", False, "NT"),
+    "James": ("the Epistle of St. James", False, "NT"),
+    "I Peter": ("the First Epistle of St. Peter", False, "NT"),
+    "II Peter": ("the Second Epistle of St. Peter", False, "NT"),
+    "I John": ("the First Epistle of St. John", True, "NT"),
+    "II John": ("the Second Epistle of St. John", True, "NT"),
+    "III John": ("the Third Epistle of St. John", False, "NT"),
+    "Jude": ("the Epistle of St. Jude", True, "NT"),
+    "Revelation": ("the Revelation of Our Lord Jesus Christ to St. John", False, "NT"),
+    "Tobit": ("the Book of Tobit", False, "DC"),
+    "Judith": ("the Book of Judith", False, "DC"),
+    "Additions to Esther": ("the Book of Esther", False, "DC"),
+    "Wisdom": ("the Wisdom of Solomon", False, "DC"),
+    "Sirach": ("Ecclesiasticus, the Wisdom of Jesus Son of Sirach ", False, "DC"),
+    "Baruch": ("the Book of Baruch the Prophet", False, "DC"),
+    "Letter of Jeremiah": ("the Letter of Jeremiah", True, "DC"),
+    "Prayer of Azariah": ("Prayer of Azariah", True, "DC"),
+    "Susanna": ("the book of Daniel", True, "DC"),
+    "Bel and the Dragon": ("Bel and the Dragon", False, "DC"),
+    "I Maccabees": ("the First Book of the Maccabees", False, "DC"),
+    "II Maccabees": ("the Second Book of the Maccabees", False, "DC"),
+    "I Esdras": ("the First Book of Esdras", False, "AP"),
+    "II Esdras": ("the Second Book of Esdras", False, "AP"),
+    "Prayer of Manasseh": ("Prayer of Manasseh", True, "AP"),
+}
+
+
+ONES = (
+    "zero",
+    "one",
+    "two",
+    "three",
+    "four",
+    "five",
+    "six",
+    "seven",
+    "eight",
+    "nine",
+    "ten",
+    "eleven",
+    "twelve",
+    "thirteen",
+    "fourteen",
+    "fifteen",
+    "sixteen",
+    "seventeen",
+    "eighteen",
+    "nineteen",
+)
+TENS = ("", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety")
+IRREGULAR_ORDINALS = {
+    "one": "first",
+    "two": "second",
+    "three": "third",
+    "five": "fifth",
+    "eight": "eighth",
+    "nine": "ninth",
+    "twelve": "twelfth",
+}
+
+
+def cardinal_words(number):
+    if number < 20:
+        return ONES[number]
+    if number < 100:
+        tens, ones = divmod(number, 10)
+        return "{}-{}".format(TENS[tens], ONES[ones]) if ones else TENS[tens]
+    hundreds, rest = divmod(number, 100)
+    if not rest:
+        return "{} hundred".format(cardinal_words(hundreds))
+    return "{} hundred and {}".format(cardinal_words(hundreds), cardinal_words(rest))
+
+
+def ordinal_words(number):
+    """Spells out an ordinal the way num2words(number, ordinal=True) does, e.g. one hundred and nineteenth"""
+
+    words = cardinal_words(number)
+    split = max(words.rfind(" "), words.rfind("-")) + 1
+    last = words[split:]
+    if last in IRREGULAR_ORDINALS:
+        last = IRREGULAR_ORDINALS[last]
+    elif last.endswith("y"):
+        last = last[:-1] + "ieth"
+    else:
+        last = last + "th"
+    return words[:split] + last
+
+
+# every chapter and verse number in the Bible (Psalm 119 has 176 verses)
+ORDINALS = tuple(ordinal_words(number) for number in range(200))
+
+
+def ordinal(number):
+    number = int(number)
+    return ORDINALS[number] if number < len(ORDINALS) else ordinal_words(number)
+
+
+@lru_cache(maxsize=4096)
+def passage_to_citation(passage):
+    """The introduction read before a passage
+
+    Office days and mass readings store theirs when saved, so this is only worked out for rows saved before that; the
+    cache keeps it to once per passage per process.
+    """
+
+    import scriptures
+
+    if not passage:
+        return None
+
+    passage = scriptures.extract(passage)[0]
+
+    if not passage:
+        return None
+
+    if passage[0] == "Susanna":
+        return "The Book of Daniel, beginning with thirteenth chapter, the first verse, the Story of Susanna"
+
+    book_name = passage[0]
+    if book_name == "Song of Solomon":
+        book_name = "Song of Songs"
+
+    book_name = passage[0]
+    if book_name == "Revelation of Jesus Christ":
+        book_name = "Revelation"
+
+    book = books[book_name]
+
+    if book[1]:  # 1 chapter book
+        return "A reading from {}, beginning with the {} verse".format(book[0], ordinal(passage[2]))
+
+    return "A reading from {}, beginning with the {} chapter, the {} verse".format(
+        book[0], ordinal(passage[1]), ordinal(passage[2])
+    )
+
+
+def passage_intro(passage):
+    """passage_to_citation for storing when a row is saved: None, rather than an error, for passages it can't read"""
+
+    try:
+        return passage_to_citation(passage)
+    except (IndexError, KeyError):
+        return None
+
+
+def reading_intro(intro, passage):
+    """A reading's stored introduction, or the one for its passage if it was saved before introductions were stored"""
+
+    return intro if intro else passage_to_citation(passage)
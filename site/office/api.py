@@ -0,0 +1,163 @@
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db.models import Model
+from django.forms.models import model_to_dict
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from churchcal.calculations import CalendarDate, CommemorationView
+from office.canticles import Canticle
+from office.compline import Compline
+from office.evening_prayer import EveningPrayer
+from office.family_close_of_day import FamilyCloseOfDay
+from office.family_early_evening import FamilyEarlyEvening
+from office.family_midday import FamilyMidday
+from office.family_morning import FamilyMorning
+from office.midday_prayer import MiddayPrayer
+from office.morning_prayer import MorningPrayer
+from office.offices import OfficeDayIndex
+from website.sitemaps import get_days
+
+OFFICES = {
+    office.office: office
+    for office in (
+        MorningPrayer,
+        MiddayPrayer,
+        EveningPrayer,
+        Compline,
+        FamilyMorning,
+        FamilyMidday,
+        FamilyEarlyEvening,
+        FamilyCloseOfDay,
+    )
+}
+
+
+def to_json(value):
+    """Turns section data into values JsonResponse can encode: canticles, calendar dates and models become dicts"""
+
+    if isinstance(value, dict):
+        return {str(key): to_json(item) for key, item in value.items()}
+    if isinstance(value, type) and issubclass(value, Canticle):
+        return {
+            "latin_name": value.latin_name,
+            "english_name": value.english_name,
+            "citation": value.citation,
+            "gloria": value.gloria,
+            "rubric": value.rubric,
+            "content": value().content,
+        }
+    if isinstance(value, CalendarDate):
+        return {
+            "date": value.date,
+            "season": value.season.name if value.season else None,
+            "primary": to_json(value.primary),
+            "primary_evening": to_json(value.primary_evening),
+            "commemorations": to_json(value.all),
+            "evening_commemorations": to_json(value.all_evening),
+        }
+    if isinstance(value, CommemorationView):
+        return to_json(value.__getstate__())
+    if isinstance(value, Model):
+        return to_json(model_to_dict(value))
+    if hasattr(value, "_asdict"):
+        return to_json(value._asdict())
+    if isinstance(value, (list, tuple, set)):
+        return [to_json(item) for item in value]
+    if value is None or isinstance(value, (str, int, float, bool, date)):
+        return value
+    return str(value)
+
+
+def office_json(office):
+    return {
+        "office": office.office,
+        "name": office.name,
+        "date": office.date.date,
+        "title": office.title,
+        "sections": [
+            {"section": section.__class__.__name__, "template": template, "data": to_json(section.data)}
+            for section, template in office.modules
+        ],
+    }
+
+
+def parse_date(value):
+    try:
+        year, month, day = (int(part) for part in value.split("-"))
+        return date(year, month, day)
+    except (AttributeError, ValueError):
+        return None
+
+
+@require_GET
+def office_data(request, office, year, month, day):
+    if office not in OFFICES:
+        return JsonResponse({"error": "Unknown office {}".format(office)}, status=404)
+
+    return JsonResponse(office_json(OFFICES[office]("{}-{}-{}".format(year, month, day))))
+
+
+def get_office_months():
+    """Each office and month with a published date, for the static export of office_data_month"""
+
+    months = sorted({(day["year"], day["month"]) for day in get_days()})
+    for office in OFFICES:
+        for year, month in months:
+            yield {"office": office, "year": year, "month": month}
+
+
+@require_GET
+def office_data_month(request, office, year, month):
+    """The data of an office for every date in a month
+
+    Unlike the other API views this one is exported with the static site, as api/office/<office>/<year>-<month>.json
+    """
+
+    if office not in OFFICES:
+        return JsonResponse({"error": "Unknown office {}".format(office)}, status=404)
+    if not 1 <= month <= 12:
+        return JsonResponse({"error": "Unknown month {}".format(month)}, status=404)
+
+    office_days = OfficeDayIndex()
+    days = []
+    day = date(year, month, 1)
+    while day.month == month:
+        days.append(office_json(OFFICES[office]("{}-{}-{}".format(day.year, day.month, day.day), office_days)))
+        day += timedelta(days=1)
+
+    return JsonResponse({"office": office, "year": year, "month": month, "days": days})
+
+
+@require_GET
+def office_data_range(request):
+    """The data of one or more offices for every date from start to end, e.g.
+
+    /api/offices/?offices=morning_prayer,evening_prayer&start=2020-1-1&end=2020-1-31
+    """
+
+    offices = [office for office in request.GET.get("offices", "").split(",") if office]
+    unknown = [office for office in offices if office not in OFFICES]
+    if not offices or unknown:
+        return JsonResponse({"error": "Unknown or missing offices: {}".format(", ".join(unknown))}, status=400)
+
+    start = parse_date(request.GET.get("start"))
+    end = parse_date(request.GET.get("end", request.GET.get("start")))
+    if not start or not end or end < start:
+        return JsonResponse({"error": "start and end must be dates like 2020-1-31, with end after start"}, status=400)
+    if (end - start).days + 1 > settings.OFFICE_API_MAX_DAYS:
+        return JsonResponse({"error": "At most {} days at once".format(settings.OFFICE_API_MAX_DAYS)}, status=400)
+
+    # one load of the office days serves every date; the church years come from the church year cache
+    office_days = OfficeDayIndex()
+    days = []
+    day = start
+    while day <= end:
+        date_string = "{}-{}-{}".format(day.year, day.month, day.day)
+        days.append(
+            {"date": day, "offices": [office_json(OFFICES[office](date_string, office_days)) for office in offices]}
+        )
+        day += timedelta(days=1)
+
+    return JsonResponse({"start": start, "end": end, "days": days})
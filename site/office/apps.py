@@ -1,5 +1,16 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_save, post_delete
 
 
 class OfficeConfig(AppConfig):
     name = "office"
+
+    def ready(self):
+        from office.caching import invalidate_office_bodies
+        from office.canticles import build_canticle_tables, load_canticle_contents
+
+        load_canticle_contents()
+        build_canticle_tables()
+
+        post_save.connect(invalidate_office_bodies, dispatch_uid="office_bodies_save")
+        post_delete.connect(invalidate_office_bodies, dispatch_uid="office_bodies_delete")
@@ -0,0 +1,66 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+
+from churchcal.caching import church_year_cache
+
+GENERATION_KEY = "office_body_generation"
+
+
+def office_body_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, 1, timeout=None)
+        generation = cache.get(GENERATION_KEY, 1)
+    return generation
+
+
+@lru_cache(maxsize=None)
+def source_version():
+    """A digest of the code and templates that render office bodies, worked out once per process"""
+
+    from website.exporting import source_fingerprint
+
+    return source_fingerprint()[:12]
+
+
+def office_body_key(office, date, calendar="ACNA_BCP2019"):
+    """The cache key for an office's rendered body on a date
+
+    It carries the version of the code and templates, the church calendar's data fingerprint and a generation number
+    that is bumped whenever office days, commemorations, mass readings or psalms change.
+    """
+
+    return "office_body:{}:{}:{}:{}:{}".format(
+        office, date.isoformat(), source_version(), church_year_cache.fingerprint(calendar), office_body_generation()
+    )
+
+
+def get_office_body(office, date, render, calendar="ACNA_BCP2019"):
+    key = office_body_key(office, date, calendar)
+    body = cache.get(key)
+    if body is None:
+        body = render()
+        cache.set(key, body, timeout=settings.OFFICE_BODY_CACHE_TIMEOUT)
+    return body
+
+
+def clear_office_bodies():
+    try:
+        return cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 2, timeout=None)
+        return 2
+
+
+def invalidate_office_bodies(sender, instance, **kwargs):
+    from churchcal.models import Commemoration, MassReading
+    from office.models import OfficeDay
+    from psalter.models import Psalm, PsalmVerse
+
+    # Subclasses of Commemoration and OfficeDay send signals under their own sender, so match on instance type
+    if not isinstance(instance, (OfficeDay, Commemoration, MassReading, Psalm, PsalmVerse)):
+        return
+
+    clear_office_bodies()
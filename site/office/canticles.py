@@ -1,5 +1,10 @@
+from types import MappingProxyType
+
 from django.template.loader import render_to_string
 
+# rendered canticle texts by template, filled once by load_canticle_contents when the office app is ready
+canticle_contents = MappingProxyType({})
+
 
 class Canticle(object):
 
@@ -14,7 +19,10 @@ class Canticle(object):
 
     @property
     def content(self):
-        return render_to_string("office/canticles/" + self.template)
+        content = canticle_contents.get(self.template)
+        if content is None:
+            content = render_to_string("office/canticles/" + self.template)
+        return content
 
 
 class MP1(Canticle):
@@ -187,237 +195,328 @@ class O2(Canticle):
     citation = "PSALM 100"
 
 
+CANTICLES = (MP1, MP2, MP3, EP1, EP2, S1, S2, S3, S4, S5, S6, S7, S8, S9, S10, O1, O2)
+
+
+def load_canticle_contents():
+    global canticle_contents
+
+    canticle_contents = MappingProxyType(
+        {canticle.template: render_to_string("office/canticles/" + canticle.template) for canticle in CANTICLES}
+    )
+
+
+# the seasons the tables are built for up front; dates in any other season are looked up and remembered on first use
+SEASONS = ("Advent", "Christmastide", "Epiphanytide", "Lent", "Holy Week", "Eastertide", "Season After Pentecost")
+
+FEAST = "feast"
+ORDINARY = "ordinary"
+
+
+def rank_class(calendar_date):
+    rank = calendar_date.primary.rank
+    if rank.precedence_rank in [1, 3] and rank.name != "PRIVILEGED_OBSERVANCE":
+        return FEAST
+    return ORDINARY
+
+
 class CanticleRules(object):
+    """Chooses canticles from (weekday, season, rank class) tables
+
+    Each rule (mp_canticle_1 and so on) is a plain function of the weekday, season name and rank class, plus any
+    extras a scheme adds to the key. build_tables evaluates every rule over every key once, so choosing a canticle
+    for a date is a dictionary lookup.
+    """
+
+    rules = ("mp_canticle_1", "mp_canticle_2", "ep_canticle_1", "ep_canticle_2")
+
+    # the possible extra key values for rules that need more than the weekday, season and rank class
+    extras = {}
+
+    tables = None
+
+    @classmethod
+    def build_tables(cls):
+        rules = cls()
+        tables = {}
+        for name in cls.rules:
+            rule = getattr(rules, name)
+            table = {}
+            for weekday in range(7):
+                for season in SEASONS:
+                    for rank in (FEAST, ORDINARY):
+                        for extra in cls.extras.get(name, ((),)):
+                            table[(weekday, season, rank) + extra] = rule(weekday, season, rank, *extra)
+            tables[name] = table
+        cls.tables = tables
+
+    def lookup(self, name, calendar_date, *extra):
+        if self.__class__.tables is None:
+            self.__class__.build_tables()
+
+        key = (calendar_date.date.weekday(), calendar_date.season.name, rank_class(calendar_date)) + extra
+        table = self.tables[name]
+        if key not in table:
+            table[key] = getattr(self, name)(*key)
+        return table[key]
+
     def get_mp_canticle_1(self, calendar_date):
-        raise NotImplementedError
+        return self.lookup("mp_canticle_1", calendar_date)
 
     def get_mp_canticle_2(self, calendar_date):
-        raise NotImplementedError
+        return self.lookup("mp_canticle_2", calendar_date)
 
     def get_ep_canticle_1(self, calendar_date):
-        raise NotImplementedError
+        return self.lookup("ep_canticle_1", calendar_date)
 
     def get_ep_canticle_2(self, calendar_date):
+        return self.lookup("ep_canticle_2", calendar_date)
+
+    def mp_canticle_1(self, weekday, season, rank):
+        raise NotImplementedError
+
+    def mp_canticle_2(self, weekday, season, rank):
+        raise NotImplementedError
+
+    def ep_canticle_1(self, weekday, season, rank):
+        raise NotImplementedError
+
+    def ep_canticle_2(self, weekday, season, rank):
         raise NotImplementedError
 
 
 class DefaultCanticles(CanticleRules):
-    def get_mp_canticle_1(self, calendar_date):
-        if calendar_date.season.name in ["Lent", "Holy Week"]:
+    def mp_canticle_1(self, weekday, season, rank):
+        if season in ["Lent", "Holy Week"]:
             return MP2
         return MP1
 
-    def get_mp_canticle_2(self, calendar_date):
+    def mp_canticle_2(self, weekday, season, rank):
         return MP3
 
-    def get_ep_canticle_1(self, calendar_date):
+    def ep_canticle_1(self, weekday, season, rank):
         return EP1
 
-    def get_ep_canticle_2(self, calendar_date):
+    def ep_canticle_2(self, weekday, season, rank):
         return EP2
 
 
 class BCP1979CanticleTable(CanticleRules):
-    def get_mp_canticle_1(self, calendar_date):
+    def mp_canticle_1(self, weekday, season, rank):
 
-        if (
-            calendar_date.primary.rank.precedence_rank in [1, 3]
-            and calendar_date.primary.rank.name != "PRIVILEGED_OBSERVANCE"
-        ):
+        if rank == FEAST:
             return MP3
 
-        if calendar_date.date.weekday() == 6:  # Sunday
-            if calendar_date.season.name == "Advent":
+        if weekday == 6:  # Sunday
+            if season == "Advent":
                 return S2
 
-            if calendar_date.season.name in ["Lent", "Holy Week"]:
+            if season in ["Lent", "Holy Week"]:
                 return S3
 
-            if calendar_date.season.name == "Eastertide":
+            if season == "Eastertide":
                 return S5
 
             return MP3
 
-        if calendar_date.date.weekday() == 0:  # Monday
+        if weekday == 0:  # Monday
             return S8
 
-        if calendar_date.date.weekday() == 1:  # Tuesday
+        if weekday == 1:  # Tuesday
             return MP2
 
-        if calendar_date.date.weekday() == 2:  # Wednesday
-            if calendar_date.season.name in ["Lent", "Holy Week"]:
+        if weekday == 2:  # Wednesday
+            if season in ["Lent", "Holy Week"]:
                 return S3
 
             return S2
 
-        if calendar_date.date.weekday() == 3:  # Thursday
+        if weekday == 3:  # Thursday
             return S5
 
-        if calendar_date.date.weekday() == 4:  # Friday
-            if calendar_date.season.name in ["Lent", "Holy Week"]:
+        if weekday == 4:  # Friday
+            if season in ["Lent", "Holy Week"]:
                 return S3
 
             return S4
 
-        if calendar_date.date.weekday() == 5:  # Thursday
+        if weekday == 5:  # Thursday
             return S10
 
-    def get_mp_canticle_2(self, calendar_date):
+    def mp_canticle_2(self, weekday, season, rank):
 
-        if (
-            calendar_date.primary.rank.precedence_rank in [1, 3]
-            and calendar_date.primary.rank.name != "PRIVILEGED_OBSERVANCE"
-        ):
+        if rank == FEAST:
             return MP1
 
-        if calendar_date.date.weekday() == 6:  # Sunday
-            if calendar_date.season.name in ["Advent", "Lent", "Holy Week"]:
+        if weekday == 6:  # Sunday
+            if season in ["Advent", "Lent", "Holy Week"]:
                 return MP3
 
             return MP1
 
-        if calendar_date.date.weekday() == 0:  # Monday
+        if weekday == 0:  # Monday
             return S1
 
-        if calendar_date.date.weekday() == 1:  # Tuesday
+        if weekday == 1:  # Tuesday
             return S6
 
-        if calendar_date.date.weekday() == 2:  # Wednesday
+        if weekday == 2:  # Wednesday
             return MP3
 
-        if calendar_date.date.weekday() == 3:  # Thursday
-            if calendar_date.season.name in ["Advent", "Lent", "Holy Week"]:
+        if weekday == 3:  # Thursday
+            if season in ["Advent", "Lent", "Holy Week"]:
                 return S1
 
             return O1
 
-        if calendar_date.date.weekday() == 4:  # Friday
+        if weekday == 4:  # Friday
             return S6
 
-        if calendar_date.date.weekday() == 5:  # Saturday
+        if weekday == 5:  # Saturday
             return S1
 
-    def get_ep_canticle_1(self, calendar_date):
-        if (
-            calendar_date.primary.rank.precedence_rank in [1, 3]
-            and calendar_date.primary.rank.name != "PRIVILEGED_OBSERVANCE"
-        ):
+    def ep_canticle_1(self, weekday, season, rank):
+        if rank == FEAST:
             return EP1
 
-        if calendar_date.date.weekday() == 6:  # Sunday
+        if weekday == 6:  # Sunday
             return EP1
 
-        if calendar_date.date.weekday() == 0:  # Monday
-            if calendar_date.season.name in ["Lent", "Holy Week"]:
+        if weekday == 0:  # Monday
+            if season in ["Lent", "Holy Week"]:
                 return S3
             return S5
 
-        if calendar_date.date.weekday() == 1:  # Tuesday
+        if weekday == 1:  # Tuesday
             return S4
 
-        if calendar_date.date.weekday() == 2:  # Wednesday
+        if weekday == 2:  # Wednesday
             return S10
 
-        if calendar_date.date.weekday() == 3:  # Thursday
+        if weekday == 3:  # Thursday
             return S2
 
-        if calendar_date.date.weekday() == 4:  # Friday
+        if weekday == 4:  # Friday
             return MP2
 
-        if calendar_date.date.weekday() == 5:  # Saturday
+        if weekday == 5:  # Saturday
             return S8
 
-    def get_ep_canticle_2(self, calendar_date):
-        if (
-            calendar_date.primary.rank.precedence_rank in [1, 3]
-            and calendar_date.primary.rank.name != "PRIVILEGED_OBSERVANCE"
-        ):
+    def ep_canticle_2(self, weekday, season, rank):
+        if rank == FEAST:
             return EP2
 
-        if calendar_date.date.weekday() in [6, 0, 2, 4]:  # Sunday, Monday, Wednesday, Friday
+        if weekday in [6, 0, 2, 4]:  # Sunday, Monday, Wednesday, Friday
             return EP2
 
         return EP1
 
 
 class REC2011CanticleTable(CanticleRules):
+
+    extras = {
+        # whether any commemoration of the day is Ascension or the Day of Pentecost
+        "mp_canticle_1": ((False,), (True,)),
+        # whether the date is the 12th of the month, and whether the 60 day psalms include Psalm 67
+        "ep_canticle_2": ((False, False), (False, True), (True, False), (True, True)),
+    }
+
     def get_mp_canticle_1(self, calendar_date):
+        ascension_or_pentecost = any(
+            "Ascension" in commemoration.name or "Day of Pentecost" in commemoration.name
+            for commemoration in calendar_date.all
+        )
+        return self.lookup("mp_canticle_1", calendar_date, ascension_or_pentecost)
+
+    def get_mp_canticle_2(self, calendar_date):
+        if calendar_date.date.month == 4 and calendar_date.date.day == 29:
+            return O2
+        return self.lookup("mp_canticle_2", calendar_date)
+
+    def get_ep_canticle_1(self, calendar_date):
+        if calendar_date.date.month == 11 and calendar_date.date.day == 13:
+            return S7
+        return self.lookup("ep_canticle_1", calendar_date)
 
-        if (
-            calendar_date.primary.rank.precedence_rank in [1, 3]
-            and calendar_date.primary.rank.name != "PRIVILEGED_OBSERVANCE"
-        ):
+    def get_ep_canticle_2(self, calendar_date, office_readings):
+        return self.lookup(
+            "ep_canticle_2",
+            calendar_date,
+            calendar_date.date.day == 12,
+            office_readings.ep_psalm_citation.mentions(67),
+        )
+
+    def mp_canticle_1(self, weekday, season, rank, ascension_or_pentecost=False):
+
+        if rank == FEAST:
             return MP1
 
-        if calendar_date.date.weekday() == 6:  # Sunday
+        if weekday == 6:  # Sunday
             return MP1
 
-        if calendar_date.season.name == "Christmastide":
+        if season == "Christmastide":
             return MP1
 
-        if calendar_date.season.name == "Advent":
+        if season == "Advent":
             return S1
 
-        if calendar_date.season.name == "Epiphanytide":
+        if season == "Epiphanytide":
             return S2
 
-        if calendar_date.season.name in ["Lent", "Holy Week"]:
+        if season in ["Lent", "Holy Week"]:
             return MP2
 
-        for commemoration in calendar_date.all:
-            if "Ascension" in commemoration.name or "Day of Pentecost" in commemoration.name:
-                return S6
+        if ascension_or_pentecost:
+            return S6
 
-        if calendar_date.season.name == "Eastertide":
+        if season == "Eastertide":
             return S5
 
-        if calendar_date.season.name == "Season After Pentecost":
+        if season == "Season After Pentecost":
 
-            if calendar_date.date.weekday() == 5:
+            if weekday == 5:
                 return S10
             return S8
 
         return MP1
 
-    def get_mp_canticle_2(self, calendar_date):
-        if calendar_date.date.month == 4 and calendar_date.date.day == 29:
-            return O2
+    def mp_canticle_2(self, weekday, season, rank):
         return MP3
 
-    def get_ep_canticle_1(self, calendar_date):
-        if calendar_date.date.month == 11 and calendar_date.date.day == 13:
-            return S7
+    def ep_canticle_1(self, weekday, season, rank):
         return EP1
 
-    def get_ep_canticle_2(self, calendar_date, office_readings):
-        if (
-            calendar_date.primary.rank.precedence_rank in [1, 3]
-            and calendar_date.primary.rank.name != "PRIVILEGED_OBSERVANCE"
-        ):
+    def ep_canticle_2(self, weekday, season, rank, twelfth_day=False, psalm_67=False):
+        if rank == FEAST:
             return EP2
 
         # First and Second Evensong of Sunday
-        if calendar_date.date.weekday() == 5 or calendar_date.date.weekday() == 6:
+        if weekday == 5 or weekday == 6:
             return EP2
 
-        if calendar_date.season.name == "Advent":
+        if season == "Advent":
             return S4
 
-        if calendar_date.season.name in ["Lent", "Holy Week"]:
+        if season in ["Lent", "Holy Week"]:
             return S3
 
-        if calendar_date.season.name in ["Christmastide", "Eastertide"]:
+        if season in ["Christmastide", "Eastertide"]:
             return S7
 
-        if calendar_date.season.name in ["Epiphanytide", "Season After Pentecost"]:
+        if season in ["Epiphanytide", "Season After Pentecost"]:
             thirty_day = S9
             sixty_day = S9
-            if calendar_date.date.day == 12:
+            if twelfth_day:
                 thirty_day = EP2
-            if "67" in office_readings.ep_psalms:
+            if psalm_67:
                 sixty_day = EP2
             if thirty_day == sixty_day:
                 return thirty_day
             return (thirty_day, sixty_day)
 
         return EP2
+
+
+def build_canticle_tables():
+    for scheme in (DefaultCanticles, BCP1979CanticleTable, REC2011CanticleTable):
+        scheme.build_tables()
@@ -19,7 +19,7 @@ from office.offices import (
     GreatLitany,
     PandemicPrayers,
 )
-from office.utils import passage_to_citation
+from churchcal.utils import reading_intro
 from psalter.utils import get_psalms
 
 
@@ -231,19 +231,8 @@ class EPOpeningSentence(OfficeSection):
 class EPPsalms(OfficeSection):
     @cached_property
     def data(self):
-        psalms_60 = self.office_readings.ep_psalms.split("or")
-        if len(psalms_60) > 1:
-            if (self.date.date.year % 2) == 0:
-                psalms_60 = psalms_60[0]
-            else:
-                psalms_60 = psalms_60[1]
-        else:
-            psalms_60 = psalms_60[0]
-
-        citations_60 = psalms_60.split(",")
-
-        psalms_30 = self.thirty_day_psalter_day.ep_psalms
-        citations_30 = psalms_30.split(",")
+        psalms_60 = self.office_readings.ep_psalm_citation.for_year(self.date.date.year)
+        psalms_30 = self.thirty_day_psalter_day.ep_psalm_citation.for_year(self.date.date.year)
 
         mass_psalm = ""
         mass_heading = ""
@@ -256,9 +245,9 @@ class EPPsalms(OfficeSection):
                 break
 
         return {
-            "heading_60": "The Psalm{} Appointed".format("s" if len(citations_60) > 1 else ""),
+            "heading_60": "The Psalm{} Appointed".format("s" if len(psalms_60) > 1 else ""),
             "psalms_60": get_psalms(psalms_60),
-            "heading_30": "The Psalm{} Appointed".format("s" if len(citations_30) > 1 else ""),
+            "heading_30": "The Psalm{} Appointed".format("s" if len(psalms_30) > 1 else ""),
             "psalms_30": get_psalms(psalms_30),
             "psalms_mass": mass_psalm,
             "heading_mass": mass_heading,
@@ -276,7 +265,7 @@ class EPReading1(OfficeSection):
     def data(self):
         return {
             "heading": "The First Lesson",
-            "intro": passage_to_citation(self.office_readings.ep_reading_1),
+            "intro": reading_intro(self.office_readings.ep_reading_1_intro, self.office_readings.ep_reading_1),
             "passage": self.office_readings.ep_reading_1.replace("Solomon", "Songs"),
             "reading": self.office_readings.ep_reading_1_text,
             "abbreviated_passage": self.office_readings.ep_reading_1_abbreviated
@@ -285,10 +274,11 @@ class EPReading1(OfficeSection):
             "abbreviated_reading": self.office_readings.ep_reading_1_abbreviated_text
             if self.office_readings.ep_reading_1_abbreviated_text
             else self.office_readings.ep_reading_1_text,
-            "abbreviated_intro": passage_to_citation(
+            "abbreviated_intro": reading_intro(
+                self.office_readings.ep_reading_1_abbreviated_intro,
                 self.office_readings.ep_reading_1_abbreviated
                 if self.office_readings.ep_reading_1_abbreviated
-                else self.office_readings.ep_reading_1
+                else self.office_readings.ep_reading_1,
             ),
             "has_abbreviated": True if self.office_readings.ep_reading_1_abbreviated_text else False,
             "closing": {
@@ -390,10 +380,12 @@ class EPReading2(OfficeSection):
     def data(self):
         return {
             "heading": "The Second Lesson",
-            "intro": passage_to_citation(self.office_readings.ep_reading_2),
+            "intro": reading_intro(self.office_readings.ep_reading_2_intro, self.office_readings.ep_reading_2),
             "passage": self.office_readings.ep_reading_2,
             "reading": self.office_readings.ep_reading_2_text,
-            "abbreviated_intro": passage_to_citation(self.office_readings.ep_reading_2),
+            "abbreviated_intro": reading_intro(
+                self.office_readings.ep_reading_2_intro, self.office_readings.ep_reading_2
+            ),
             "abbreviated_passage": self.office_readings.ep_reading_2,
             "abbreviated_reading": self.office_readings.ep_reading_2_text,
             "has_abbreviated": False,
@@ -425,13 +417,14 @@ class EPMassReading1(OfficeSection):
             if reading.reading_number == number:
                 return {
                     "heading": "The First Lesson",
-                    "intro": passage_to_citation(reading.long_citation),
+                    "intro": reading_intro(reading.long_intro, reading.long_citation),
                     "passage": reading.long_citation,
                     "reading": reading.long_text,
                     "abbreviated_passage": reading.short_citation if reading.short_citation else reading.long_citation,
                     "abbreviated_reading": reading.short_text if reading.short_text else reading.long_text,
-                    "abbreviated_intro": passage_to_citation(
-                        reading.short_citation if reading.short_citation else reading.long_citation
+                    "abbreviated_intro": reading_intro(
+                        reading.short_intro,
+                        reading.short_citation if reading.short_citation else reading.long_citation,
                     ),
                     "has_abbreviated": True if reading.short_citation else False,
                     "closing": {
@@ -455,13 +448,14 @@ class EPMassReading2(OfficeSection):
             if reading.reading_number == number:
                 return {
                     "heading": "The Second Lesson",
-                    "intro": passage_to_citation(reading.long_citation),
+                    "intro": reading_intro(reading.long_intro, reading.long_citation),
                     "passage": reading.long_citation,
                     "reading": reading.long_text,
                     "abbreviated_passage": reading.short_citation if reading.short_citation else reading.long_citation,
                     "abbreviated_reading": reading.short_text if reading.short_text else reading.long_text,
-                    "abbreviated_intro": passage_to_citation(
-                        reading.short_citation if reading.short_citation else reading.long_citation
+                    "abbreviated_intro": reading_intro(
+                        reading.short_intro,
+                        reading.short_citation if reading.short_citation else reading.long_citation,
                     ),
                     "has_abbreviated": True if reading.short_citation else False,
                     "closing": {
@@ -485,13 +479,14 @@ class EPMassReading3(OfficeSection):
             if reading.reading_number == number:
                 return {
                     "heading": "The Third Lesson",
-                    "intro": passage_to_citation(reading.long_citation),
+                    "intro": reading_intro(reading.long_intro, reading.long_citation),
                     "passage": reading.long_citation,
                     "reading": reading.long_text,
                     "abbreviated_passage": reading.short_citation if reading.short_citation else reading.long_citation,
                     "abbreviated_reading": reading.short_text if reading.short_text else reading.long_text,
-                    "abbreviated_intro": passage_to_citation(
-                        reading.short_citation if reading.short_citation else reading.long_citation
+                    "abbreviated_intro": reading_intro(
+                        reading.short_intro,
+                        reading.short_citation if reading.short_citation else reading.long_citation,
                     ),
                     "has_abbreviated": True if reading.short_citation else False,
                     "closing": {
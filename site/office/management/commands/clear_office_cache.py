@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from office.caching import clear_office_bodies
+
+
+class Command(BaseCommand):
+
+    help = "Discards every cached office body so that offices are rendered again on their next request"
+
+    def handle(self, *args, **options):
+
+        generation = clear_office_bodies()
+        print("Office bodies now at generation {}".format(generation))
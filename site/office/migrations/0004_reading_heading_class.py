@@ -0,0 +1,35 @@
+from django.db import migrations
+from django.db.models import F, Value
+from django.db.models.functions import Replace
+
+TEXT_FIELDS = (
+    "holy_day_name",
+    "mp_psalms",
+    "mp_reading_1",
+    "mp_reading_1_text",
+    "mp_reading_1_abbreviated",
+    "mp_reading_1_abbreviated_text",
+    "mp_reading_2",
+    "mp_reading_2_text",
+    "ep_psalms",
+    "ep_reading_1",
+    "ep_reading_1_text",
+    "ep_reading_1_abbreviated",
+    "ep_reading_1_abbreviated_text",
+    "ep_reading_2",
+    "ep_reading_2_text",
+)
+
+
+def add_reading_heading_class(apps, schema_editor):
+    OfficeDay = apps.get_model("office", "OfficeDay")
+    OfficeDay.objects.update(
+        **{field: Replace(F(field), Value("<h3>"), Value("<h3 class='reading-heading off'>")) for field in TEXT_FIELDS}
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("office", "0003_aboutitem")]
+
+    operations = [migrations.RunPython(add_reading_heading_class, migrations.RunPython.noop)]
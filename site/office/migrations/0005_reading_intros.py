@@ -0,0 +1,66 @@
+from django.db import migrations, models
+
+from churchcal.migrations._intros_0005 import passage_intro
+
+
+def set_intros(apps, schema_editor):
+    OfficeDay = apps.get_model("office", "OfficeDay")
+    days = list(OfficeDay.objects.all())
+    for day in days:
+        day.mp_reading_1_intro = passage_intro(day.mp_reading_1)
+        day.mp_reading_1_abbreviated_intro = passage_intro(day.mp_reading_1_abbreviated or day.mp_reading_1)
+        day.mp_reading_2_intro = passage_intro(day.mp_reading_2)
+        day.ep_reading_1_intro = passage_intro(day.ep_reading_1)
+        day.ep_reading_1_abbreviated_intro = passage_intro(day.ep_reading_1_abbreviated or day.ep_reading_1)
+        day.ep_reading_2_intro = passage_intro(day.ep_reading_2)
+    OfficeDay.objects.bulk_update(
+        days,
+        [
+            "mp_reading_1_intro",
+            "mp_reading_1_abbreviated_intro",
+            "mp_reading_2_intro",
+            "ep_reading_1_intro",
+            "ep_reading_1_abbreviated_intro",
+            "ep_reading_2_intro",
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("office", "0004_reading_heading_class")]
+
+    operations = [
+        migrations.AddField(
+            model_name="officeday",
+            name="mp_reading_1_intro",
+            field=models.CharField(blank=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name="officeday",
+            name="mp_reading_1_abbreviated_intro",
+            field=models.CharField(blank=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name="officeday",
+            name="mp_reading_2_intro",
+            field=models.CharField(blank=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name="officeday",
+            name="ep_reading_1_intro",
+            field=models.CharField(blank=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name="officeday",
+            name="ep_reading_1_abbreviated_intro",
+            field=models.CharField(blank=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name="officeday",
+            name="ep_reading_2_intro",
+            field=models.CharField(blank=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.RunPython(set_intros, migrations.RunPython.noop),
+    ]
@@ -2,9 +2,20 @@ import re
 
 from ckeditor.fields import RichTextField
 from django.db import models
+from django.utils.functional import cached_property
 
 from churchcal.base_models import BaseModel
 from churchcal.models import Commemoration
+from churchcal.utils import passage_intro
+from psalter.citations import parse_psalm_citation
+
+READING_HEADING = "<h3 class='reading-heading off'>"
+
+
+def add_reading_heading_class(text):
+    """Marks the headings in a reading's text so they can be toggled; applied when an office day is saved"""
+
+    return text.replace("<h3>", READING_HEADING)
 
 
 class OfficeDay(BaseModel):
@@ -31,12 +42,37 @@ class OfficeDay(BaseModel):
     ep_reading_2_testament = models.CharField(max_length=2, choices=TESTAMENTS)
     ep_reading_2_text = models.TextField(blank=True, null=True)
 
-    def __getattribute__(self, attrname):
-        value = super().__getattribute__(attrname)
-        try:
-            return value.replace("<h3>", "<h3 class='reading-heading off'>")
-        except (AttributeError, TypeError):
-            return value
+    # the introductions read before each lesson, set from the passages on save
+    mp_reading_1_intro = models.CharField(max_length=255, null=True, blank=True, editable=False)
+    mp_reading_1_abbreviated_intro = models.CharField(max_length=255, null=True, blank=True, editable=False)
+    mp_reading_2_intro = models.CharField(max_length=255, null=True, blank=True, editable=False)
+    ep_reading_1_intro = models.CharField(max_length=255, null=True, blank=True, editable=False)
+    ep_reading_1_abbreviated_intro = models.CharField(max_length=255, null=True, blank=True, editable=False)
+    ep_reading_2_intro = models.CharField(max_length=255, null=True, blank=True, editable=False)
+
+    @cached_property
+    def mp_psalm_citation(self):
+        return parse_psalm_citation(self.mp_psalms)
+
+    @cached_property
+    def ep_psalm_citation(self):
+        return parse_psalm_citation(self.ep_psalms)
+
+    def set_intros(self):
+        self.mp_reading_1_intro = passage_intro(self.mp_reading_1)
+        self.mp_reading_1_abbreviated_intro = passage_intro(self.mp_reading_1_abbreviated or self.mp_reading_1)
+        self.mp_reading_2_intro = passage_intro(self.mp_reading_2)
+        self.ep_reading_1_intro = passage_intro(self.ep_reading_1)
+        self.ep_reading_1_abbreviated_intro = passage_intro(self.ep_reading_1_abbreviated or self.ep_reading_1)
+        self.ep_reading_2_intro = passage_intro(self.ep_reading_2)
+
+    def save(self, *args, **kwargs):
+        for field in self._meta.concrete_fields:
+            value = getattr(self, field.attname)
+            if isinstance(value, str):
+                setattr(self, field.attname, add_reading_heading_class(value))
+        self.set_intros()
+        return super().save(*args, **kwargs)
 
 
 class StandardOfficeDay(OfficeDay):
@@ -55,6 +91,14 @@ class ThirtyDayPsalterDay(BaseModel):
     mp_psalms = models.CharField(max_length=255)
     ep_psalms = models.CharField(max_length=255)
 
+    @cached_property
+    def mp_psalm_citation(self):
+        return parse_psalm_citation(self.mp_psalms)
+
+    @cached_property
+    def ep_psalm_citation(self):
+        return parse_psalm_citation(self.ep_psalms)
+
     def psalm_string_to_list(self, psalms):
         return psalms.split(psalms)
 
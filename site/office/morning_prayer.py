@@ -20,7 +20,7 @@ from office.offices import (
     GreatLitany,
     PandemicPrayers,
 )
-from office.utils import passage_to_citation
+from churchcal.utils import reading_intro
 from psalter.utils import get_psalms
 
 
@@ -320,18 +320,18 @@ class MPInvitatory(OfficeSection):
         if self.date.date.timetuple().tm_yday % 2 == 0:
             thirty_day = self.jubilate
             sixty_day = self.jubilate
-            if "100" in self.office_readings.mp_psalms.split(","):
+            if 100 in self.office_readings.mp_psalm_citation:
                 sixty_day = self.venite
 
-            if "100" in self.thirty_day_psalter_day.mp_psalms.split(","):
+            if 100 in self.thirty_day_psalter_day.mp_psalm_citation:
                 thirty_day = self.venite
         else:
             thirty_day = self.venite
             sixty_day = self.venite
-            if "95" in self.office_readings.mp_psalms.split(","):
+            if 95 in self.office_readings.mp_psalm_citation:
                 sixty_day = self.jubilate
 
-            if "95" in self.thirty_day_psalter_day.mp_psalms.split(","):
+            if 95 in self.thirty_day_psalter_day.mp_psalm_citation:
                 thirty_day = self.jubilate
 
         return (thirty_day, sixty_day)
@@ -343,10 +343,10 @@ class MPInvitatory(OfficeSection):
         thirty_day = self.venite
         sixty_day = self.venite
 
-        if "95" in self.office_readings.mp_psalms.split(","):
+        if 95 in self.office_readings.mp_psalm_citation:
             sixty_day = self.jubilate
 
-        if "95" in self.thirty_day_psalter_day.mp_psalms.split(","):
+        if 95 in self.thirty_day_psalter_day.mp_psalm_citation:
             thirty_day = self.jubilate
 
         return (thirty_day, sixty_day)
@@ -366,19 +366,19 @@ class MPInvitatory(OfficeSection):
             thirty_day = self.jubilate
             sixty_day = self.jubilate
 
-            if "100" in self.office_readings.mp_psalms.split(","):
+            if 100 in self.office_readings.mp_psalm_citation:
                 sixty_day = self.venite
-            if "100" in self.thirty_day_psalter_day.mp_psalms.split(","):
+            if 100 in self.thirty_day_psalter_day.mp_psalm_citation:
                 thirty_day = self.venite
             return (thirty_day, sixty_day)
 
         thirty_day = self.venite
         sixty_day = self.venite
 
-        if "95" in self.office_readings.mp_psalms.split(","):
+        if 95 in self.office_readings.mp_psalm_citation:
             sixty_day = self.jubilate
 
-        if "95" in self.thirty_day_psalter_day.mp_psalms.split(","):
+        if 95 in self.thirty_day_psalter_day.mp_psalm_citation:
             thirty_day = self.jubilate
 
         return (thirty_day, sixty_day)
@@ -391,9 +391,9 @@ class MPInvitatory(OfficeSection):
         thirty_day = self.jubilate
         sixty_day = self.jubilate
 
-        if "100" in self.office_readings.mp_psalms.split(","):
+        if 100 in self.office_readings.mp_psalm_citation:
             sixty_day = self.venite
-        if "100" in self.thirty_day_psalter_day.mp_psalms.split(","):
+        if 100 in self.thirty_day_psalter_day.mp_psalm_citation:
             thirty_day = self.venite
         return (thirty_day, sixty_day)
 
@@ -446,19 +446,8 @@ class MPInvitatory(OfficeSection):
 class MPPsalms(OfficeSection):
     @cached_property
     def data(self):
-        psalms_60 = self.office_readings.mp_psalms.split("or")
-        if len(psalms_60) > 1:
-            if (self.date.date.year % 2) == 0:
-                psalms_60 = psalms_60[0]
-            else:
-                psalms_60 = psalms_60[1]
-        else:
-            psalms_60 = psalms_60[0]
-
-        citations_60 = psalms_60.split(",")
-
-        psalms_30 = self.thirty_day_psalter_day.mp_psalms
-        citations_30 = psalms_30.split(",")
+        psalms_60 = self.office_readings.mp_psalm_citation.for_year(self.date.date.year)
+        psalms_30 = self.thirty_day_psalter_day.mp_psalm_citation.for_year(self.date.date.year)
 
         mass_psalm = ""
         mass_heading = ""
@@ -469,9 +458,9 @@ class MPPsalms(OfficeSection):
                 break
 
         return {
-            "heading_60": "The Psalm{} Appointed".format("s" if len(citations_60) > 1 else ""),
+            "heading_60": "The Psalm{} Appointed".format("s" if len(psalms_60) > 1 else ""),
             "psalms_60": get_psalms(psalms_60),
-            "heading_30": "The Psalm{} Appointed".format("s" if len(citations_30) > 1 else ""),
+            "heading_30": "The Psalm{} Appointed".format("s" if len(psalms_30) > 1 else ""),
             "psalms_30": get_psalms(psalms_30),
             "psalms_mass": mass_psalm,
             "heading_mass": mass_heading,
@@ -489,7 +478,7 @@ class MPReading1(OfficeSection):
     def data(self):
         return {
             "heading": "The First Lesson",
-            "intro": passage_to_citation(self.office_readings.mp_reading_1),
+            "intro": reading_intro(self.office_readings.mp_reading_1_intro, self.office_readings.mp_reading_1),
             "passage": self.office_readings.mp_reading_1,
             "reading": self.office_readings.mp_reading_1_text,
             "abbreviated_passage": self.office_readings.mp_reading_1_abbreviated
@@ -498,10 +487,11 @@ class MPReading1(OfficeSection):
             "abbreviated_reading": self.office_readings.mp_reading_1_abbreviated_text
             if self.office_readings.mp_reading_1_abbreviated_text
             else self.office_readings.mp_reading_1_text,
-            "abbreviated_intro": passage_to_citation(
+            "abbreviated_intro": reading_intro(
+                self.office_readings.mp_reading_1_abbreviated_intro,
                 self.office_readings.mp_reading_1_abbreviated
                 if self.office_readings.mp_reading_1_abbreviated
-                else self.office_readings.mp_reading_1
+                else self.office_readings.mp_reading_1,
             ),
             "has_abbreviated": True if self.office_readings.mp_reading_1_abbreviated_text else False,
             "closing": {
@@ -524,13 +514,14 @@ class MPMassReading1(OfficeSection):
             if reading.reading_number == 1:
                 return {
                     "heading": "The First Lesson",
-                    "intro": passage_to_citation(reading.long_citation),
+                    "intro": reading_intro(reading.long_intro, reading.long_citation),
                     "passage": reading.long_citation,
                     "reading": reading.long_text,
                     "abbreviated_passage": reading.short_citation if reading.short_citation else reading.long_citation,
                     "abbreviated_reading": reading.short_text if reading.short_text else reading.long_text,
-                    "abbreviated_intro": passage_to_citation(
-                        reading.short_citation if reading.short_citation else reading.long_citation
+                    "abbreviated_intro": reading_intro(
+                        reading.short_intro,
+                        reading.short_citation if reading.short_citation else reading.long_citation,
                     ),
                     "has_abbreviated": True if reading.short_citation else False,
                     "closing": {
@@ -554,13 +545,14 @@ class MPMassReading2(OfficeSection):
             if reading.reading_number == reading_number:
                 return {
                     "heading": "The Second Lesson",
-                    "intro": passage_to_citation(reading.long_citation),
+                    "intro": reading_intro(reading.long_intro, reading.long_citation),
                     "passage": reading.long_citation,
                     "reading": reading.long_text,
                     "abbreviated_passage": reading.short_citation if reading.short_citation else reading.long_citation,
                     "abbreviated_reading": reading.short_text if reading.short_text else reading.long_text,
-                    "abbreviated_intro": passage_to_citation(
-                        reading.short_citation if reading.short_citation else reading.long_citation
+                    "abbreviated_intro": reading_intro(
+                        reading.short_intro,
+                        reading.short_citation if reading.short_citation else reading.long_citation,
                     ),
                     "has_abbreviated": True if reading.short_citation else False,
                     "closing": {
@@ -583,13 +575,14 @@ class MPMassReading3(OfficeSection):
             if reading.reading_number == 4:
                 return {
                     "heading": "The Third Lesson",
-                    "intro": passage_to_citation(reading.long_citation),
+                    "intro": reading_intro(reading.long_intro, reading.long_citation),
                     "passage": reading.long_citation,
                     "reading": reading.long_text,
                     "abbreviated_passage": reading.short_citation if reading.short_citation else reading.long_citation,
                     "abbreviated_reading": reading.short_text if reading.short_text else reading.long_text,
-                    "abbreviated_intro": passage_to_citation(
-                        reading.short_citation if reading.short_citation else reading.long_citation
+                    "abbreviated_intro": reading_intro(
+                        reading.short_intro,
+                        reading.short_citation if reading.short_citation else reading.long_citation,
                     ),
                     "has_abbreviated": True if reading.short_citation else False,
                     "closing": {
@@ -632,10 +625,12 @@ class MPReading2(OfficeSection):
     def data(self):
         return {
             "heading": "The Second Lesson",
-            "intro": passage_to_citation(self.office_readings.mp_reading_2),
+            "intro": reading_intro(self.office_readings.mp_reading_2_intro, self.office_readings.mp_reading_2),
             "passage": self.office_readings.mp_reading_2,
             "reading": self.office_readings.mp_reading_2_text,
-            "abbreviated_intro": passage_to_citation(self.office_readings.mp_reading_2),
+            "abbreviated_intro": reading_intro(
+                self.office_readings.mp_reading_2_intro, self.office_readings.mp_reading_2
+            ),
             "abbreviated_passage": self.office_readings.mp_reading_2,
             "abbreviated_reading": self.office_readings.mp_reading_2_text,
             "has_abbreviated": False,
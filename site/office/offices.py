@@ -1,10 +1,13 @@
 import datetime
 
+from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils.functional import cached_property
 from django.utils.safestring import mark_safe
 
+from office.caching import get_office_body
 from office.models import HolyDayOfficeDay, StandardOfficeDay, ThirtyDayPsalterDay
+from website.profiling import timed
 
 
 class Office(object):
@@ -15,17 +18,23 @@ class Office(object):
     def get_formatted_date_string(self):
         return "{dt:%A} {dt:%B} {dt.day}, {dt.year}".format(dt=self.date.date)
 
-    def __init__(self, date):
+    def __init__(self, date, office_days=None):
         from churchcal.calculations import get_calendar_date
 
         self.date = get_calendar_date(date)
 
-        try:
-            self.office_readings = HolyDayOfficeDay.objects.get(commemoration=self.date.primary)
-        except HolyDayOfficeDay.DoesNotExist:
-            self.office_readings = StandardOfficeDay.objects.get(month=self.date.date.month, day=self.date.date.day)
+        if office_days:
+            self.office_readings = office_days.office_readings(self.date)
+            self.thirty_day_psalter_day = office_days.thirty_day_psalter_day(self.date)
+        else:
+            try:
+                self.office_readings = HolyDayOfficeDay.objects.get(commemoration_id=self.date.primary.pk)
+            except HolyDayOfficeDay.DoesNotExist:
+                self.office_readings = StandardOfficeDay.objects.get(
+                    month=self.date.date.month, day=self.date.date.day
+                )
 
-        self.thirty_day_psalter_day = ThirtyDayPsalterDay.objects.get(day=self.date.date.day)
+            self.thirty_day_psalter_day = ThirtyDayPsalterDay.objects.get(day=self.date.date.day)
 
         primary_feast_name = (
             self.date.primary_evening.name
@@ -36,6 +45,23 @@ class Office(object):
             self.name, self.get_formatted_date_string(), primary_feast_name
         )
 
+    @cached_property
+    def body(self):
+        """The rendered modules of the office, cached for the office, date and version of the data behind them"""
+
+        with timed("body", self.office):
+            body = get_office_body(self.office, self.date.date, self.render_body)
+        return mark_safe(body)
+
+    def render_body(self):
+        parts = []
+        for section, template in self.modules:
+            with timed("data", section.__class__.__name__):
+                data = section.data
+            with timed("include", template):
+                parts.append(render_to_string(template, {"data": data}))
+        return "".join(parts)
+
     @cached_property
     def links(self):
 
@@ -86,6 +112,24 @@ class Office(object):
         }
 
 
+class OfficeDayIndex(object):
+    """Every office day and 30 day psalter day loaded at once, for building many offices without a query per date"""
+
+    def __init__(self):
+        self.holy_days = {day.commemoration_id: day for day in HolyDayOfficeDay.objects.all()}
+        self.standard_days = {(day.month, day.day): day for day in StandardOfficeDay.objects.all()}
+        self.thirty_days = {day.day: day for day in ThirtyDayPsalterDay.objects.all()}
+
+    def office_readings(self, calendar_date):
+        office_readings = self.holy_days.get(calendar_date.primary.pk)
+        if office_readings is None:
+            office_readings = self.standard_days.get((calendar_date.date.month, calendar_date.date.day))
+        return office_readings
+
+    def thirty_day_psalter_day(self, calendar_date):
+        return self.thirty_days.get(calendar_date.date.day)
+
+
 class OfficeSection(object):
     def __init__(self, date, office_readings=None, thirty_day_psalter_day=None, office=None):
         self.date = date
@@ -1,3 +1,27 @@
-from django.test import TestCase
+from datetime import date
+from unittest import mock
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+
+from office.caching import get_office_body
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class OfficeBodyCacheTestCase(TestCase):
+    def test_a_new_source_version_misses_the_cache(self):
+        renders = []
+
+        def render():
+            renders.append(len(renders) + 1)
+            return "body {}".format(renders[-1])
+
+        day = date(2020, 1, 1)
+        with mock.patch("office.caching.source_version", return_value="before"):
+            self.assertEqual(get_office_body("morning_prayer", day, render), "body 1")
+            self.assertEqual(get_office_body("morning_prayer", day, render), "body 1")
+
+        # a deploy that changes the code or templates renders the body again
+        with mock.patch("office.caching.source_version", return_value="after"):
+            self.assertEqual(get_office_body("morning_prayer", day, render), "body 2")
+
+        self.assertEqual(renders, [1, 2])
@@ -1,5 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_save, post_delete
 
 
 class PsalterConfig(AppConfig):
     name = "psalter"
+
+    def ready(self):
+        from psalter.models import Psalm, PsalmVerse
+        from psalter.utils import clear_psalter_store
+
+        for model in (Psalm, PsalmVerse):
+            post_save.connect(clear_psalter_store, sender=model, dispatch_uid="psalter_store_save")
+            post_delete.connect(clear_psalter_store, sender=model, dispatch_uid="psalter_store_delete")
@@ -0,0 +1,89 @@
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+PsalmRange = namedtuple("PsalmRange", ["citation", "psalm", "start", "end"])
+PsalmRange.__doc__ = "One psalm, or a range of its verses when start and end are set"
+
+
+def parse_psalm_ranges(citations):
+    """Parses e.g. "4,31:1-6,91,138:1-10,12-14" into a tuple of PsalmRanges
+
+    A bare verse range following a psalm with verses (the 12-14 above) continues that psalm.
+    """
+
+    ranges = []
+    psalm = None
+    for citation in citations.replace(" ", "").split(","):
+        if not citation:
+            continue
+
+        if ":" in citation:
+            psalm, verses = citation.split(":")
+        elif "-" in citation and psalm:
+            verses = citation
+            citation = "{}:{}".format(psalm, verses)
+        else:
+            psalm, verses = citation, None
+
+        if verses:
+            start, _, end = verses.partition("-")
+            ranges.append(PsalmRange(citation, int(psalm), int(start), int(end or start)))
+        else:
+            ranges.append(PsalmRange(citation, int(psalm), None, None))
+            psalm = None
+
+    return tuple(ranges)
+
+
+class PsalmCitation(object):
+    """A psalter appointment such as "4,31:1-6,91" or "102 or 107:1-32", parsed once
+
+    alternatives holds a tuple of PsalmRanges for each side of an "or". The import commands strip spaces, so the
+    stored form of the second example is "102or107:1-32".
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.alternatives = tuple(
+            parse_psalm_ranges(alternative) for alternative in re.split(r"\s*or\s*", text) if alternative.strip()
+        )
+
+    def __contains__(self, psalm):
+        """Whether the whole of the given psalm is appointed in any alternative
+
+        Psalms are compared as numbers, so 95 is not in "95:1-7" and 10 is not in "100". Both sides of an "or" are
+        checked, whichever one is read in a given year.
+        """
+
+        return any(
+            psalm_range.psalm == psalm and psalm_range.start is None
+            for alternative in self.alternatives
+            for psalm_range in alternative
+        )
+
+    def mentions(self, psalm):
+        """Whether any verses of the given psalm are appointed in any alternative
+
+        67 is mentioned by "67:1-5" but not by "167".
+        """
+
+        return any(psalm_range.psalm == psalm for alternative in self.alternatives for psalm_range in alternative)
+
+    def for_year(self, year):
+        """The alternative used in a given civil year: the first in even years and the second in odd years"""
+
+        if len(self.alternatives) > 1:
+            return self.alternatives[year % 2]
+        return self.alternatives[0] if self.alternatives else ()
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return "PsalmCitation({!r})".format(self.text)
+
+
+@lru_cache(maxsize=1024)
+def parse_psalm_citation(text):
+    return PsalmCitation(text)
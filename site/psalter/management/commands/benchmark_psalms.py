@@ -0,0 +1,51 @@
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from office.models import OfficeDay, ThirtyDayPsalterDay
+from psalter.citations import parse_psalm_citation
+from psalter.utils import get_psalms, psalm_html, psalter_store
+
+
+class Command(BaseCommand):
+
+    help = "Times rendering every 60-day and 30-day psalter appointment with and without the rendered fragment cache"
+
+    def add_arguments(self, parser):
+
+        parser.add_argument("--repeat", dest="repeat", type=int, default=5, help="Passes over all appointments")
+
+    def handle(self, *args, **options):
+
+        appointments = []
+        for day in OfficeDay.objects.all():
+            for psalms in (day.mp_psalms, day.ep_psalms):
+                appointments.extend(parse_psalm_citation(psalms).alternatives)
+        for day in ThirtyDayPsalterDay.objects.all():
+            for psalms in (day.mp_psalms, day.ep_psalms):
+                appointments.extend(parse_psalm_citation(psalms).alternatives)
+
+        psalter_store.clear()
+        psalter_store.load()
+
+        def render():
+            for appointment in appointments:
+                "".join(
+                    psalm_html(citation, psalter_store.get_verses(psalm, start, end))
+                    for citation, psalm, start, end in appointment
+                )
+
+        def render_cached():
+            for appointment in appointments:
+                get_psalms(appointment)
+
+        render_cached()
+
+        print("{} appointments".format(len(appointments)))
+        for name, function in (("rendered each time", render), ("fragment cache", render_cached)):
+            timings = timeit.repeat(function, number=1, repeat=options["repeat"])
+            print(
+                "{}: best {:.1f} ms, mean {:.1f} ms".format(
+                    name, min(timings) * 1000, sum(timings) / len(timings) * 1000
+                )
+            )
@@ -1,3 +1,137 @@
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase, override_settings
 
-# Create your tests here.
+from churchcal.caching import church_year_cache
+from churchcal.tests import CalendarTestCase
+from office.models import StandardOfficeDay, ThirtyDayPsalterDay
+from office.morning_prayer import MorningPrayer
+from office.offices import OfficeDayIndex
+from psalter.citations import PsalmRange, parse_psalm_citation
+from psalter.models import Psalm, PsalmVerse
+from psalter.utils import PsalterStore, bump_psalter_generation, get_psalms, psalter_store
+
+
+def add_psalms(*numbers):
+    for number in numbers:
+        psalm = Psalm.objects.create(number=number, latin_title="Psalm {}".format(number))
+        for verse in range(1, 16):
+            PsalmVerse.objects.create(
+                psalm=psalm,
+                number=verse,
+                first_half="{}:{} first".format(number, verse),
+                second_half="{}:{} second".format(number, verse),
+            )
+
+
+class PsalmCitationTestCase(SimpleTestCase):
+    def test_contains_matches_whole_psalms(self):
+        self.assertIn(95, parse_psalm_citation("95"))
+        self.assertIn(95, parse_psalm_citation("95, 96"))
+        self.assertIn(95, parse_psalm_citation("94,95"))
+        self.assertNotIn(95, parse_psalm_citation("95:1-7"))
+        self.assertNotIn(10, parse_psalm_citation("100"))
+        self.assertNotIn(16, parse_psalm_citation("167"))
+
+        # either side of an "or", with or without the spaces the import commands strip
+        self.assertIn(98, parse_psalm_citation("67 or 98"))
+        self.assertIn(98, parse_psalm_citation("67or98"))
+
+    def test_mentions_matches_any_verses(self):
+        self.assertTrue(parse_psalm_citation("67 or 98").mentions(67))
+        self.assertTrue(parse_psalm_citation("66,67:1-5").mentions(67))
+        self.assertTrue(parse_psalm_citation("95:1-7").mentions(95))
+        self.assertFalse(parse_psalm_citation("167").mentions(67))
+        self.assertFalse(parse_psalm_citation("100").mentions(10))
+        self.assertFalse(parse_psalm_citation("119:65-72").mentions(67))
+
+    def test_for_year(self):
+        self.assertEqual(parse_psalm_citation("95").for_year(2020), (PsalmRange("95", 95, None, None),))
+        self.assertEqual(parse_psalm_citation("95").for_year(2021), (PsalmRange("95", 95, None, None),))
+        self.assertEqual(
+            parse_psalm_citation("95, 96").for_year(2021),
+            (PsalmRange("95", 95, None, None), PsalmRange("96", 96, None, None)),
+        )
+        self.assertEqual(parse_psalm_citation("95:1-7").for_year(2021), (PsalmRange("95:1-7", 95, 1, 7),))
+
+        # the first alternative in even years, the second in odd years
+        self.assertEqual(parse_psalm_citation("67 or 98").for_year(2020), (PsalmRange("67", 67, None, None),))
+        self.assertEqual(parse_psalm_citation("67 or 98").for_year(2021), (PsalmRange("98", 98, None, None),))
+        self.assertEqual(parse_psalm_citation("102or107:1-32").for_year(2021), (PsalmRange("107:1-32", 107, 1, 32),))
+        self.assertEqual(parse_psalm_citation("").for_year(2021), ())
+
+
+class GetPsalmsTestCase(TestCase):
+    def setUp(self):
+        add_psalms(4, 31, 138)
+        psalter_store.clear()
+
+    def test_loaded_store_serves_citations_without_queries(self):
+        psalter_store.load()
+        with self.assertNumQueries(0):
+            html = get_psalms("4,31:1-6,138:1-10,12-14")
+
+        self.assertIn("4:15 first", html)
+        self.assertIn("31:6 first", html)
+        self.assertNotIn("31:7 first", html)
+        self.assertIn("138:12 first", html)
+        self.assertNotIn("138:11 first", html)
+
+    def test_saving_a_verse_clears_the_store(self):
+        psalter_store.load()
+        verse = PsalmVerse.objects.get(psalm__number=4, number=1)
+        verse.first_half = "Changed"
+        verse.save()
+
+        self.assertFalse(psalter_store.loaded)
+        self.assertIn("Changed", get_psalms("4:1-2"))
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_a_change_saved_in_another_process_clears_the_store(self):
+        store = PsalterStore(generation_ttl=0)
+        store.load()
+        self.assertIn("4:1 first", store.get_html("4:1-2", 4, 1, 2))
+
+        # another process saves a verse: the shared generation moves on, but this process got no signal
+        PsalmVerse.objects.filter(psalm__number=4, number=1).update(first_half="Changed")
+        bump_psalter_generation()
+
+        self.assertIn("Changed", store.get_html("4:1-2", 4, 1, 2))
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class MorningPrayerQueriesTestCase(CalendarTestCase):
+    def setUp(self):
+        super().setUp()
+        add_psalms(4, 31, 138)
+        StandardOfficeDay.objects.create(
+            month=11,
+            day=4,
+            mp_psalms="4,31:1-6",
+            mp_reading_1="Isaiah 1:1-9",
+            mp_reading_1_testament="OT",
+            mp_reading_1_text="<p>Isaiah 1</p>",
+            mp_reading_2="Matthew 1:1-17",
+            mp_reading_2_testament="NT",
+            mp_reading_2_text="<p>Matthew 1</p>",
+            ep_psalms="138",
+            ep_reading_1="Isaiah 2:1-11",
+            ep_reading_1_testament="OT",
+            ep_reading_2="Romans 1:1-15",
+            ep_reading_2_testament="NT",
+        )
+        ThirtyDayPsalterDay.objects.create(day=4, mp_psalms="138:1-10,12-14", ep_psalms="4")
+        church_year_cache.invalidate()
+        psalter_store.clear()
+
+    def test_a_second_render_makes_no_queries(self):
+        office_days = OfficeDayIndex()
+        first = MorningPrayer("2019-11-04", office_days=office_days).render_body()
+
+        # render_body skips the office body cache, so the psalms come from the psalter store both times
+        with self.assertNumQueries(0):
+            second = MorningPrayer("2019-11-04", office_days=office_days).render_body()
+
+        self.assertEqual(first, second)
+        self.assertIn("31:6 first", second)
+        self.assertNotIn("31:7 first", second)
+        self.assertIn("138:14 first", second)
+        self.assertNotIn("138:11 first", second)
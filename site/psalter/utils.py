@@ -1,65 +1,173 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
 from django.utils.html import format_html
+from django.utils.safestring import mark_safe
 
+from psalter.citations import parse_psalm_ranges
 from psalter.models import PsalmVerse
 
 
 def parse_single_psalm(psalm):
+    # e.g., 138, 138:1-10 or 138:1-10,12-14 (which becomes 138:1-10,138:12-14)
+    return ",".join(psalm_range.citation for psalm_range in parse_psalm_ranges(psalm))
 
-    psalm = psalm.replace(" ", "").split(":")
 
-    # e.g., 138
-    if len(psalm) == 1:
-        return psalm[0]
+GENERATION_KEY = "psalter_generation"
 
-    # e.g., 138:1-10
-    verses = psalm[1].split(",")
-    if len(verses) == 1:
-        return "{}:{}".format(psalm[0], psalm[1])
 
-    # e.g., 138:1-10,12-14
-    citations = []
-    for verse in verses:
-        citations.append("{}:{}".format(psalm[0], verse))
-    return ",".join(citations)
+def psalter_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, 1, timeout=None)
+        generation = cache.get(GENERATION_KEY, 1)
+    return generation
+
+
+def bump_psalter_generation():
+    try:
+        return cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 2, timeout=None)
+        return 2
+
+
+class PsalterStore(object):
+    """Every psalm verse held in memory, indexed by (psalm, verse), so citations are served without queries
+
+    Rendered HTML is kept per citation: whole psalms are rendered when the store loads, verse ranges on first use.
+    The store remembers the psalter generation in the shared cache when it loads and drops itself once that has been
+    bumped, so a change saved in any process reaches every process within generation_ttl seconds.
+    """
+
+    def __init__(self, generation_ttl=None):
+        self.generation_ttl = generation_ttl if generation_ttl is not None else settings.PSALTER_GENERATION_TTL
+
+        self.lock = threading.Lock()
+        self.verses = None
+        self.verse_numbers = None
+        self.fragments = {}
+        self.generation = None
+        self.checked = 0
+
+    @property
+    def loaded(self):
+        return self.verses is not None
+
+    def load(self):
+        # read before the verses, so a change saved while they load is picked up by the next check
+        generation = psalter_generation()
+
+        verses = {}
+        verse_numbers = {}
+        for verse in PsalmVerse.objects.select_related("psalm").order_by("psalm__number", "number").all():
+            verses[(verse.psalm.number, verse.number)] = verse
+            verse_numbers.setdefault(verse.psalm.number, []).append(verse.number)
+
+        # an empty table means the psalms have not been imported yet, so keep asking the database
+        if verses:
+            fragments = {}
+            for psalm, numbers in verse_numbers.items():
+                fragments[str(psalm)] = psalm_html(str(psalm), [verses[(psalm, number)] for number in numbers])
+
+            with self.lock:
+                self.verses = verses
+                self.verse_numbers = verse_numbers
+                self.fragments = fragments
+                self.generation = generation
+                self.checked = time.monotonic()
+        return self.loaded
+
+    def clear(self):
+        with self.lock:
+            self.verses = None
+            self.verse_numbers = None
+            self.fragments = {}
+
+    def check_generation(self):
+        """Clears the store if the psalter generation has moved on since it loaded, asking the shared cache at most
+        once every generation_ttl seconds"""
+
+        if not self.loaded or time.monotonic() - self.checked < self.generation_ttl:
+            return
+
+        generation = psalter_generation()
+        with self.lock:
+            self.checked = time.monotonic()
+            if generation != self.generation:
+                self.verses = None
+                self.verse_numbers = None
+                self.fragments = {}
+
+    def get_verses(self, psalm, start=None, end=None):
+        self.check_generation()
+        if not self.loaded and not self.load():
+            return self.query_verses(psalm, start, end)
+
+        verses = self.verses
+        numbers = self.verse_numbers.get(psalm, [])
+        if start is not None:
+            numbers = [number for number in numbers if start <= number <= end]
+        return [verses[(psalm, number)] for number in numbers]
+
+    def get_html(self, citation, psalm, start=None, end=None):
+        self.check_generation()
+        fragments = self.fragments
+        html = fragments.get(citation)
+        if html is None:
+            html = psalm_html(citation, self.get_verses(psalm, start, end))
+            with self.lock:
+                # only keep it if the store was not cleared or reloaded while it rendered
+                if self.loaded and self.fragments is fragments:
+                    fragments[citation] = html
+        return html
+
+    @staticmethod
+    def query_verses(psalm, start=None, end=None):
+        verses = PsalmVerse.objects.filter(psalm__number=psalm)
+        if start is not None:
+            verses = verses.filter(number__gte=start, number__lte=end)
+        return list(verses.order_by("number").select_related("psalm").all())
+
+
+psalter_store = PsalterStore()
+
+
+def clear_psalter_store(sender, **kwargs):
+    bump_psalter_generation()
+    psalter_store.clear()
 
 
 def get_psalms(citations):
-    citations = citations.replace(" ", "").split(",")
-    html = ""
-    for citation in citations:
-        citation_parts = citation.split(":")
-        if len(citation_parts) > 1:
-            start, end = citation_parts[1].split("-")
-            verses = (
-                PsalmVerse.objects.filter(psalm__number=citation_parts[0], number__gte=start, number__lte=end)
-                .order_by("number")
-                .select_related("psalm")
-                .all()
-            )
-        else:
-            verses = PsalmVerse.objects.filter(psalm__number=citation).order_by("number").select_related("psalm").all()
-        html = html + psalm_html(citation, verses)
-    return html
+    """Renders a citation string, or PsalmRanges already parsed from one"""
+
+    if isinstance(citations, str):
+        citations = parse_psalm_ranges(citations)
+    return mark_safe("".join(psalter_store.get_html(*psalm_range) for psalm_range in citations))
 
 
 def psalm_html(citation, verses, heading=True):
-    html = ""
+    html = []
     if heading:
-        html = format_html("<h3>Psalm {}</h3>", citation)
-        html = html + format_html("<h4>{}</h4>", verses[0].psalm.latin_title)
+        html.append(format_html("<h3>Psalm {}</h3>", citation))
+        html.append(format_html("<h4>{}</h4>", verses[0].psalm.latin_title))
     for verse in verses:
-        html = html + format_html(
-            "<p class='hanging-indent'><sup class='versenum'>{}</sup> {}<span class='asterisk'>*</span> </p>",
-            verse.number,
-            verse.first_half,
+        html.append(
+            format_html(
+                "<p class='hanging-indent'><sup class='versenum'>{}</sup> {}<span class='asterisk'>*</span> </p>",
+                verse.number,
+                verse.first_half,
+            )
         )
-        html = html + format_html("<p class='indent'><strong>{}</strong></p>", verse.second_half)
-    # html = html + format_html("<p  class='hanging-indent'>&nbsp;</p>")
-    # html = html + format_html(
+        html.append(format_html("<p class='indent'><strong>{}</strong></p>", verse.second_half))
+    # html.append(format_html("<p  class='hanging-indent'>&nbsp;</p>"))
+    # html.append(format_html(
     #     "<p class='hanging-indent'><strong>Glory be to the Father, and to the Son, and to the Holy Spirit; *</strong></p>"
-    # )
-    # html = html + format_html(
+    # ))
+    # html.append(format_html(
     #     "<p class='indent'><strong>as it was in the beginning, is now, and ever shall be, world without end. Amen.</strong></p>"
-    # )
+    # ))
 
-    return html
+    return mark_safe("".join(html))
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+from datetime import date, timedelta
+
+from django.apps import apps
+from django.conf import settings
+
+
+# apps whose code and templates shape the exported pages
+EXPORTED_APPS = ("churchcal", "office", "psalter", "website")
+
+# commemoration fields that end up on a page
+COMMEMORATION_FIELDS = (
+    "pk",
+    "original_pk",
+    "name",
+    "color",
+    "additional_color",
+    "alternate_color",
+    "alternate_color_2",
+    "color_notes",
+    "collect",
+    "alternate_collect",
+    "eve_collect",
+    "morning_prayer_collect",
+    "evening_prayer_collect",
+    "saint_name",
+    "saint_type",
+    "saint_gender",
+    "saint_fill_in_the_blank",
+    "link_1",
+    "link_2",
+    "link_3",
+    "transferred",
+)
+
+
+def digest(*parts):
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+
+def content_hash(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+def manifest_path(output_dir):
+    # kept beside the export rather than in it, so that it is not deployed with the site
+    return "{}.manifest.json".format(output_dir.rstrip(os.sep))
+
+
+def load_manifest(output_dir):
+    try:
+        with open(manifest_path(output_dir)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_manifest(output_dir, manifest):
+    path = manifest_path(output_dir)
+    temp_path = "{}.tmp".format(path)
+    with open(temp_path, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def source_fingerprint():
+    """Hashes the code and templates of the exported apps, the site templates and the webpack bundle names"""
+
+    paths = [os.path.join(settings.BASE_DIR, "webpack-stats.json")]
+    for directory in [os.path.join(settings.BASE_DIR, path) for path in settings.TEMPLATES[0]["DIRS"]] + [
+        apps.get_app_config(app).path for app in EXPORTED_APPS
+    ]:
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = sorted(name for name in dirs if name not in ("__pycache__", "migrations"))
+            paths.extend(os.path.join(root, name) for name in sorted(files) if not name.endswith(".pyc"))
+
+    sha = hashlib.sha256()
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                sha.update(path.encode("utf-8"))
+                sha.update(f.read())
+        except FileNotFoundError:
+            continue
+    return sha.hexdigest()
+
+
+def psalter_fingerprint():
+    from psalter.models import PsalmVerse
+
+    verses = PsalmVerse.objects.order_by("psalm__number", "number").values_list(
+        "psalm__number", "psalm__latin_title", "number", "first_half", "second_half"
+    )
+    return digest(*verses)
+
+
+class DateInputs(object):
+    """Digests of everything a dated office page is rendered from: the calendar date, office days and readings
+
+    Office days are loaded once up front so that digesting every date in the export costs no per-date queries.
+    """
+
+    def __init__(self):
+        from office.offices import OfficeDayIndex
+
+        self.office_days = OfficeDayIndex()
+        self.site = digest(source_fingerprint(), psalter_fingerprint())
+        self.digests = {}
+
+    def for_page(self, view_name, param_set):
+        if not isinstance(param_set, dict):
+            return None
+
+        # a month of an office's JSON is rendered from the same inputs as that month's pages
+        if set(param_set.keys()) == {"office", "year", "month"}:
+            day = date(param_set["year"], param_set["month"], 1)
+            digests = []
+            while day.month == param_set["month"]:
+                digests.append(self.date_digest(day.year, day.month, day.day))
+                day += timedelta(days=1)
+            return digest(self.site, view_name, param_set["office"], digests)
+
+        if set(param_set.keys()) != {"year", "month", "day"}:
+            return None
+
+        return digest(self.site, view_name, self.date_digest(param_set["year"], param_set["month"], param_set["day"]))
+
+    def date_digest(self, year, month, day):
+        key = (year, month, day)
+        if key not in self.digests:
+            self.digests[key] = self.for_date("{}-{}-{}".format(*key))
+        return self.digests[key]
+
+    def for_date(self, date_string):
+        from churchcal.calculations import get_calendar_date
+
+        calendar_date = get_calendar_date(date_string)
+        office_day = self.office_days.office_readings(calendar_date)
+        thirty_day = self.office_days.thirty_day_psalter_day(calendar_date)
+
+        commemorations = [
+            tuple(getattr(commemoration, field, None) for field in COMMEMORATION_FIELDS)
+            + (commemoration.rank.name if commemoration.rank else None,)
+            for commemoration in calendar_date.all + calendar_date.all_evening
+        ]
+        readings = [
+            (str(reading.pk), str(reading.updated))
+            for reading in calendar_date.mass_readings + calendar_date.evening_mass_readings
+        ]
+        return digest(
+            calendar_date.date.isoformat(),
+            calendar_date.season.name if calendar_date.season else None,
+            calendar_date.evening_season.name if calendar_date.evening_season else None,
+            calendar_date.fast_day,
+            commemorations,
+            readings,
+            (str(office_day.pk), str(office_day.updated)) if office_day else None,
+            (str(thirty_day.pk), str(thirty_day.updated)) if thirty_day else None,
+        )
@@ -0,0 +1,199 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from shutil import rmtree
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django_distill.distill import urls_to_distill
+from django_distill.renderer import DistillRender, load_urls
+
+from churchcal.calculations import ChurchYear
+from churchcal.snapshots import save_church_year, snapshot_path
+from website.exporting import DateInputs, content_hash, load_manifest, manifest_path, save_manifest
+
+
+def setup_export_worker():
+    import django
+
+    django.setup()
+    settings.ALLOWED_HOSTS = ["*"]
+    load_urls(lambda message: None)
+
+
+def output_path(output_dir, uri, file_name):
+    # the same naming as distill-local: URIs ending with a slash become .../index.html
+    if file_name is None:
+        file_name = uri[1:] if uri.startswith("/") else uri
+        if file_name.endswith("/") or not file_name:
+            file_name = file_name + "index.html"
+    return os.path.join(output_dir, file_name)
+
+
+def write_atomically(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(temp_path, "wb") as f:
+        f.write(content)
+    os.replace(temp_path, path)
+
+
+def normalize_param_set(param_set):
+    if not param_set:
+        return ()
+    if isinstance(param_set, str):
+        return (param_set,)
+    return param_set
+
+
+def render_pages(output_dir, pages):
+    """Renders (url index, parameters, uri, previous content hash) pages into output_dir
+
+    Returns (uri, path, bytes, seconds, content hash, written) for each; files whose content is unchanged are not
+    written again.
+    """
+
+    renderer = DistillRender(output_dir, urls_to_distill)
+    rendered = []
+    for url_index, param_set, uri, previous_hash in pages:
+        distill_func, file_name, view_name, a, k = urls_to_distill[url_index]
+
+        start = time.perf_counter()
+        response = renderer.render_view(uri, param_set, a)
+        content = b"".join(response.streaming_content) if response.streaming else response.content
+        path = output_path(output_dir, uri, file_name)
+        new_hash = content_hash(content)
+        written = new_hash != previous_hash or not os.path.exists(path)
+        if written:
+            write_atomically(path, content)
+        rendered.append((uri, path, len(content), time.perf_counter() - start, new_hash, written))
+    return rendered
+
+
+class Command(BaseCommand):
+
+    help = (
+        "Renders every distill URL to a static copy of the site, spreading the pages across worker processes and "
+        "skipping pages whose inputs have not changed since the last export"
+    )
+
+    def add_arguments(self, parser):
+
+        parser.add_argument("output_dir", nargs="?", type=str, default=settings.DISTILL_DIR)
+        parser.add_argument(
+            "--workers",
+            dest="workers",
+            type=int,
+            default=settings.CHURCH_YEAR_BUILD_WORKERS,
+            help="Processes to render pages in",
+        )
+        parser.add_argument("--chunk", dest="chunk", type=int, default=50, help="Pages handed to a worker at a time")
+        parser.add_argument(
+            "--force", action="store_true", dest="force", help="Remove the output directory and render everything"
+        )
+        parser.add_argument("--slowest", dest="slowest", type=int, default=10, help="Slowest pages to list at the end")
+
+    def handle(self, *args, **options):
+
+        if not os.path.isdir(settings.STATIC_ROOT):
+            raise CommandError("Static source directory does not exist, run collectstatic")
+
+        output_dir = os.path.abspath(os.path.expanduser(options["output_dir"]))
+        if options["force"]:
+            if os.path.isdir(output_dir):
+                rmtree(output_dir)
+            if os.path.exists(manifest_path(output_dir)):
+                os.remove(manifest_path(output_dir))
+        os.makedirs(output_dir, exist_ok=True)
+
+        started = time.perf_counter()
+
+        # workers load church years from snapshots rather than each building every year again
+        missing = [
+            year
+            for year in range(settings.FIRST_BEGINNING_YEAR, settings.LAST_BEGINNING_YEAR + 1)
+            if not os.path.exists(snapshot_path(year))
+        ]
+        if missing:
+            for church_year in ChurchYear.build_range(min(missing), max(missing), workers=options["workers"]):
+                if church_year.start_year in missing:
+                    save_church_year(church_year)
+            print("Built church years {}".format(", ".join(str(year) for year in missing)))
+
+        load_urls(print)
+        renderer = DistillRender(output_dir, urls_to_distill)
+        previous = load_manifest(output_dir)
+        manifest = {}
+        date_inputs = DateInputs()
+        pages = []
+        for url_index, (distill_func, file_name, view_name, a, k) in enumerate(urls_to_distill):
+            for param_set in renderer.get_uri_values(distill_func):
+                param_set = normalize_param_set(param_set)
+                uri = renderer.generate_uri(view_name, param_set)
+                inputs = date_inputs.for_page(view_name, param_set)
+                entry = previous.get(uri, {})
+                path = output_path(output_dir, uri, file_name)
+
+                # pages that are not for a single date (about, the church year, the sitemap) are always rendered
+                if inputs and entry.get("inputs") == inputs and os.path.exists(path):
+                    manifest[uri] = entry
+                else:
+                    manifest[uri] = {"file": os.path.relpath(path, output_dir), "inputs": inputs}
+                    pages.append((url_index, param_set, uri, entry.get("content")))
+
+        skipped = len(manifest) - len(pages)
+        chunks = [pages[i : i + options["chunk"]] for i in range(0, len(pages), options["chunk"])]
+        print(
+            "Rendering {} pages ({} unchanged) in {} chunks with {} workers".format(
+                len(pages), skipped, len(chunks), options["workers"]
+            )
+        )
+
+        rendered = []
+        written = 0
+        # forked workers must not share the parent's connection, so let each one open its own
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=options["workers"], initializer=setup_export_worker) as executor:
+            futures = [executor.submit(render_pages, output_dir, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                for uri, path, size, seconds, new_hash, changed in future.result():
+                    print(
+                        "Rendered {} -> {} [{} bytes, {:.1f} ms{}]".format(
+                            uri, path, size, seconds * 1000, "" if changed else ", unchanged"
+                        )
+                    )
+                    manifest[uri]["content"] = new_hash
+                    rendered.append((seconds, uri))
+                    written += changed
+
+        removed = 0
+        for uri, entry in previous.items():
+            if uri not in manifest:
+                try:
+                    os.remove(os.path.join(output_dir, entry["file"]))
+                    removed += 1
+                except (FileNotFoundError, KeyError):
+                    pass
+        save_manifest(output_dir, manifest)
+        print("Wrote {} files, left {} unchanged, removed {}".format(written, len(manifest) - written, removed))
+
+        static_url = settings.STATIC_URL[1:] if settings.STATIC_URL.startswith("/") else settings.STATIC_URL
+        static_files = list(renderer.copy_static(settings.STATIC_ROOT, os.path.join(output_dir, static_url)))
+        media_files = []
+        if settings.MEDIA_ROOT and os.path.isdir(settings.MEDIA_ROOT):
+            media_url = settings.MEDIA_URL[1:] if settings.MEDIA_URL.startswith("/") else settings.MEDIA_URL
+            media_files = list(renderer.copy_static(settings.MEDIA_ROOT, os.path.join(output_dir, media_url)))
+        print("Copied {} static and {} media files".format(len(static_files), len(media_files)))
+
+        render_time = sum(seconds for seconds, uri in rendered)
+        print(
+            "Rendered {} pages in {:.1f} s ({:.1f} s of rendering, {:.1f} ms per page)".format(
+                len(rendered),
+                time.perf_counter() - started,
+                render_time,
+                render_time / len(rendered) * 1000 if rendered else 0,
+            )
+        )
+        for seconds, uri in sorted(rendered, reverse=True)[: options["slowest"]]:
+            print("  {:.1f} ms {}".format(seconds * 1000, uri))
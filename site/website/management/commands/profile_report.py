@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from website.profiling import read_profiles
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def summarize(label, values):
+    return "{:>6} {:>9.1f} {:>9.1f} {:>9.1f} {:>10.1f}  {}".format(
+        len(values),
+        sum(values) / len(values) * 1000,
+        percentile(values, 0.95) * 1000,
+        max(values) * 1000,
+        sum(values) * 1000,
+        label,
+    )
+
+
+class Command(BaseCommand):
+
+    help = "Summarizes the requests recorded by the profiling middleware: the slowest views, sections and templates"
+
+    def add_arguments(self, parser):
+
+        parser.add_argument("--log", dest="log", default=settings.PROFILING_LOG, help="Profile log to read")
+        parser.add_argument("--top", dest="top", type=int, default=20, help="Rows to list in each table")
+        parser.add_argument("--category", dest="category", default=None, help="Only list timings of this category")
+
+    def handle(self, *args, **options):
+
+        views = {}
+        queries = {}
+        timings = {}
+        cache_stats = {}
+        for record in read_profiles(options["log"]):
+            # the counts only grow within a process, so its last record has its totals
+            if record.get("church_year_cache"):
+                cache_stats[record.get("pid")] = record["church_year_cache"]
+            view = record.get("view") or record["path"]
+            views.setdefault(view, []).append(record["total"])
+            queries.setdefault(view, []).append(record["queries"])
+            for category, name, seconds in record["timings"]:
+                if options["category"] and category != options["category"]:
+                    continue
+                timings.setdefault((category, name), []).append(seconds)
+
+        if not views:
+            print("No profiled requests in {}".format(options["log"]))
+            return
+
+        header = "{:>6} {:>9} {:>9} {:>9} {:>10}  {}".format("count", "mean ms", "p95 ms", "max ms", "total ms", "")
+
+        print("Requests by view")
+        print(header)
+        for view, values in sorted(views.items(), key=lambda item: sum(item[1]), reverse=True)[: options["top"]]:
+            print(
+                "{} ({:.1f} queries per request)".format(
+                    summarize(view, values), sum(queries[view]) / len(queries[view])
+                )
+            )
+
+        print("")
+        print("Timings by section, template and calendar lookup")
+        print(header)
+        for (category, name), values in sorted(timings.items(), key=lambda item: sum(item[1]), reverse=True)[
+            : options["top"]
+        ]:
+            print(summarize("{} {}".format(category, name), values))
+
+        if cache_stats:
+            print("")
+            print("Church year cache by process")
+            print(
+                "{:>8} {:>10} {:>11} {:>8} {:>5} {:>9}".format(
+                    "pid", "local hits", "shared hits", "misses", "held", "hit rate"
+                )
+            )
+            for pid, stats in sorted(cache_stats.items(), key=lambda item: str(item[0])):
+                print(
+                    "{:>8} {:>10} {:>11} {:>8} {:>5} {:>8.0%}".format(
+                        str(pid),
+                        stats["local_hits"],
+                        stats["shared_hits"],
+                        stats["misses"],
+                        stats["local_size"],
+                        stats["hit_rate"],
+                    )
+                )
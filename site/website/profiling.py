@@ -0,0 +1,146 @@
+import json
+import os
+import random
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+from churchcal.caching import church_year_cache
+
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+class RequestProfile(object):
+    """The timings and database queries recorded while one request is handled"""
+
+    __slots__ = ("timings", "queries", "query_time", "total", "church_year_cache")
+
+    def __init__(self):
+        self.timings = []
+        self.queries = 0
+        self.query_time = 0.0
+        self.total = 0.0
+        # this process's church year cache counts since it started, as they stood when the request finished
+        self.church_year_cache = None
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.query_time += time.perf_counter() - start
+
+    def totals(self):
+        """(count, seconds) for each category of timing, in the order they were first seen"""
+
+        totals = {}
+        for category, name, seconds in self.timings:
+            count, total = totals.get(category, (0, 0.0))
+            totals[category] = (count + 1, total + seconds)
+        return totals
+
+    def server_timing(self):
+        """A Server-Timing header: a total for each category, then the slowest individual timings"""
+
+        metrics = [
+            '{};dur={:.1f};desc="{} calls"'.format(category, seconds * 1000, count)
+            for category, (count, seconds) in self.totals().items()
+        ]
+        metrics.append('db;dur={:.1f};desc="{} queries"'.format(self.query_time * 1000, self.queries))
+        slowest = sorted(self.timings, key=lambda timing: timing[2], reverse=True)[: settings.PROFILING_HEADER_DETAIL]
+        for index, (category, name, seconds) in enumerate(slowest):
+            metrics.append('slow{};dur={:.1f};desc="{} {}"'.format(index + 1, seconds * 1000, category, name))
+        if self.church_year_cache:
+            metrics.append(
+                'church_year_cache;desc="{local_hits} local hits, {shared_hits} shared hits, {misses} misses, '
+                '{local_size} held"'.format(**self.church_year_cache)
+            )
+        metrics.append("total;dur={:.1f}".format(self.total * 1000))
+        return ", ".join(metrics)
+
+    def as_dict(self, request):
+        return {
+            "path": request.path,
+            "view": request.resolver_match.view_name if request.resolver_match else None,
+            "total": self.total,
+            "queries": self.queries,
+            "query_time": self.query_time,
+            "timings": self.timings,
+            "pid": os.getpid(),
+            "church_year_cache": self.church_year_cache,
+        }
+
+
+def current_profile():
+    return getattr(_local, "profile", None)
+
+
+@contextmanager
+def timed(category, name=""):
+    """Records how long the block takes against the request being profiled, if there is one"""
+
+    profile = getattr(_local, "profile", None)
+    if profile is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.timings.append((category, name, time.perf_counter() - start))
+
+
+def write_profile(record):
+    line = json.dumps(record, default=str)
+    with _log_lock:
+        with open(settings.PROFILING_LOG, "a") as f:
+            f.write(line + "\n")
+
+
+def read_profiles(path):
+    if not os.path.exists(path):
+        return
+    with open(path) as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+class ProfilingMiddleware(object):
+    """Profiles a sample of requests, adding a Server-Timing header and appending the timings to PROFILING_LOG
+
+    Only requests picked by PROFILING_SAMPLE_RATE pay for the timing; for the rest this is a single comparison.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.PROFILING or random.random() >= settings.PROFILING_SAMPLE_RATE:
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        _local.profile = profile
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile.record_query))
+                response = self.get_response(request)
+        finally:
+            _local.profile = None
+        profile.total = time.perf_counter() - start
+        profile.church_year_cache = church_year_cache.stats()
+
+        response["Server-Timing"] = profile.server_timing()
+        if settings.PROFILING_LOG:
+            write_profile(profile.as_dict(request))
+        return response
@@ -80,7 +80,20 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
-if DEBUG:
+# Profile a share of requests, see website.profiling and the profile_report command
+PROFILING = os.getenv("PROFILING", "False") == "True"
+# Share of requests profiled when PROFILING is on
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "1"))
+# Where profiled requests are appended, one JSON object per line; empty to only send Server-Timing headers
+PROFILING_LOG = os.getenv("PROFILING_LOG", os.path.join(BASE_DIR, "profiles.jsonl"))
+# Slowest individual timings listed in each Server-Timing header
+PROFILING_HEADER_DETAIL = 5
+
+if PROFILING:
+    MIDDLEWARE = ["website.profiling.ProfilingMiddleware"] + MIDDLEWARE
+
+# The toolbar's own instrumentation would swamp the timings being profiled
+if DEBUG and not PROFILING:
     MIDDLEWARE = ["debug_toolbar.middleware.DebugToolbarMiddleware"] + MIDDLEWARE
 
 ROOT_URLCONF = "website.urls"
@@ -216,6 +229,27 @@ SITE_ID = 1
 FIRST_BEGINNING_YEAR = 2018
 LAST_BEGINNING_YEAR = 2021
 
+CHURCH_YEAR_SNAPSHOT_DIR = os.path.join(BASE_DIR, "snapshots")
+
+# Processes used by ChurchYear.build_range when building many years at once
+CHURCH_YEAR_BUILD_WORKERS = os.cpu_count() or 1
+
+# Bump when a change to churchcal.calculations changes the church years it computes, so cached years are not reused
+CHURCH_YEAR_CACHE_VERSION = 4
+# Deserialized church years each process keeps in front of the shared cache
+CHURCH_YEAR_LOCAL_CACHE_SIZE = 4
+# Seconds a process trusts its fingerprint of the calendar data before checking the database again
+CHURCH_YEAR_FINGERPRINT_TTL = 60
+
+# Seconds a process trusts its loaded psalter before checking the shared cache for changes made elsewhere
+PSALTER_GENERATION_TTL = 60
+
+# Seconds a rendered office body is kept in the shared cache
+OFFICE_BODY_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Most dates a single request to the office data API may cover
+OFFICE_API_MAX_DAYS = 62
+
 #
 # FIRST_BEGINNING_YEAR = 2019
 # LAST_BEGINNING_YEAR = 2019
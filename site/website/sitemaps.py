@@ -0,0 +1,115 @@
+from datetime import date, timedelta
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.contrib.sites.shortcuts import get_current_site
+from django.http import Http404, StreamingHttpResponse
+
+from churchcal.utils import advent
+
+# (section name, path format, priority, changefreq) for the pages published for every day
+DAY_SECTIONS = (
+    ("morning_prayer", "/morning_prayer/{}-{}-{}", 0.7, "daily"),
+    ("midday_prayer", "/midday_prayer/{}-{}-{}", 0.5, "daily"),
+    ("evening_prayer", "/evening_prayer/{}-{}-{}", 0.7, "daily"),
+    ("compline", "/compline/{}-{}-{}", 0.5, "daily"),
+    ("family_morning_prayer", "/family/morning_prayer/{}-{}-{}", 0.7, "daily"),
+    ("family_midday_prayer", "/family/midday_prayer/{}-{}-{}", 0.5, "daily"),
+    ("family_early_evening_prayer", "/family/early_evening_prayer/{}-{}-{}", 0.7, "daily"),
+    ("family_close_of_day", "/family/close_of_day_prayer/{}-{}-{}", 0.5, "daily"),
+)
+
+PAGES_SECTION = "pages"
+
+
+def get_church_years():
+
+    for year in range(settings.FIRST_BEGINNING_YEAR, settings.LAST_BEGINNING_YEAR + 1):
+        yield {"start_year": year, "end_year": year + 1}
+
+
+def church_year_dates(start_year):
+    """Every date from the first Sunday of Advent in start_year up to the next one, from date arithmetic alone"""
+
+    day = advent(start_year)
+    end = advent(start_year + 1)
+    while day < end:
+        yield day
+        day += timedelta(days=1)
+
+
+def get_days():
+    for year in get_church_years():
+        for day in church_year_dates(year["start_year"]):
+            yield {"year": day.year, "month": day.month, "day": day.day}
+
+
+def get_sitemap_sections():
+    for year in get_church_years():
+        for name, path, priority, changefreq in DAY_SECTIONS:
+            yield {"section": "{}-{}".format(name, year["start_year"])}
+    yield {"section": PAGES_SECTION}
+
+
+def is_sitemap_section(section):
+    return section in (entry["section"] for entry in get_sitemap_sections())
+
+
+def section_entries(section):
+    """Yields (path, lastmod, changefreq, priority) for each page in a sitemap section"""
+
+    today = date.today()
+
+    if section == PAGES_SECTION:
+        for year in get_church_years():
+            yield "/church_year/{}-{}".format(year["start_year"], year["end_year"]), today, "daily", 0.8
+        for year in get_church_years():
+            yield "/family/church_year/{}-{}".format(year["start_year"], year["end_year"]), today, "daily", 0.8
+        yield "/settings", today, "daily", 0.3
+        yield "/about", today, "daily", 0.9
+        yield "/", None, "always", 1.0
+        yield "/family/settings", today, "daily", 0.3
+        yield "/family/about", today, "daily", 0.9
+        yield "/family", None, "always", 1.0
+        return
+
+    name, _, start_year = section.rpartition("-")
+    for section_name, path, priority, changefreq in DAY_SECTIONS:
+        if section_name == name:
+            for day in church_year_dates(int(start_year)):
+                yield path.format(day.year, day.month, day.day), today, changefreq, priority
+
+
+def stream_sitemap(domain, section):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for path, lastmod, changefreq, priority in section_entries(section):
+        yield "<url><loc>https://{}{}</loc>{}<changefreq>{}</changefreq><priority>{}</priority></url>\n".format(
+            domain,
+            escape(path),
+            "<lastmod>{}</lastmod>".format(lastmod.isoformat()) if lastmod else "",
+            changefreq,
+            priority,
+        )
+    yield "</urlset>\n"
+
+
+def stream_sitemap_index(domain):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for section in get_sitemap_sections():
+        yield "<sitemap><loc>https://{}/sitemap-{}.xml</loc></sitemap>\n".format(domain, escape(section["section"]))
+    yield "</sitemapindex>\n"
+
+
+def sitemap_index_view(request):
+    domain = get_current_site(request).domain
+    return StreamingHttpResponse(stream_sitemap_index(domain), content_type="application/xml")
+
+
+def sitemap_section_view(request, section):
+    if not is_sitemap_section(section):
+        raise Http404("No sitemap section {}".format(section))
+
+    domain = get_current_site(request).domain
+    return StreamingHttpResponse(stream_sitemap(domain, section), content_type="application/xml")
@@ -13,26 +13,20 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from datetime import date
-
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.contrib.sitemaps.views import sitemap
 from django.urls import path, include
 from django.utils.translation import ugettext_lazy as _
 from django.views.generic import TemplateView
 from django_distill import distill_path
-from future.backports.datetime import timedelta
 from material.admin.sites import site
 
-from django.contrib.sitemaps import views
-
-from churchcal.calculations import ChurchYear
+from office import api as office_api
 from office import views as office_views
+from website.sitemaps import get_church_years, get_days, get_sitemap_sections, sitemap_index_view, sitemap_section_view
 
 # from sermons import views as sermon_views
-from django.contrib.sitemaps import Sitemap
 
 # site.site_header = _("Elizabeth Locher's Sermon Archive")
 # site.site_title = _("Elizabeth Locher's Sermon Archive")
@@ -52,325 +46,6 @@ def get_none():
     return None
 
 
-def get_days():
-    date_list = []
-    for year in get_church_years():
-        church_year = ChurchYear(year["start_year"])
-        for day in church_year:
-            date_list.append(day.date)
-    for date in date_list:
-        yield {"year": date.year, "month": date.month, "day": date.day}
-
-
-def get_church_years():
-
-    for year in range(settings.FIRST_BEGINNING_YEAR, settings.LAST_BEGINNING_YEAR + 1):
-        yield {"start_year": year, "end_year": year + 1}
-
-
-class MorningPrayerSitemap(Sitemap):
-    changefreq = "daily"
-    priority = 0.7
-    protocol = "https"
-
-    def items(self):
-        days = []
-        for day in get_days():
-            days.append(day)
-        return days
-
-    def lastmod(self, obj):
-        return date.today()
-
-    def location(self, obj):
-        return "/morning_prayer/{}-{}-{}".format(obj["year"], obj["month"], obj["day"])
-
-
-class MiddayPrayerSitemap(Sitemap):
-    changefreq = "daily"
-    priority = 0.5
-    protocol = "https"
-
-    def items(self):
-        days = []
-        for day in get_days():
-            days.append(day)
-        return days
-
-    def lastmod(self, obj):
-        return date.today()
-
-    def location(self, obj):
-        return "/midday_prayer/{}-{}-{}".format(obj["year"], obj["month"], obj["day"])
-
-
-class EveningPrayerSitemap(Sitemap):
-    changefreq = "daily"
-    priority = 0.7
-    protocol = "https"
-
-    def items(self):
-        days = []
-        for day in get_days():
-            days.append(day)
-        return days
-
-    def lastmod(self, obj):
-        return date.today()
-
-    def location(self, obj):
-        return "/evening_prayer/{}-{}-{}".format(obj["year"], obj["month"], obj["day"])
-
-
-class ComplineSitemap(Sitemap):
-    changefreq = "daily"
-    priority = 0.5
-    protocol = "https"
-
-    def items(self):
-        days = []
-        for day in get_days():
-            days.append(day)
-        return days
-
-    def lastmod(self, obj):
-        return date.today()
-
-    def location(self, obj):
-        return "/compline/{}-{}-{}".format(obj["year"], obj["month"], obj["day"])
-
-
-class CalendarSitemap(Sitemap):
-    changefreq = "daily"
-    priority = 0.8
-    protocol = "https"
-
-    def items(self):
-        years = []
-        for year in get_church_years():
-            years.append(year)
-        return years
-
-    def lastmod(self, obj):
-        return date.today()
-
-    def location(self, obj):
-        return "/church_year/{}-{}".format(obj["start_year"], obj["end_year"])
-
-
-class SettingsSitemap(Sitemap):
-    changefreq = "daily"
-    priority = 0.3
-    protocol = "https"
-
-    def items(self):
-        return ["settings"]
-
-    def lastmod(self, obj):
-        return date.today()
-
-    def location(self, obj):
-        return "/{}".format(obj)
-
-
-class AboutSitemap(Sitemap):
-    changefreq = "daily"
-    priority = 0.9
-    protocol = "https"
-
-    def items(self):
-        return ["about"]
-
-    def lastmod(self, obj):
-        return date.today()
-
-    def location(self, obj):
-        return "/{}".format(obj)
-
-
-class HomeSitemap(Sitemap):
-    changefreq = "always"
-    priority = 1.0
-    protocol = "https"
-
-    def items(self):
-        return ["home"]
-
-    def lastmod(self, obj):
-        return False
-
-    def location(self, obj):
-        return "/"
-
-
-class FamilyMorningPrayerSitemap(Sitemap):
-    changefreq = "daily"
-    priority = 0.7
-    protocol = "https"
-
-    def items(self):
-        days = []
-        for day in get_days():
-            days.append(day)
-        return days
-
-    def lastmod(self, obj):
-        return date.today()
-
-    def location(self, obj):
-        return "/family/morning_prayer/{}-{}-{}".format(obj["year"], obj["month"], obj["day"])
-
-
-class FamilyMiddayPrayerSitemap(Sitemap):
-    changefreq = "daily"
-    priority = 0.5
-    protocol = "https"
-
-    def items(self):
-        days = []
-        for day in get_days():
-            days.append(day)
-        return days
-
-    def lastmod(self, obj):
-        return date.today()
-
-    def location(self, obj):
-        return "/family/midday_prayer/{}-{}-{}".format(obj["year"], obj["month"], obj["day"])
-
-
-class FamilyEarlyEveningPrayerSitemap(Sitemap):
-    changefreq = "daily"
-    priority = 0.7
-    protocol = "https"
-
-    def items(self):
-        days = []
-        for day in get_days():
-            days.append(day)
-        return days
-
-    def lastmod(self, obj):
-        return date.today()
-
-    def location(self, obj):
-        return "/family/early_evening_prayer/{}-{}-{}".format(obj["year"], obj["month"], obj["day"])
-
-
-class FamilyCloseOfDaySitemap(Sitemap):
-    changefreq = "daily"
-    priority = 0.5
-    protocol = "https"
-
-    def items(self):
-        days = []
-        for day in get_days():
-            days.append(day)
-        return days
-
-    def lastmod(self, obj):
-        return date.today()
-
-    def location(self, obj):
-        return "/family/close_of_day_prayer/{}-{}-{}".format(obj["year"], obj["month"], obj["day"])
-
-
-class FamilyCalendarSitemap(Sitemap):
-    changefreq = "daily"
-    priority = 0.8
-    protocol = "https"
-
-    def items(self):
-        years = []
-        for year in get_church_years():
-            years.append(year)
-        return years
-
-    def lastmod(self, obj):
-        return date.today()
-
-    def location(self, obj):
-        return "/family/church_year/{}-{}".format(obj["start_year"], obj["end_year"])
-
-
-class FamilySettingsSitemap(Sitemap):
-    changefreq = "daily"
-    priority = 0.3
-    protocol = "https"
-
-    def items(self):
-        return ["settings"]
-
-    def lastmod(self, obj):
-        return date.today()
-
-    def location(self, obj):
-        return "/family/{}".format(obj)
-
-
-class FamilyAboutSitemap(Sitemap):
-    changefreq = "daily"
-    priority = 0.9
-    protocol = "https"
-
-    def items(self):
-        return ["about"]
-
-    def lastmod(self, obj):
-        return date.today()
-
-    def location(self, obj):
-        return "/family/{}".format(obj)
-
-
-class FamilyHomeSitemap(Sitemap):
-    changefreq = "always"
-    priority = 1.0
-    protocol = "https"
-
-    def items(self):
-        return ["home"]
-
-    def lastmod(self, obj):
-        return False
-
-    def location(self, obj):
-        return "/family"
-
-
-sitemaps = {
-    "morning_prayer": MorningPrayerSitemap(),
-    "midday_prayer": MiddayPrayerSitemap(),
-    "evening_prayer": EveningPrayerSitemap(),
-    "compline": ComplineSitemap(),
-    "calendar": CalendarSitemap(),
-    "settings": SettingsSitemap(),
-    "about": AboutSitemap(),
-    "home": HomeSitemap(),
-    "family_morning_prayer": FamilyMorningPrayerSitemap(),
-    "family_midday_prayer": FamilyMiddayPrayerSitemap(),
-    "family_early_evening_prayer": FamilyEarlyEveningPrayerSitemap(),
-    "family_close_of_day": FamilyCloseOfDaySitemap(),
-    "family_calendar": FamilyCalendarSitemap(),
-    "family_settings": FamilySettingsSitemap(),
-    "family_about": FamilyAboutSitemap(),
-    "family_home": FamilyHomeSitemap(),
-}
-
-
-def get_distill_sitemap():
-
-    yield None
-
-
-def sitemap_index_view(request):
-    return views.index(request, sitemaps)
-
-
-def sitemap_view(request):
-    return views.sitemap(request, sitemaps)
-
-
 urlpatterns = [
     # path("sermons", sermon_views.sermons, name="sermons"),
     # path("sermon/<uuid:id>", sermon_views.sermon, name="sermon"),
@@ -399,6 +74,14 @@ urlpatterns = [
     distill_path(
         "compline/<int:year>-<int:month>-<int:day>/", office_views.compline, name="compline", distill_func=get_days
     ),
+    path("api/office/<str:office>/<int:year>-<int:month>-<int:day>/", office_api.office_data, name="office_data"),
+    path("api/offices/", office_api.office_data_range, name="office_data_range"),
+    distill_path(
+        "api/office/<str:office>/<int:year>-<int:month>.json",
+        office_api.office_data_month,
+        name="office_data_month",
+        distill_func=office_api.get_office_months,
+    ),
     distill_path(
         "church_year/<int:start_year>-<int:end_year>/",
         office_views.church_year,
@@ -444,8 +127,9 @@ urlpatterns = [
     distill_path(
         "family/", office_views.family, distill_file="family/index.html", name="family", distill_func=get_now
     ),
+    distill_path("sitemap.xml", sitemap_index_view, name="sitemap", distill_func=get_none),
     distill_path(
-        "sitemap.xml", sitemap_view, name="django.contrib.sitemaps.views.sitemap", distill_func=get_distill_sitemap
+        "sitemap-<str:section>.xml", sitemap_section_view, name="sitemap_section", distill_func=get_sitemap_sections
     ),
     distill_path("404.html", office_views.four_oh_four, name="404", distill_func=get_none),
     distill_path(